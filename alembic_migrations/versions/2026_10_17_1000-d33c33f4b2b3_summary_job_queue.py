@@ -0,0 +1,34 @@
+"""summary job queue
+
+Revision ID: d33c33f4b2b3
+Revises: 415a557ef2d2
+Create Date: 2026-10-17 10:00:12.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd33c33f4b2b3'
+down_revision: Union[str, Sequence[str], None] = '415a557ef2d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('summaries', sa.Column('temperature', sa.Float(), server_default='0.2', nullable=False))
+    op.add_column('summaries', sa.Column('max_steps', sa.Integer(), server_default='8', nullable=False))
+    op.add_column('summaries', sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('summaries', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('summaries', 'attempts')
+    op.drop_column('summaries', 'locked_at')
+    op.drop_column('summaries', 'max_steps')
+    op.drop_column('summaries', 'temperature')
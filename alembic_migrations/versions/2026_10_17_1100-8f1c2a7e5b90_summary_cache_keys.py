@@ -0,0 +1,34 @@
+"""summary cache keys
+
+Revision ID: 8f1c2a7e5b90
+Revises: d33c33f4b2b3
+Create Date: 2026-10-17 11:00:41.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f1c2a7e5b90'
+down_revision: Union[str, Sequence[str], None] = 'd33c33f4b2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_documents_content_hash'), 'documents', ['content_hash'], unique=False)
+    op.add_column('summaries', sa.Column('cache_key', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_summaries_cache_key'), 'summaries', ['cache_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_summaries_cache_key'), table_name='summaries')
+    op.drop_column('summaries', 'cache_key')
+    op.drop_index(op.f('ix_documents_content_hash'), table_name='documents')
+    op.drop_column('documents', 'content_hash')
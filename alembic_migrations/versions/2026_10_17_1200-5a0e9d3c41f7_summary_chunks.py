@@ -0,0 +1,43 @@
+"""summary chunks
+
+Revision ID: 5a0e9d3c41f7
+Revises: 8f1c2a7e5b90
+Create Date: 2026-10-17 12:00:27.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a0e9d3c41f7'
+down_revision: Union[str, Sequence[str], None] = '8f1c2a7e5b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('summary_chunks',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('summary_id', sa.String(), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.Enum('PROCESSING', 'DONE', 'ERROR', name='summarystatus', native_enum=False, length=16), nullable=False),
+    sa.Column('summary_text', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['summary_id'], ['summaries.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('summary_id', 'chunk_index', name='uq_summary_chunks_summary_id_chunk_index')
+    )
+    op.create_index(op.f('ix_summary_chunks_summary_id'), 'summary_chunks', ['summary_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_summary_chunks_summary_id'), table_name='summary_chunks')
+    op.drop_table('summary_chunks')
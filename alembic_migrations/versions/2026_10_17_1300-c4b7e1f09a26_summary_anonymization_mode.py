@@ -0,0 +1,28 @@
+"""summary anonymization mode
+
+Revision ID: c4b7e1f09a26
+Revises: 5a0e9d3c41f7
+Create Date: 2026-10-17 13:00:05.117346
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4b7e1f09a26'
+down_revision: Union[str, Sequence[str], None] = '5a0e9d3c41f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('summaries', sa.Column('anonymization_mode', sa.Enum('LOCAL', 'HYBRID', name='anonymizationmode', native_enum=False, length=16), server_default='HYBRID', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('summaries', 'anonymization_mode')
@@ -0,0 +1,30 @@
+"""summary reading plan
+
+Revision ID: 7d2e5b8a3c14
+Revises: c4b7e1f09a26
+Create Date: 2026-10-17 14:00:12.408215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e5b8a3c14'
+down_revision: Union[str, Sequence[str], None] = 'c4b7e1f09a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('summaries', sa.Column('word_count', sa.Integer(), nullable=True))
+    op.add_column('summaries', sa.Column('reading_plan', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('summaries', 'reading_plan')
+    op.drop_column('summaries', 'word_count')
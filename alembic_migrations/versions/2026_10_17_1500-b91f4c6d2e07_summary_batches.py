@@ -0,0 +1,40 @@
+"""summary batches
+
+Revision ID: b91f4c6d2e07
+Revises: 7d2e5b8a3c14
+Create Date: 2026-10-17 15:00:41.663120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b91f4c6d2e07'
+down_revision: Union[str, Sequence[str], None] = '7d2e5b8a3c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('summary_batches',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('summaries', sa.Column('batch_id', sa.String(), nullable=True))
+    op.create_index(op.f('ix_summaries_batch_id'), 'summaries', ['batch_id'], unique=False)
+    op.create_foreign_key('summaries_batch_id_fkey', 'summaries', 'summary_batches', ['batch_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('summaries_batch_id_fkey', 'summaries', type_='foreignkey')
+    op.drop_index(op.f('ix_summaries_batch_id'), table_name='summaries')
+    op.drop_column('summaries', 'batch_id')
+    op.drop_table('summary_batches')
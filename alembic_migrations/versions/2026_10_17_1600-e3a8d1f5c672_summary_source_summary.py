@@ -0,0 +1,32 @@
+"""summary source summary
+
+Revision ID: e3a8d1f5c672
+Revises: b91f4c6d2e07
+Create Date: 2026-10-17 16:00:27.930514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a8d1f5c672'
+down_revision: Union[str, Sequence[str], None] = 'b91f4c6d2e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('summaries', sa.Column('source_summary_id', sa.String(), nullable=True))
+    op.create_index(op.f('ix_summaries_source_summary_id'), 'summaries', ['source_summary_id'], unique=False)
+    op.create_foreign_key('summaries_source_summary_id_fkey', 'summaries', 'summaries', ['source_summary_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('summaries_source_summary_id_fkey', 'summaries', type_='foreignkey')
+    op.drop_index(op.f('ix_summaries_source_summary_id'), table_name='summaries')
+    op.drop_column('summaries', 'source_summary_id')
@@ -0,0 +1,47 @@
+"""summary steps
+
+Revision ID: 6c2f8a4d9e13
+Revises: e3a8d1f5c672
+Create Date: 2026-10-17 17:00:41.208337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c2f8a4d9e13'
+down_revision: Union[str, Sequence[str], None] = 'e3a8d1f5c672'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('summary_steps',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('summary_id', sa.String(), nullable=False),
+    sa.Column('step_index', sa.Integer(), nullable=False),
+    sa.Column('stage', sa.String(length=32), nullable=False),
+    sa.Column('finish_reason', sa.String(length=32), nullable=True),
+    sa.Column('tool_name', sa.String(length=256), nullable=True),
+    sa.Column('llm_ms', sa.Integer(), nullable=True),
+    sa.Column('tool_ms', sa.Integer(), nullable=True),
+    sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+    sa.Column('completion_tokens', sa.Integer(), nullable=True),
+    sa.Column('request_chars', sa.Integer(), nullable=True),
+    sa.Column('response_chars', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['summary_id'], ['summaries.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_summary_steps_summary_id'), 'summary_steps', ['summary_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_summary_steps_summary_id'), table_name='summary_steps')
+    op.drop_table('summary_steps')
@@ -0,0 +1,30 @@
+"""refresh token partial indexes
+
+Revision ID: a47d3e9b2c58
+Revises: 6c2f8a4d9e13
+Create Date: 2026-10-17 18:00:12.574190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a47d3e9b2c58'
+down_revision: Union[str, Sequence[str], None] = '6c2f8a4d9e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_refresh_tokens_active_token_hash', 'refresh_tokens', ['token_hash'], unique=False, postgresql_where=sa.text('revoked_at IS NULL'))
+    op.create_index('ix_refresh_tokens_revoked_at', 'refresh_tokens', ['revoked_at'], unique=False, postgresql_where=sa.text('revoked_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_tokens_revoked_at', table_name='refresh_tokens', postgresql_where=sa.text('revoked_at IS NOT NULL'))
+    op.drop_index('ix_refresh_tokens_active_token_hash', table_name='refresh_tokens', postgresql_where=sa.text('revoked_at IS NULL'))
@@ -0,0 +1,38 @@
+"""document summary owner
+
+Revision ID: 5e9b7c1a3f26
+Revises: a47d3e9b2c58
+Create Date: 2026-10-17 19:00:08.331642
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9b7c1a3f26'
+down_revision: Union[str, Sequence[str], None] = 'a47d3e9b2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('user_id', sa.String(), nullable=True))
+    op.create_index('ix_documents_user_id_created_at_id', 'documents', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_foreign_key('documents_user_id_fkey', 'documents', 'users', ['user_id'], ['id'], ondelete='CASCADE')
+    op.add_column('summaries', sa.Column('user_id', sa.String(), nullable=True))
+    op.create_index('ix_summaries_user_id_created_at_id', 'summaries', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_foreign_key('summaries_user_id_fkey', 'summaries', 'users', ['user_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('summaries_user_id_fkey', 'summaries', type_='foreignkey')
+    op.drop_index('ix_summaries_user_id_created_at_id', table_name='summaries')
+    op.drop_column('summaries', 'user_id')
+    op.drop_constraint('documents_user_id_fkey', 'documents', type_='foreignkey')
+    op.drop_index('ix_documents_user_id_created_at_id', table_name='documents')
+    op.drop_column('documents', 'user_id')
@@ -0,0 +1,28 @@
+"""summary stream generation
+
+Revision ID: 8b3e6f0d2a71
+Revises: 5e9b7c1a3f26
+Create Date: 2026-10-17 20:00:19.640218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e6f0d2a71'
+down_revision: Union[str, Sequence[str], None] = '5e9b7c1a3f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('summaries', sa.Column('stream_generation', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('summaries', 'stream_generation')
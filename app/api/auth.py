@@ -4,7 +4,11 @@ from fastapi import APIRouter, status, HTTPException, Depends, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.security.jwt_token import create_token
-from app.auth.security.password import verify_password
+from app.auth.security.password import (
+    PasswordPoolSaturatedError,
+    verify_and_update_password,
+    verify_dummy_password,
+)
 from app.auth.security.refresh import generate_refresh_token, hash_refresh_token
 from app.auth.schemas import AuthUser
 from app.auth.dependencies import get_current_user_id
@@ -14,8 +18,6 @@ from app.auth.dao import RefreshTokenDAO
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-FAKE_PASSWORD = "$2b$12$q6VtHKLMERC2AkoXOFJ1eubTxllYp/dxUsR3coNAhhQYg.121Fqbi"
-
 @router.get("/me", status_code=status.HTTP_200_OK)
 async def get_me(user_id: str = Depends(get_current_user_id)):
     return {"user_id": user_id}
@@ -30,10 +32,20 @@ async def login(
     user = await user_dao.find_one_or_none(email=authUser.email.lower())
 
     is_valid = False
-    if user:
-        is_valid = verify_password(authUser.password, user.hashed_password)
-    else:
-        verify_password(authUser.password, FAKE_PASSWORD)
+    try:
+        if user:
+            is_valid, new_hash = await verify_and_update_password(authUser.password, user.hashed_password)
+            if is_valid and new_hash:
+                # Хеш посчитан с устаревшей стоимостью: пересчитываем, пока пароль известен
+                await user_dao.update(id=str(user.id), hashed_password=new_hash)
+        else:
+            await verify_dummy_password(authUser.password)
+    except PasswordPoolSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
 
     if not is_valid:
         raise HTTPException(
@@ -108,27 +120,19 @@ async def refresh(
     if not refresh_plain:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Не авторизирован")
 
-    refresh_hash = hash_refresh_token(refresh_plain)
-    dao = RefreshTokenDAO(session)
-    token = await dao.find_one_or_none(token_hash=refresh_hash)
-
-    if (not token) or token.revoked_at or (token.expires_at <= datetime.now(timezone.utc)):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Не авторизирован")
-
-    await dao.revoke(refresh_hash)
-
     new_refresh_plain = generate_refresh_token()
-    new_refresh_hash = hash_refresh_token(new_refresh_plain)
     refresh_ttl_seconds = 60 * 60 * 24 * 30
 
-    await dao.add(
-        user_id=token.user_id,
-        token_hash=new_refresh_hash,
-        expires_at=datetime.now(timezone.utc) + timedelta(seconds=refresh_ttl_seconds),
+    user_id = await RefreshTokenDAO(session).rotate(
+        hash_refresh_token(refresh_plain),
+        hash_refresh_token(new_refresh_plain),
+        datetime.now(timezone.utc) + timedelta(seconds=refresh_ttl_seconds),
     )
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Не авторизирован")
 
     access_ttl = timedelta(minutes=30)
-    access_token = create_token(subject=str(token.user_id), ttl=access_ttl)
+    access_token = create_token(subject=str(user_id), ttl=access_ttl)
 
     response.set_cookie(
         key="access_token",
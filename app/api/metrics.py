@@ -0,0 +1,76 @@
+from typing import Optional
+
+from fastapi import APIRouter, status, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_current_user_id
+from app.auth.security.jwt_token import verified_token_cache
+from app.auth.security.password import password_pool
+from app.core.database import get_db, pool_stats
+from app.core.llm_gateway import llm_stats
+from app.text.cache import summary_cache
+from app.text.dao import SummaryStepDAO
+from app.text.enums import SummaryLevel
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+def _round(value) -> Optional[float]:
+    return round(float(value), 1) if value is not None else None
+
+
+@router.get("/summary-cache", status_code=status.HTTP_200_OK)
+async def get_summary_cache_stats(user_id: str = Depends(get_current_user_id)):
+    return summary_cache.stats()
+
+
+@router.get("/llm", status_code=status.HTTP_200_OK)
+async def get_llm_stats(user_id: str = Depends(get_current_user_id)):
+    return llm_stats()
+
+
+@router.get("/password", status_code=status.HTTP_200_OK)
+async def get_password_pool_stats(user_id: str = Depends(get_current_user_id)):
+    return password_pool.stats()
+
+
+@router.get("/jwt-cache", status_code=status.HTTP_200_OK)
+async def get_jwt_cache_stats(user_id: str = Depends(get_current_user_id)):
+    return verified_token_cache.stats()
+
+
+@router.get("/db", status_code=status.HTTP_200_OK)
+async def get_db_pool_stats(user_id: str = Depends(get_current_user_id)):
+    return pool_stats()
+
+
+@router.get("/summary-steps", status_code=status.HTTP_200_OK)
+async def get_summary_step_stats(
+        since_hours: int = Query(24, ge=1, le=24 * 30),
+        model: Optional[str] = Query(None),
+        level: Optional[SummaryLevel] = Query(None),
+        user_id: str = Depends(get_current_user_id),
+        session: AsyncSession = Depends(get_db),
+):
+    rows = await SummaryStepDAO(session).aggregate_latencies(since_hours=since_hours, model=model, level=level)
+
+    return {
+        "since_hours": since_hours,
+        "items": [
+            {
+                "model": row.model,
+                "level": row.level,
+                "stage": row.stage,
+                "tool_name": row.tool_name,
+                "steps": row.steps,
+                "llm_ms_avg": _round(row.llm_ms_avg),
+                "llm_ms_p50": _round(row.llm_ms_p50),
+                "llm_ms_p95": _round(row.llm_ms_p95),
+                "tool_ms_avg": _round(row.tool_ms_avg),
+                "tool_ms_p95": _round(row.tool_ms_p95),
+                "prompt_tokens": row.prompt_tokens,
+                "completion_tokens": row.completion_tokens,
+            }
+            for row in rows
+        ],
+    }
@@ -1,44 +1,97 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, status, HTTPException, Depends, UploadFile, File, Form, Query
+from fastapi import APIRouter, status, HTTPException, Depends, UploadFile, File, Form, Query, Response, Header
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, async_session_maker
+from app.core.llm_gateway import LLMProviderError
+from app.core.pagination import decode_cursor, keyset_page
 from app.auth.dependencies import get_current_user_id
 
-from app.text.enums import SourceType, SummaryStatus, SummaryLevel
-from app.text.dao import DocumentDAO, SummaryDAO
-from app.text.schemas import SummarizeRequest, SummaryResponse, SpeedReadInfo
-from app.text.agents.smart_summarizer_agent import summarize_with_agent
+from app.text.enums import SourceType, SummaryStatus, SummaryLevel, AnonymizationMode
+from app.text.dao import DocumentDAO, SummaryDAO, SummaryBatchDAO
+from app.text.models import SummaryBatch
+from app.text.schemas import (
+    DocumentListItem,
+    DocumentListResponse,
+    SummarizeRequest,
+    SummaryResponse,
+    SummaryListItem,
+    SummaryListResponse,
+    SpeedReadInfo,
+    SummaryBatchItem,
+    SummaryBatchResponse,
+)
+from app.text.cache import build_cache_key, hash_text
+from app.text.pipeline import process_summary, find_cached_summary, find_cached_summaries
+from app.text.agents.level_derivation_agent import order_levels
+from app.text.speed_reading import (
+    ReadingPlan,
+    build_reading_plan,
+    dump_reading_plan,
+    load_reading_plan,
+    reading_plan_cache,
+    reading_plan_columns,
+)
 from app.text.utils import save_upload_file
-from app.text.service import generate_speed_reading_stream, calculate_reading_info
+from app.text.worker import notify_summary_workers
+from app.text.service import (
+    generate_speed_reading_stream,
+    calculate_reading_info,
+    generate_summary_events_stream,
+    generate_summary_progress_stream,
+)
 
 router = APIRouter(prefix="/text", tags=["text"])
 
 
-@router.post("/summaries", status_code=status.HTTP_201_CREATED, response_model=SummaryResponse)
-async def create_summary(
-        user_id: str = Depends(get_current_user_id),
-        session: AsyncSession = Depends(get_db),
-        level: SummaryLevel = Form(SummaryLevel.MEDIUM),
-        text: Optional[str] = Form(None),
-        file: Optional[UploadFile] = File(None),
-        model: Optional[str] = Form(None),
-        temperature: float = Form(0.2),
-        max_steps: int = Form(8),
-):
-    document_dao = DocumentDAO(session)
-    summary_dao = SummaryDAO(session)
+async def _create_summary_records(
+        *,
+        user_id: str,
+        level: SummaryLevel,
+        text: Optional[str],
+        file: Optional[UploadFile],
+        model: Optional[str],
+        temperature: float,
+        max_steps: int,
+        use_cache: bool,
+        anonymization: Optional[AnonymizationMode],
+        claim: bool,
+        levels: Optional[list[SummaryLevel]] = None,
+) -> tuple[Optional[SummaryResponse], Optional[str], Optional[SummarizeRequest]]:
+    """
+    Создаёт Document и Summary в статусе PROCESSING и сразу коммитит их.
+    При попадании в кеш создаёт Document и копии готовых summary в статусе DONE
+    от имени вызывающего (как batch) и возвращает копию основного уровня.
+    claim=True - задачу обрабатывает сам запрос, воркеры очереди её не трогают.
+    levels - несколько уровней за один прогон: агент строит самый подробный,
+    остальные создаются связанными строками и выводятся из него.
+    Сессия открывается только после сохранения файла и закрывается до запуска LLM.
+    """
+    derived_levels: list[SummaryLevel] = []
+    if levels:
+        if len(set(levels)) > 1 and SummaryLevel.AUTO in levels:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Уровень auto нельзя запрашивать вместе с другими уровнями"
+            )
+        level, *derived_levels = order_levels(levels)
 
     file_path: Optional[str] = None
     original_text: Optional[str] = None
+    anonymization_mode = anonymization or AnonymizationMode(settings.ANONYMIZATION_MODE)
 
     if file is not None:
-        file_path = await save_upload_file(file)
+        upload = await save_upload_file(file)
+        file_path = upload.path
+        content_hash = upload.content_hash
         source_type = SourceType.FILE
         original_text = f"[FILE: {Path(file_path).name}]"
     else:
@@ -48,23 +101,9 @@ async def create_summary(
                 detail=f"Текст слишком большой. Максимум {settings.MAX_TEXT_CHARS} символов",
             )
         original_text = text
+        content_hash = hash_text(text) if text is not None else None
         source_type = SourceType.TEXT
 
-    document = await document_dao.add(
-        source_type=source_type,
-        original_text=original_text,
-        file_path=file_path,
-    )
-
-    summary = await summary_dao.add(
-        document_id=str(document.id),
-        level=level,
-        status=SummaryStatus.PROCESSING,
-        summary_text=None,
-        model=model or settings.GIGACHAT_DEFAULT_MODEL,
-        error=None,
-    )
-
     try:
         request = SummarizeRequest(
             file_path=file_path,
@@ -72,47 +111,184 @@ async def create_summary(
             level=level,
             model=model,
             temperature=temperature,
-            max_steps=max_steps
+            max_steps=max_steps,
+            anonymization_mode=anonymization_mode,
+            content_hash=content_hash,
         )
-
-        result = await summarize_with_agent(request)
-
-        await summary_dao.update(
-            id=str(summary.id),
-            status=SummaryStatus.DONE,
-            summary_text=result["summary"],
-            model=result["metadata"]["model"],
-            error=None,
-        )
-
     except ValidationError as e:
-        await summary_dao.update(
-            id=str(summary.id),
-            status=SummaryStatus.ERROR,
-            error="Ошибка валидации входных данных",
-        )
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=str(e)
         )
 
-    except HTTPException:
-        await summary_dao.update(
-            id=str(summary.id),
-            status=SummaryStatus.ERROR,
-            error="Ошибка валидации входных данных",
+    cache_key = build_cache_key(content_hash, level, model, temperature, anonymization_mode)
+    derived_keys = [
+        build_cache_key(content_hash, derived_level, model, temperature, anonymization_mode)
+        for derived_level in derived_levels
+    ]
+
+    async with async_session_maker() as session:
+        document_dao = DocumentDAO(session)
+        summary_dao = SummaryDAO(session)
+
+        cached: Optional[SummaryResponse] = None
+        found: dict[str, SummaryResponse] = {}
+        if use_cache:
+            if derived_keys:
+                found = await find_cached_summaries(summary_dao, [cache_key, *derived_keys])
+                cached = found.get(cache_key) if len(found) == len(derived_keys) + 1 else None
+            else:
+                cached = await find_cached_summary(summary_dao, cache_key)
+
+        if cached is not None and file_path:
+            # Результат уже есть, исходник больше не понадобится
+            await asyncio.to_thread(Path(file_path).unlink, missing_ok=True)
+            file_path = None
+
+        document = await document_dao.add(
+            user_id=user_id,
+            source_type=source_type,
+            original_text=original_text,
+            file_path=file_path,
+            content_hash=content_hash,
         )
-        raise
 
-    except Exception as e:
-        msg = str(e)
+        if cached is not None:
+            copy = await summary_dao.add(
+                user_id=user_id,
+                document_id=str(document.id),
+                level=level,
+                status=SummaryStatus.DONE,
+                summary_text=cached.summary_text,
+                model=cached.model,
+                error=None,
+                temperature=temperature,
+                max_steps=max_steps,
+                anonymization_mode=anonymization_mode,
+                cache_key=cache_key,
+                **reading_plan_columns(cached.summary_text),
+            )
+            await summary_dao.add_many([
+                {
+                    "user_id": user_id,
+                    "document_id": str(document.id),
+                    "source_summary_id": str(copy.id),
+                    "level": derived_level,
+                    "status": SummaryStatus.DONE,
+                    "summary_text": found[derived_key].summary_text,
+                    "model": found[derived_key].model,
+                    "temperature": temperature,
+                    "max_steps": max_steps,
+                    "anonymization_mode": anonymization_mode,
+                    "cache_key": derived_key,
+                    **reading_plan_columns(found[derived_key].summary_text),
+                }
+                for derived_level, derived_key in zip(derived_levels, derived_keys)
+            ])
+            await session.commit()
+            await session.refresh(copy)
+            return SummaryResponse.model_validate(copy), None, None
+
+        summary = await summary_dao.add(
+            user_id=user_id,
+            document_id=str(document.id),
+            level=level,
+            status=SummaryStatus.PROCESSING,
+            summary_text=None,
+            model=model or settings.GIGACHAT_DEFAULT_MODEL,
+            error=None,
+            temperature=temperature,
+            max_steps=max_steps,
+            anonymization_mode=anonymization_mode,
+            cache_key=cache_key,
+            locked_at=datetime.now(timezone.utc) if claim else None,
+        )
+        summary_id = str(summary.id)
+
+        await summary_dao.add_many([
+            {
+                "user_id": user_id,
+                "document_id": str(document.id),
+                "source_summary_id": summary_id,
+                "level": derived_level,
+                "status": SummaryStatus.PROCESSING,
+                "model": model or settings.GIGACHAT_DEFAULT_MODEL,
+                "temperature": temperature,
+                "max_steps": max_steps,
+                "anonymization_mode": anonymization_mode,
+                "cache_key": derived_key,
+            }
+            for derived_level, derived_key in zip(derived_levels, derived_keys)
+        ])
+        await session.commit()
+
+    return None, summary_id, request
+
+
+async def _load_summary(summary_id: str):
+    async with async_session_maker() as session:
+        return await SummaryDAO(session).find_one_or_none(id=summary_id)
+
+
+@router.post("/summaries", status_code=status.HTTP_201_CREATED, response_model=SummaryResponse)
+async def create_summary(
+        response: Response,
+        user_id: str = Depends(get_current_user_id),
+        level: SummaryLevel = Form(SummaryLevel.MEDIUM),
+        text: Optional[str] = Form(None),
+        file: Optional[UploadFile] = File(None),
+        model: Optional[str] = Form(None),
+        temperature: float = Form(0.2),
+        max_steps: int = Form(8),
+        background: bool = Form(False),
+        use_cache: bool = Form(True),
+        anonymization: Optional[AnonymizationMode] = Form(None),
+        levels: Optional[list[SummaryLevel]] = Form(
+            None,
+            description="Несколько уровней за один прогон, заменяет level",
+        ),
+):
+    cached, summary_id, request = await _create_summary_records(
+        user_id=user_id,
+        level=level,
+        text=text,
+        file=file,
+        model=model,
+        temperature=temperature,
+        max_steps=max_steps,
+        use_cache=use_cache,
+        anonymization=anonymization,
+        levels=levels,
+        claim=not background,
+    )
+
+    if cached is not None:
+        response.status_code = status.HTTP_200_OK
+        return cached
 
-        await summary_dao.update(
-            id=str(summary.id),
-            status=SummaryStatus.ERROR,
-            error=msg,
+    if background:
+        notify_summary_workers()
+        response.status_code = status.HTTP_202_ACCEPTED
+        return await _load_summary(summary_id)
+
+    try:
+        await process_summary(summary_id, request)
+
+    except LLMProviderError as e:
+        if not e.retryable:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Ошибка LLM-провайдера: {e}"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"LLM-провайдер временно недоступен, повторите запрос позже: {e}",
+            headers={"Retry-After": str(int(settings.LLM_BREAKER_RESET_SECONDS))},
         )
 
+    except Exception as e:
+        msg = str(e)
+
         if "временно ограничены" in msg or "blacklist" in msg or "Запрос заблокирован" in msg:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -124,8 +300,306 @@ async def create_summary(
             detail=f"Ошибка при суммаризации: {msg}"
         )
 
-    updated = await summary_dao.find_one_or_none(id=str(summary.id))
-    return updated
+    return await _load_summary(summary_id)
+
+
+@router.post("/summaries/stream")
+async def create_summary_stream(
+        user_id: str = Depends(get_current_user_id),
+        level: SummaryLevel = Form(SummaryLevel.MEDIUM),
+        text: Optional[str] = Form(None),
+        file: Optional[UploadFile] = File(None),
+        model: Optional[str] = Form(None),
+        temperature: float = Form(0.2),
+        max_steps: int = Form(8),
+        use_cache: bool = Form(True),
+        anonymization: Optional[AnonymizationMode] = Form(None),
+        levels: Optional[list[SummaryLevel]] = Form(
+            None,
+            description="Несколько уровней за один прогон, заменяет level",
+        ),
+):
+    cached, summary_id, request = await _create_summary_records(
+        user_id=user_id,
+        level=level,
+        text=text,
+        file=file,
+        model=model,
+        temperature=temperature,
+        max_steps=max_steps,
+        use_cache=use_cache,
+        anonymization=anonymization,
+        levels=levels,
+        claim=True,
+    )
+
+    if cached is not None:
+        stream = generate_summary_progress_stream(cached.id)
+    else:
+        stream = generate_summary_events_stream(summary_id, request)
+
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Summary-Id": cached.id if cached is not None else summary_id,
+        }
+    )
+
+
+@router.post("/batches", status_code=status.HTTP_202_ACCEPTED, response_model=SummaryBatchResponse)
+async def create_summary_batch(
+        user_id: str = Depends(get_current_user_id),
+        session: AsyncSession = Depends(get_db),
+        texts: Optional[list[str]] = Form(None),
+        files: Optional[list[UploadFile]] = File(None),
+        levels: Optional[list[SummaryLevel]] = Form(
+            None,
+            description="Уровень для каждого элемента (сначала texts, затем files) или один на все",
+        ),
+        model: Optional[str] = Form(None),
+        temperature: float = Form(0.2),
+        max_steps: int = Form(8),
+        use_cache: bool = Form(True),
+        anonymization: Optional[AnonymizationMode] = Form(None),
+):
+    """
+    Создаёт пачку summary одним INSERT на таблицу и ставит их в фоновую очередь.
+    Параллельность ограничена числом воркеров, частота запросов к LLM - rate limit провайдеров.
+    """
+    texts = texts or []
+    files = files or []
+    total = len(texts) + len(files)
+
+    if total == 0:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Нужно передать texts и/или files"
+        )
+
+    if total > settings.SUMMARY_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Слишком много элементов. Максимум {settings.SUMMARY_BATCH_MAX_ITEMS}",
+        )
+
+    if not levels:
+        levels = [SummaryLevel.MEDIUM] * total
+    elif len(levels) == 1:
+        levels = levels * total
+    elif len(levels) != total:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Число levels должно быть 1 или совпадать с числом элементов"
+        )
+
+    for text in texts:
+        if len(text) > settings.MAX_TEXT_CHARS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Текст слишком большой. Максимум {settings.MAX_TEXT_CHARS} символов",
+            )
+
+    anonymization_mode = anonymization or AnonymizationMode(settings.ANONYMIZATION_MODE)
+
+    documents: list[dict] = [
+        {
+            "user_id": user_id,
+            "source_type": SourceType.TEXT,
+            "original_text": text,
+            "file_path": None,
+            "content_hash": hash_text(text),
+        }
+        for text in texts
+    ]
+    saved_paths: list[str] = []
+    try:
+        for file in files:
+            upload = await save_upload_file(file)
+            saved_paths.append(upload.path)
+            documents.append({
+                "user_id": user_id,
+                "source_type": SourceType.FILE,
+                "original_text": f"[FILE: {Path(upload.path).name}]",
+                "file_path": upload.path,
+                "content_hash": upload.content_hash,
+            })
+
+        cache_keys = [
+            build_cache_key(document["content_hash"], level, model, temperature, anonymization_mode)
+            for document, level in zip(documents, levels)
+        ]
+
+        summary_dao = SummaryDAO(session)
+        cached = await find_cached_summaries(summary_dao, cache_keys) if use_cache else {}
+
+        # Для готовых из кеша элементов исходный файл больше не нужен
+        for document, cache_key in zip(documents, cache_keys):
+            if document["file_path"] and cache_key in cached:
+                await asyncio.to_thread(Path(document["file_path"]).unlink, missing_ok=True)
+                document["file_path"] = None
+
+        batch = await SummaryBatchDAO(session).add(total=total)
+        created_documents = await DocumentDAO(session).add_many(documents)
+
+        summaries: list[dict] = []
+        for document, level, cache_key in zip(created_documents, levels, cache_keys):
+            hit = cached.get(cache_key)
+            summaries.append({
+                "user_id": user_id,
+                "document_id": document.id,
+                "batch_id": batch.id,
+                "level": level,
+                "status": SummaryStatus.DONE if hit else SummaryStatus.PROCESSING,
+                "summary_text": hit.summary_text if hit else None,
+                "model": hit.model if hit else (model or settings.GIGACHAT_DEFAULT_MODEL),
+                "error": None,
+                "temperature": temperature,
+                "max_steps": max_steps,
+                "anonymization_mode": anonymization_mode,
+                "cache_key": cache_key,
+                # Ключи одинаковы у всех строк: массовая вставка идёт одним INSERT
+                **(reading_plan_columns(hit.summary_text) if hit else {"word_count": None, "reading_plan": None}),
+            })
+        created_summaries = await summary_dao.add_many(summaries)
+        await session.commit()
+    except BaseException:
+        # Без записей в БД сохранённые файлы никому не принадлежат
+        for path in saved_paths:
+            Path(path).unlink(missing_ok=True)
+        raise
+
+    await session.refresh(batch, ["created_at"])
+
+    if any(summary.status == SummaryStatus.PROCESSING for summary in created_summaries):
+        notify_summary_workers()
+
+    items = [SummaryBatchItem.model_validate(summary) for summary in created_summaries]
+    return _batch_response(batch, items)
+
+
+@router.get("/batches/{batch_id}", status_code=status.HTTP_200_OK, response_model=SummaryBatchResponse)
+async def get_summary_batch(
+        batch_id: str,
+        user_id: str = Depends(get_current_user_id),
+        session: AsyncSession = Depends(get_db),
+):
+    batch = await SummaryBatchDAO(session).find_one_or_none(id=batch_id)
+
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch не найден"
+        )
+
+    rows = await SummaryDAO(session).find_batch_items(batch_id)
+    items = [SummaryBatchItem.model_validate(row) for row in rows]
+    return _batch_response(batch, items)
+
+
+def _batch_response(batch: SummaryBatch, items: list[SummaryBatchItem]) -> SummaryBatchResponse:
+    counts = Counter(item.status for item in items)
+    return SummaryBatchResponse(
+        id=batch.id,
+        total=batch.total,
+        processing=counts[SummaryStatus.PROCESSING],
+        done=counts[SummaryStatus.DONE],
+        failed=counts[SummaryStatus.ERROR],
+        created_at=batch.created_at,
+        items=items,
+    )
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[tuple[datetime, str]]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/summaries", status_code=status.HTTP_200_OK, response_model=SummaryListResponse)
+async def list_summaries(
+        cursor: Optional[str] = Query(None, description="next_cursor из предыдущей страницы"),
+        limit: int = Query(20, ge=1, le=100),
+        summary_status: Optional[SummaryStatus] = Query(None, alias="status"),
+        level: Optional[SummaryLevel] = Query(None),
+        user_id: str = Depends(get_current_user_id),
+        session: AsyncSession = Depends(get_db),
+):
+    rows = await SummaryDAO(session).list_for_user(
+        user_id,
+        limit=limit,
+        after=_decode_cursor(cursor),
+        status=summary_status,
+        level=level,
+    )
+    items, next_cursor = keyset_page(rows, limit)
+    return SummaryListResponse(
+        items=[SummaryListItem.model_validate(row) for row in items],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/documents", status_code=status.HTTP_200_OK, response_model=DocumentListResponse)
+async def list_documents(
+        cursor: Optional[str] = Query(None, description="next_cursor из предыдущей страницы"),
+        limit: int = Query(20, ge=1, le=100),
+        source_type: Optional[SourceType] = Query(None),
+        user_id: str = Depends(get_current_user_id),
+        session: AsyncSession = Depends(get_db),
+):
+    rows = await DocumentDAO(session).list_for_user(
+        user_id,
+        limit=limit,
+        after=_decode_cursor(cursor),
+        source_type=source_type,
+    )
+    items, next_cursor = keyset_page(rows, limit)
+    return DocumentListResponse(
+        items=[DocumentListItem.model_validate(row) for row in items],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/summaries/{summary_id}/stream")
+async def stream_summary(
+        summary_id: str,
+        offset: int = Query(0, ge=0, description="Смещение в тексте, с которого продолжить"),
+        last_event_id: Optional[str] = Header(None),
+        user_id: str = Depends(get_current_user_id),
+        session: AsyncSession = Depends(get_db, scope="function"),
+):
+    dao = SummaryDAO(session)
+    summary = await dao.find_one_or_none(id=summary_id)
+
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Summary не найден"
+        )
+
+    generation: Optional[int] = None
+    if last_event_id:
+        generation_part, _, offset_part = last_event_id.rpartition(":")
+        if offset_part.isdigit():
+            offset = int(offset_part)
+            generation = int(generation_part) if generation_part.isdigit() else None
+
+    return StreamingResponse(
+        generate_summary_progress_stream(summary_id, offset, generation),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
 
 
 @router.get("/summaries/{summary_id}", status_code=status.HTTP_200_OK, response_model=SummaryResponse)
@@ -146,14 +620,13 @@ async def get_summary(
     return summary
 
 
-@router.get(
-    "/summaries/{summary_id}/speed-read-info",
-    status_code=status.HTTP_200_OK,
-    response_model=SpeedReadInfo
+@router.post(
+    "/summaries/{summary_id}/retry",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=SummaryResponse
 )
-async def get_speed_read_info(
+async def retry_summary(
         summary_id: str,
-        words_per_minute: int = Query(100, ge=50, le=1000),
         user_id: str = Depends(get_current_user_id),
         session: AsyncSession = Depends(get_db),
 ):
@@ -166,25 +639,39 @@ async def get_speed_read_info(
             detail="Summary не найден"
         )
 
-    if summary.status != SummaryStatus.DONE:
+    if summary.status != SummaryStatus.ERROR:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Summary имеет статус {summary.status.value}, требуется {SummaryStatus.DONE.value}"
+            detail=f"Summary имеет статус {summary.status.value}, требуется {SummaryStatus.ERROR.value}"
         )
 
-    if not summary.summary_text:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Summary не содержит текста"
-        )
+    # Производный уровень при повторе считается самостоятельно, без основного прогона
+    summary = await dao.update(
+        id=summary_id,
+        status=SummaryStatus.PROCESSING,
+        error=None,
+        locked_at=None,
+        attempts=0,
+        source_summary_id=None,
+    )
+    derived = await dao.find_derived(summary_id, SummaryStatus.ERROR)
+    await dao.update_many([
+        {"id": item.id, "status": SummaryStatus.PROCESSING, "error": None}
+        for item in derived
+    ])
+    await session.commit()
+    notify_summary_workers()
 
-    return calculate_reading_info(summary_id, summary.summary_text, words_per_minute)
+    return summary
 
 
-@router.get("/summaries/{summary_id}/speed-read")
-async def speed_read_summary(
+@router.get(
+    "/summaries/{summary_id}/levels",
+    status_code=status.HTTP_200_OK,
+    response_model=list[SummaryResponse]
+)
+async def get_summary_levels(
         summary_id: str,
-        words_per_minute: int = Query(100, ge=50, le=1000, description="Скорость чтения (слов в минуту)"),
         user_id: str = Depends(get_current_user_id),
         session: AsyncSession = Depends(get_db),
 ):
@@ -197,23 +684,87 @@ async def speed_read_summary(
             detail="Summary не найден"
         )
 
-    if summary.status != SummaryStatus.DONE:
+    derived = await dao.find_derived(summary_id)
+    return [summary, *derived]
+
+
+async def _get_reading_plan(session: AsyncSession, summary_id: str) -> ReadingPlan:
+    """
+    План скорочтения из LRU, при промахе - из сохранённой разбивки в summaries.
+    Для summary, завершённых до появления разбивки, она считается и сохраняется здесь.
+    """
+    plan = reading_plan_cache.get(summary_id)
+    if plan is not None:
+        return plan
+
+    dao = SummaryDAO(session)
+    row = await dao.find_reading_data(summary_id)
+
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Summary не найден"
+        )
+
+    if row.status != SummaryStatus.DONE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Summary имеет статус {summary.status.value}"
+            detail=f"Summary имеет статус {row.status.value}, требуется {SummaryStatus.DONE.value}"
         )
 
-    if not summary.summary_text:
+    if not row.summary_text:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Summary не содержит текста"
         )
 
+    if row.reading_plan is not None and row.word_count is not None:
+        plan = load_reading_plan(row.summary_text, row.word_count, row.reading_plan)
+    else:
+        # План пишется при завершении summary; здесь только строки, созданные до появления плана
+        plan = build_reading_plan(row.summary_text)
+        await dao.save_reading_plan(summary_id, plan.word_count, dump_reading_plan(plan))
+        await session.commit()
+
+    reading_plan_cache.put(summary_id, plan)
+    return plan
+
+
+@router.get(
+    "/summaries/{summary_id}/speed-read-info",
+    status_code=status.HTTP_200_OK,
+    response_model=SpeedReadInfo
+)
+async def get_speed_read_info(
+        summary_id: str,
+        words_per_minute: int = Query(100, ge=50, le=1000),
+        user_id: str = Depends(get_current_user_id),
+        session: AsyncSession = Depends(get_db),
+):
+    plan = await _get_reading_plan(session, summary_id)
+    return calculate_reading_info(summary_id, plan, words_per_minute)
+
+
+@router.get("/summaries/{summary_id}/speed-read")
+async def speed_read_summary(
+        summary_id: str,
+        words_per_minute: int = Query(100, ge=50, le=1000, description="Скорость чтения (слов в минуту)"),
+        offset: int = Query(0, ge=0, description="Индекс слова, с которого продолжить"),
+        adaptive: bool = Query(True, description="Дольше показывать длинные слова и концы фраз"),
+        last_event_id: Optional[str] = Header(None),
+        user_id: str = Depends(get_current_user_id),
+        session: AsyncSession = Depends(get_db, scope="function"),
+):
+    plan = await _get_reading_plan(session, summary_id)
+
+    if last_event_id and last_event_id.isdigit():
+        offset = int(last_event_id)
+
     return StreamingResponse(
-        generate_speed_reading_stream(summary.summary_text, words_per_minute),
+        generate_speed_reading_stream(plan, words_per_minute, offset, adaptive),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
         }
-    )
\ No newline at end of file
+    )
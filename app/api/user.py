@@ -4,7 +4,7 @@ from sqlalchemy.exc import IntegrityError
 
 from app.user.schemas import UserRegister
 from app.user.dao import UserDAO
-from app.auth.security.password import get_password_hash
+from app.auth.security.password import PasswordPoolSaturatedError, hash_password
 from app.core.database import get_db
 
 router = APIRouter(prefix="/user", tags=["user"])
@@ -25,7 +25,14 @@ async def create_user(
         )
 
     user_dict = user_data.model_dump(exclude=['password'])
-    user_dict["hashed_password"] = get_password_hash(user_data.password)
+    try:
+        user_dict["hashed_password"] = await hash_password(user_data.password)
+    except PasswordPoolSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
 
     try:
         new_user = await dao.add(**user_dict)
@@ -1,5 +1,8 @@
+import uuid
 from datetime import datetime, timezone
-from sqlalchemy import select, update
+from typing import Optional
+
+from sqlalchemy import select, update, delete, insert, literal, or_
 from app.core.base_dao import BaseDAO
 from app.auth.models import RefreshToken
 
@@ -12,4 +15,50 @@ class RefreshTokenDAO(BaseDAO):
             .where(RefreshToken.token_hash == token_hash, RefreshToken.revoked_at.is_(None))
             .values(revoked_at=datetime.now(timezone.utc))
         )
-        await self.session.execute(q)
\ No newline at end of file
+        await self.session.execute(q)
+
+    async def rotate(self, token_hash: str, new_token_hash: str, expires_at: datetime) -> Optional[str]:
+        """
+        Отзывает действующий токен и выпускает новый одним запросом (UPDATE ... RETURNING внутри INSERT).
+        Возвращает user_id или None, если токен не найден, отозван или истёк;
+        из двух параллельных ротаций одного токена успешна только одна.
+        """
+        now = datetime.now(timezone.utc)
+        rotated = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(revoked_at=now)
+            .returning(RefreshToken.user_id)
+            .cte("rotated")
+        )
+        stmt = (
+            insert(RefreshToken)
+            .from_select(
+                ["id", "user_id", "token_hash", "expires_at"],
+                select(
+                    literal(str(uuid.uuid4())),
+                    rotated.c.user_id,
+                    literal(new_token_hash),
+                    literal(expires_at, RefreshToken.expires_at.type),
+                ),
+            )
+            .returning(RefreshToken.user_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def delete_stale(self, *, revoked_before: datetime, limit: int) -> int:
+        """Удаляет до limit истёкших или давно отозванных токенов, строки под блокировкой пропускаются."""
+        now = datetime.now(timezone.utc)
+        ids = (
+            select(RefreshToken.id)
+            .where(or_(RefreshToken.expires_at < now, RefreshToken.revoked_at < revoked_before))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids.scalar_subquery())))
+        return result.rowcount or 0
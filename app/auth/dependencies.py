@@ -1,9 +1,9 @@
 from fastapi import HTTPException, Request, status
 from jose import JWTError
 
-from app.auth.security.jwt_token import decode_token
+from app.auth.security.jwt_token import get_token_subject
 
-def get_current_user_id(request: Request) -> str:
+async def get_current_user_id(request: Request) -> str:
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(
@@ -12,16 +12,15 @@ def get_current_user_id(request: Request) -> str:
         )
 
     try:
-        payload = decode_token(token)
-        sub = payload.get("sub")
+        sub = get_token_subject(token)
         if not sub:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Не авторизирован",
             )
-        return str(sub)
+        return sub
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Не авторизирован",
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.auth.dao import RefreshTokenDAO
+from app.core.config import settings
+from app.core.database import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+_task: Optional[asyncio.Task] = None
+
+
+async def prune_refresh_tokens() -> int:
+    """
+    Удаляет истёкшие и отозванные дольше REFRESH_TOKEN_REVOKED_RETENTION_SECONDS токены
+    пачками по REFRESH_TOKEN_PRUNE_BATCH_SIZE, каждая пачка в своей транзакции.
+    """
+    revoked_before = datetime.now(timezone.utc) - timedelta(seconds=settings.REFRESH_TOKEN_REVOKED_RETENTION_SECONDS)
+    total = 0
+
+    while True:
+        async with async_session_maker() as session:
+            deleted = await RefreshTokenDAO(session).delete_stale(
+                revoked_before=revoked_before,
+                limit=settings.REFRESH_TOKEN_PRUNE_BATCH_SIZE,
+            )
+            await session.commit()
+
+        total += deleted
+        if deleted < settings.REFRESH_TOKEN_PRUNE_BATCH_SIZE:
+            return total
+        await asyncio.sleep(0)
+
+
+async def _prune_loop() -> None:
+    while True:
+        try:
+            deleted = await prune_refresh_tokens()
+            if deleted:
+                logger.info("refresh_tokens: удалено устаревших токенов: %s", deleted)
+        except Exception:
+            logger.exception("refresh_tokens: не удалось удалить устаревшие токены")
+        await asyncio.sleep(settings.REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS)
+
+
+def start_refresh_token_pruner() -> None:
+    global _task
+    if _task is None and settings.REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS > 0:
+        _task = asyncio.create_task(_prune_loop(), name="refresh-token-pruner")
+
+
+async def stop_refresh_token_pruner() -> None:
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    await asyncio.gather(_task, return_exceptions=True)
+    _task = None
@@ -1,5 +1,8 @@
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Optional
 
 from jose import jwt
 
@@ -20,4 +23,78 @@ def decode_token(token: str) -> dict[str, Any]:
         settings.SECRET_KEY,
         algorithms=[settings.ALGORITHM],
         options={"verify_signature": True, "verify_exp": True, "require": ["exp", "sub"]},
-    )
\ No newline at end of file
+    )
+
+
+class VerifiedTokenCache:
+    """
+    In-process LRU уже проверенных access-токенов: sha256 токена -> sub.
+    Запись живёт до exp токена, но не дольше max_ttl, поэтому истёкший токен
+    из кэша не принимается. Невалидные токены не кэшируются.
+    """
+
+    def __init__(self, max_size: int, max_ttl: float):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._items: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[str]:
+        key = self._key(token)
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        subject, expires_at = item
+        if expires_at <= time.time():
+            del self._items[key]
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return subject
+
+    def put(self, token: str, subject: str, exp: float) -> None:
+        if self.max_size <= 0:
+            return
+        key = self._key(token)
+        self._items[key] = (subject, min(float(exp), time.time() + self.max_ttl))
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._items),
+            "max_size": self.max_size,
+        }
+
+
+verified_token_cache = VerifiedTokenCache(settings.JWT_CACHE_SIZE, settings.JWT_CACHE_MAX_TTL_SECONDS)
+
+
+def get_token_subject(token: str) -> Optional[str]:
+    """sub проверенного токена; JWTError, если токен невалиден или истёк."""
+    subject = verified_token_cache.get(token)
+    if subject is not None:
+        return subject
+
+    payload = decode_token(token)
+    sub = payload.get("sub")
+    if not sub:
+        return None
+
+    verified_token_cache.put(token, str(sub), payload["exp"])
+    return str(sub)
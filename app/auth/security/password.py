@@ -1,9 +1,128 @@
+import asyncio
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+
+class PasswordPoolSaturatedError(Exception):
+    """Очередь операций с паролями заполнена, запрос нужно повторить позже."""
+
+
+class PasswordHasherPool:
+    """
+    bcrypt выполняется в отдельном пуле потоков ограниченного размера (библиотека отпускает GIL),
+    поэтому не блокирует event loop. Если выполняющихся и ожидающих операций больше max_pending,
+    новая операция сразу отклоняется, а не копится в очереди.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+        return self._executor
+
+    def _track(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            self._running += 1
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._busy_seconds += time.perf_counter() - started
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordPoolSaturatedError("Сервер перегружен операциями с паролями")
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), self._track, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_ms": round(self._busy_seconds / self._completed * 1000, 1) if self._completed else None,
+                "bcrypt_rounds": settings.PASSWORD_BCRYPT_ROUNDS,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordHasherPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+# Хеш для проверки при неизвестной почте: считается с текущей стоимостью,
+# чтобы время ответа не выдавало, существует ли пользователь
+_dummy_hash: Optional[str] = None
+_dummy_hash_lock = asyncio.Lock()
+
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def hash_password(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Проверка пароля; второй элемент - новый хеш, если сохранённый посчитан с устаревшими параметрами."""
+    return await password_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def verify_dummy_password(plain_password: str) -> None:
+    global _dummy_hash
+    if _dummy_hash is None:
+        async with _dummy_hash_lock:
+            if _dummy_hash is None:
+                _dummy_hash = await hash_password(secrets.token_urlsafe(16))
+    await password_pool.run(verify_password, plain_password, _dummy_hash)
+
+
+def shutdown_password_pool() -> None:
+    password_pool.shutdown()
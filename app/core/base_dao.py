@@ -1,4 +1,4 @@
-from sqlalchemy import update as sa_update, delete as sa_delete
+from sqlalchemy import insert as sa_insert, update as sa_update, delete as sa_delete
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -29,6 +29,26 @@ class BaseDAO:
         await self.session.flush()
         return obj
 
+    async def add_many(self, items: list[dict]) -> list:
+        """
+        Массовая вставка одним INSERT ... RETURNING.
+        Возвращает созданные объекты в порядке items.
+        """
+        if not items:
+            return []
+        stmt = sa_insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self.session.scalars(stmt, items)
+        return list(result.all())
+
+    async def update_many(self, items: list[dict]) -> None:
+        """
+        Массовое обновление по первичному ключу: каждый элемент items содержит id и новые значения.
+        """
+        if not items:
+            return
+        await self.session.execute(sa_update(self.model), items)
+        await self.session.flush()
+
     async def update(self, *, id: str, **data):
         """
         Обновляет объект по первичному ключу id.
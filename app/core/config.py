@@ -14,14 +14,36 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_USER: str
     DB_PASSWORD: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    # Кеш подготовленных выражений asyncpg и SQLAlchemy; 0 - для pgbouncer в режиме transaction
+    DB_STATEMENT_CACHE_SIZE: int = 256
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000
 
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
+    JWT_CACHE_SIZE: int = 10_000
+    JWT_CACHE_MAX_TTL_SECONDS: int = 300
+
+    REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS: float = 3600.0
+    REFRESH_TOKEN_PRUNE_BATCH_SIZE: int = 1000
+    REFRESH_TOKEN_REVOKED_RETENTION_SECONDS: int = 60 * 60 * 24
+
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    # Сверх этого числа выполняющихся и ожидающих операций запросы сразу получают 503
+    PASSWORD_HASH_MAX_PENDING: int = 32
 
     PERPLEXITY_API_KEY: str
     PERPLEXITY_API_URL: str = "https://api.perplexity.ai/chat/completions"
     PERPLEXITY_DEFAULT_MODEL: str = "sonar-pro"
     PERPLEXITY_TIMEOUT: float = 60.0
+    PERPLEXITY_RATE_LIMIT_PER_SECOND: float = 5.0
+    PERPLEXITY_RATE_LIMIT_BURST: int = 10
+    PERPLEXITY_MAX_CONCURRENCY: int = 8
 
     GIGACHAT_AUTH_KEY: str | None = None
     GIGACHAT_OAUTH_URL: str = "https://ngw.devices.sberbank.ru:9443/api/v2/oauth"
@@ -30,9 +52,32 @@ class Settings(BaseSettings):
     GIGACHAT_DEFAULT_MODEL: str = "GigaChat-2"
     GIGACHAT_TIMEOUT: float = 60.0
     GIGACHAT_VERIFY_SSL: bool = False
+    GIGACHAT_MAX_CONCURRENCY: int = 16
+    GIGACHAT_MAX_CONNECTIONS: int = 32
+    GIGACHAT_TOKEN_REFRESH_MARGIN_SECONDS: int = 120
+    GIGACHAT_RATE_LIMIT_PER_SECOND: float = 10.0
+    GIGACHAT_RATE_LIMIT_BURST: int = 20
+
+    LLM_FALLBACK_PROVIDER: str | None = None
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Офлайн-заменитель GigaChat и Perplexity для нагрузочного тестирования и CI
+    FAKE_LLM_ENABLED: bool = False
+    FAKE_LLM_LATENCY_MS_MEAN: float = 800.0
+    FAKE_LLM_LATENCY_MS_STDDEV: float = 200.0
+    FAKE_LLM_TOKENS_PER_SECOND: float = 40.0
+    FAKE_LLM_TOKENS_PER_SECOND_STDDEV: float = 10.0
+    FAKE_LLM_RESPONSE_WORDS: int = 120
+    FAKE_LLM_ERROR_RATE: float = 0.0
 
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE_MB: int = 50
+    # Предел всего тела запроса: Starlette спулит загрузки на диск до того, как роут проверит размер файла
+    MAX_REQUEST_BODY_MB: int = 512
     ALLOWED_FILE_EXTENSIONS: list[str] = [
         ".pdf", ".txt", ".pptx"
         ".doc", ".docx",
@@ -40,6 +85,41 @@ class Settings(BaseSettings):
 
     MAX_TEXT_CHARS: int = 200_000
 
+    PDF_EXTRACTION_WORKERS: int = 2
+    PDF_PAGES_PER_TASK: int = 8
+    PDF_MAX_PARALLEL_TASKS: int = 2
+    PDF_MAX_PAGES: int = 2000
+    PDF_EXTRACTION_TIMEOUT_SECONDS: float = 120.0
+
+    SUMMARY_WORKERS: int = 4
+    SUMMARY_JOB_POLL_SECONDS: float = 2.0
+    SUMMARY_JOB_LEASE_SECONDS: int = 900
+    SUMMARY_JOB_MAX_ATTEMPTS: int = 3
+    SUMMARY_BATCH_MAX_ITEMS: int = 500
+
+    SUMMARY_CACHE_LRU_SIZE: int = 1024
+
+    ANONYMIZATION_MODE: str = "hybrid"
+
+    TEXT_CACHE_ENABLED: bool = True
+    TEXT_CACHE_COMPRESS_LEVEL: int = 6
+    # Файлы, к которым не обращались дольше MAX_AGE, удаляются; сверх MAX_SIZE - самые давние
+    TEXT_CACHE_MAX_AGE_SECONDS: int = 60 * 60 * 24 * 7
+    TEXT_CACHE_MAX_SIZE_MB: int = 1024
+    TEXT_CACHE_SWEEP_INTERVAL_SECONDS: float = 3600.0
+
+    SUMMARY_CHUNK_THRESHOLD_CHARS: int = 24_000
+    SUMMARY_CHUNK_SIZE_CHARS: int = 12_000
+    SUMMARY_CHUNK_CONCURRENCY: int = 4
+    SUMMARY_REDUCE_MAX_CHARS: int = 24_000
+
+    SUMMARY_STREAM_FLUSH_SECONDS: float = 1.0
+    SUMMARY_STREAM_POLL_SECONDS: float = 1.0
+
+    SPEED_READ_BATCH_SECONDS: float = 2.0
+    SPEED_READ_MAX_BATCH_WORDS: int = 50
+    READING_PLAN_CACHE_SIZE: int = 1024
+
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".env"),
         extra="ignore",
@@ -72,6 +152,10 @@ class Settings(BaseSettings):
     def max_file_size_bytes(self) -> int:
         return self.MAX_FILE_SIZE_MB * 1024 * 1024
 
+    @property
+    def max_request_body_bytes(self) -> int:
+        return self.MAX_REQUEST_BODY_MB * 1024 * 1024
+
     def is_file_extension_allowed(self, filename: str) -> bool:
         ext = Path(filename).suffix.lower()
         return ext in self.ALLOWED_FILE_EXTENSIONS
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.rate_limit import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LLMProviderError(Exception):
+    """
+    Ошибка обращения к LLM-провайдеру.
+    retryable=True - временный сбой (429, 5xx, таймаут, сеть): можно повторить или уйти на резервного провайдера.
+    """
+
+    def __init__(self, message: str, *, provider: str, retryable: bool = False, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.retryable = retryable
+        self.status_code = status_code
+
+
+class LLMUnavailableError(LLMProviderError):
+    """Circuit breaker провайдера разомкнут, запрос не отправлялся."""
+
+    def __init__(self, provider: str):
+        super().__init__(f"Провайдер {provider} временно недоступен", provider=provider, retryable=True)
+
+
+def is_retryable_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+class CircuitBreaker:
+    """
+    После failure_threshold подряд временных сбоев провайдер считается недоступным на reset_seconds.
+    Затем пропускается один пробный запрос: успех замыкает цепь, сбой снова размыкает.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def acquire(self) -> Optional[bool]:
+        """
+        None - запрос не пропускается; иначе True, если этот запрос стал пробным:
+        только он потом может освободить пробу через release_probe.
+        """
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return None
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probe_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """
+        Пробный запрос завершился без оценки провайдера (отмена, ошибка в коде, постоянная ошибка 4xx):
+        состояние не меняется, следующий запрос может стать пробным.
+        """
+        self._probe_in_flight = False
+
+
+class CallStats:
+    def __init__(self, window: int = 1000):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self._latencies_ms: deque[float] = deque(maxlen=window)
+
+    def record(self, latency_ms: float, ok: bool) -> None:
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self._latencies_ms.append(latency_ms)
+
+    def snapshot(self) -> dict[str, float]:
+        latencies = sorted(self._latencies_ms)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+        }
+
+
+_semaphores: dict[str, asyncio.Semaphore] = {}
+_breakers: dict[str, CircuitBreaker] = {}
+_stats: dict[tuple[str, str], CallStats] = {}
+
+
+def get_provider_semaphore(provider: str) -> asyncio.Semaphore:
+    semaphore = _semaphores.get(provider)
+    if semaphore is None:
+        limits = {
+            "gigachat": settings.GIGACHAT_MAX_CONCURRENCY,
+            "perplexity": settings.PERPLEXITY_MAX_CONCURRENCY,
+        }
+        semaphore = asyncio.Semaphore(limits[provider])
+        _semaphores[provider] = semaphore
+    return semaphore
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = CircuitBreaker(settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS)
+        _breakers[provider] = breaker
+    return breaker
+
+
+def _get_stats(provider: str, model: str) -> CallStats:
+    stats = _stats.get((provider, model))
+    if stats is None:
+        stats = CallStats()
+        _stats[(provider, model)] = stats
+    return stats
+
+
+def _backoff_delay(attempt: int) -> float:
+    # Full jitter: равномерно от 0 до экспоненциальной границы
+    cap = min(settings.LLM_RETRY_MAX_DELAY_SECONDS, settings.LLM_RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
+    return random.uniform(0, cap)
+
+
+async def call_llm(provider: str, model: str, call: Callable[[], Awaitable[T]]) -> T:
+    """
+    Единая точка вызова провайдера: ограничение параллельности и частоты,
+    повторы с джиттером на временных ошибках, circuit breaker и метрики по провайдеру и модели.
+    call должен бросать LLMProviderError, чтобы отличать временные сбои от остальных.
+    """
+    breaker = get_circuit_breaker(provider)
+    stats = _get_stats(provider, model)
+
+    attempt = 0
+    while True:
+        probe = breaker.acquire()
+        if probe is None:
+            raise LLMUnavailableError(provider)
+
+        started = time.perf_counter()
+        settled = False
+        try:
+            async with get_provider_semaphore(provider):
+                await get_rate_limiter(provider).acquire()
+                result = await call()
+        except LLMProviderError as e:
+            stats.record((time.perf_counter() - started) * 1000, ok=False)
+            # Постоянная ошибка (4xx) говорит о запросе, а не о доступности провайдера: нейтральна
+            if not e.retryable:
+                raise
+            breaker.record_failure()
+            settled = True
+            if attempt >= settings.LLM_MAX_RETRIES:
+                raise
+        except Exception:
+            stats.record((time.perf_counter() - started) * 1000, ok=False)
+            raise
+        else:
+            stats.record((time.perf_counter() - started) * 1000, ok=True)
+            breaker.record_success()
+            settled = True
+            return result
+        finally:
+            # Отмена (отключение SSE-клиента, таймаут) или нейтральный исход не должны оставлять
+            # пробу занятой навсегда; чужую пробу освобождать нельзя
+            if probe and not settled:
+                breaker.release_probe()
+
+        delay = _backoff_delay(attempt)
+        attempt += 1
+        stats.retries += 1
+        logger.warning("LLM %s/%s: временная ошибка, повтор %s через %.2f с", provider, model, attempt, delay)
+        await asyncio.sleep(delay)
+
+
+def llm_stats() -> dict:
+    providers = {
+        provider: {
+            "circuit": breaker.state,
+            "consecutive_failures": breaker.failures,
+        }
+        for provider, breaker in _breakers.items()
+    }
+    models = [
+        {"provider": provider, "model": model, **stats.snapshot()}
+        for (provider, model), stats in _stats.items()
+    ]
+    return {"providers": providers, "models": models}
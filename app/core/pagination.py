@@ -0,0 +1,30 @@
+import base64
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Позиция (created_at, id) последней выданной строки; ValueError для повреждённого курсора."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), id
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Некорректный курсор") from e
+
+
+def keyset_page(rows: Sequence[Any], limit: int) -> tuple[list[Any], Optional[str]]:
+    """
+    rows запрошены с limit + 1: лишняя строка означает, что есть следующая страница,
+    курсор указывает на последнюю отданную.
+    """
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor(last.created_at, last.id)
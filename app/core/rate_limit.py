@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    """
+    Ограничение частоты запросов к внешнему провайдеру в пределах процесса.
+    rate - пополнение в секунду, capacity - допустимый всплеск.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        if self.rate <= 0:
+            return
+
+        # Ожидающие встают в очередь по lock, чтобы не будить всех сразу
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+_buckets: dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    bucket = _buckets.get(provider)
+    if bucket is None:
+        limits = {
+            "gigachat": (settings.GIGACHAT_RATE_LIMIT_PER_SECOND, settings.GIGACHAT_RATE_LIMIT_BURST),
+            "perplexity": (settings.PERPLEXITY_RATE_LIMIT_PER_SECOND, settings.PERPLEXITY_RATE_LIMIT_BURST),
+        }
+        rate, capacity = limits[provider]
+        bucket = TokenBucket(rate, capacity)
+        _buckets[provider] = bucket
+    return bucket
@@ -1,12 +1,41 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.api.auth import router as auth_router
 from app.api.user import router as user_router
 from app.api.text import router as text_router
+from app.api.metrics import router as metrics_router
+from app.auth.maintenance import start_refresh_token_pruner, stop_refresh_token_pruner
+from app.auth.security.password import shutdown_password_pool
+from app.core.config import settings
+from app.core.middleware import BodySizeLimitMiddleware
+from app.text.document_cache import start_text_cache_sweeper, stop_text_cache_sweeper
+from app.text.extraction import shutdown_extraction_pool
+from app.text.gigachat_client import close_gigachat_clients
+from app.text.perplexity_client import close_perplexity_client
+from app.text.worker import start_summary_workers, stop_summary_workers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_summary_workers()
+    start_refresh_token_pruner()
+    start_text_cache_sweeper()
+    yield
+    await stop_text_cache_sweeper()
+    await stop_refresh_token_pruner()
+    await stop_summary_workers()
+    await close_gigachat_clients()
+    await close_perplexity_client()
+    shutdown_extraction_pool()
+    shutdown_password_pool()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(BodySizeLimitMiddleware, max_body_size=settings.max_request_body_bytes)
 
 app.include_router(auth_router)
 app.include_router(user_router)
-app.include_router(text_router)
\ No newline at end of file
+app.include_router(text_router)
+app.include_router(metrics_router)
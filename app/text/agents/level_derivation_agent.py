@@ -0,0 +1,78 @@
+import time
+from typing import Any
+
+from app.text.enums import SummaryLevel
+from app.text.llm_client import llm_chat
+from app.text.agents.smart_summarizer_agent import LEVEL_INSTRUCTIONS
+from app.text.schemas import SummarizeRequest
+
+# От самого подробного к самому короткому: основной прогон делается по первому из запрошенных
+LEVEL_ORDER = [SummaryLevel.DETAILED, SummaryLevel.MEDIUM, SummaryLevel.SHORT, SummaryLevel.TLDR]
+
+
+def order_levels(levels: list[SummaryLevel]) -> list[SummaryLevel]:
+    # AUTO не имеет фиксированной длины и может быть только единственным уровнем
+    return sorted(set(levels), key=lambda level: LEVEL_ORDER.index(level) if level in LEVEL_ORDER else -1)
+
+
+def _build_system_prompt() -> str:
+    return """Ты сокращаешь готовые резюме документов.
+
+Правила работы:
+1. Используй только информацию из исходного резюме, не добавляй новых фактов
+2. Сохрани главные идеи и самые важные факты
+3. Отвечай на русском языке"""
+
+
+def _build_user_prompt(source_text: str, level: SummaryLevel) -> str:
+    return f"""Ниже подробное резюме документа.
+
+ЗАДАЧА:
+Сделай из него {LEVEL_INSTRUCTIONS[level]}.
+
+РЕЗЮМЕ:
+{source_text}"""
+
+
+async def derive_summary(
+        request: SummarizeRequest,
+        source_text: str,
+        level: SummaryLevel,
+) -> dict[str, Any]:
+    """
+    Короткий уровень строится из уже готового подробного резюме одним вызовом без tools:
+    документ повторно не извлекается, не обезличивается и не проходит через агента.
+    """
+    messages = [
+        {"role": "system", "content": _build_system_prompt()},
+        {"role": "user", "content": _build_user_prompt(source_text, level)},
+    ]
+
+    started = time.perf_counter()
+    reply = await llm_chat(
+        messages=messages,
+        model=request.model,
+        temperature=request.temperature,
+    )
+    step = {
+        "step": 0,
+        "stage": "derive",
+        "duration_ms": int((time.perf_counter() - started) * 1000),
+        "request_chars": sum(len(message["content"]) for message in messages),
+        "response_chars": len(reply.content),
+        **(reply.usage or {}),
+    }
+
+    return {
+        "summary": reply.content,
+        "level": level.value,
+        "steps": [step],
+        "metadata": {
+            "agent": "level_derivation_agent",
+            "model": reply.model,
+            "provider": reply.provider,
+            "temperature": request.temperature,
+            "source_level": request.level.value,
+            "source_chars": len(source_text),
+        }
+    }
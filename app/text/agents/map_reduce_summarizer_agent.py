@@ -0,0 +1,288 @@
+import asyncio
+import hashlib
+import time
+from typing import Any, AsyncIterator, Optional
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.text.chunking import ChunkPacker
+from app.text.complexity import TextComplexityAnalyzer, resolve_auto_level
+from app.text.dao import SummaryChunkDAO
+from app.text.enums import SummaryLevel, SummaryStatus
+from app.text.gigachat_client import EventCallback
+from app.text.llm_client import llm_chat
+from app.text.schemas import SummarizeRequest
+from app.text.tools import anonymize_data
+from app.text.agents.smart_summarizer_agent import LEVEL_INSTRUCTIONS
+
+
+def _build_system_prompt() -> str:
+    return """Ты умный агент для суммаризации больших документов.
+
+Документ разбит на фрагменты, каждый фрагмент уже обезличен.
+
+Правила работы:
+1. Не выдумывай факты - используй только информацию из документа
+2. Не упоминай, что работаешь с фрагментами или частями
+3. Создавай структурированные и понятные резюме
+4. Отвечай на русском языке"""
+
+
+def _build_map_prompt(chunk: str, chunk_idx: int) -> str:
+    return f"""Фрагмент {chunk_idx + 1}.
+
+ЗАДАЧА:
+Сделай сжатое изложение фрагмента:
+- Сохрани все ключевые идеи, факты, цифры и выводы
+- Убери воду, повторы и несущественные детали
+- Не добавляй вступлений и заключений
+
+Фрагмент:
+{chunk}"""
+
+
+def _build_reduce_prompt(partials: list[str], level: SummaryLevel) -> str:
+    parts = "\n\n".join(f"Часть {idx + 1}:\n{partial}" for idx, partial in enumerate(partials))
+
+    if level == SummaryLevel.AUTO:
+        task = """1. Оцени объём и информативность документа по изложениям его частей
+2. САМ выбери оптимальный уровень детализации: tldr, short, medium или detailed
+3. Создай резюме выбранного уровня
+4. В начале ответа укажи: "Выбран уровень: [уровень], потому что [краткое объяснение]\""""
+    else:
+        task = f"Создай {LEVEL_INSTRUCTIONS[level]} всего документа"
+
+    return f"""Ниже последовательные сжатые изложения частей одного документа.
+
+ЗАДАЧА:
+{task}
+
+Требования к резюме:
+- Сохрани все ключевые идеи и важные факты
+- Убери повторы между частями
+- Сделай текст структурированным и легко читаемым
+- Используй русский язык
+
+{parts}"""
+
+
+def _hash_chunk(chunk: str) -> str:
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+def _group_by_size(parts: list[str], max_chars: int) -> list[list[str]]:
+    groups: list[list[str]] = []
+    current_len = 0
+    for part in parts:
+        if groups and current_len + len(part) <= max_chars:
+            groups[-1].append(part)
+            current_len += len(part)
+        else:
+            groups.append([part])
+            current_len = len(part)
+    return groups
+
+
+async def _iter_chunks(pages: AsyncIterator[str], max_chars: int) -> AsyncIterator[str]:
+    """
+    Фрагменты не зависят от того, пришёл текст страницами при первом разборе или одним куском
+    из кеша: иначе хеши фрагментов при повторе не совпадут и пересчитается всё.
+    """
+    packer = ChunkPacker(max_chars)
+    async for page in pages:
+        for chunk in packer.feed(page):
+            yield chunk
+    for chunk in packer.close():
+        yield chunk
+
+
+async def _load_done_chunks(summary_id: Optional[str]) -> dict[int, tuple[str, str]]:
+    if summary_id is None:
+        return {}
+
+    async with async_session_maker() as session:
+        chunks = await SummaryChunkDAO(session).find_all(summary_id=summary_id)
+
+    return {
+        chunk.chunk_index: (chunk.content_hash, chunk.summary_text)
+        for chunk in chunks
+        if chunk.status == SummaryStatus.DONE and chunk.summary_text
+    }
+
+
+async def _save_chunk(summary_id: Optional[str], chunk_idx: int, content_hash: str, **data) -> None:
+    if summary_id is None:
+        return
+
+    async with async_session_maker() as session:
+        await SummaryChunkDAO(session).save_result(
+            summary_id=summary_id,
+            chunk_index=chunk_idx,
+            content_hash=content_hash,
+            **data,
+        )
+        await session.commit()
+
+
+async def _call_model(
+        request: SummarizeRequest,
+        prompt: str,
+        on_event: Optional[EventCallback] = None,
+        step: Optional[dict[str, Any]] = None,
+) -> str:
+    system_prompt = _build_system_prompt()
+    started = time.perf_counter()
+    reply = await llm_chat(
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt},
+        ],
+        model=request.model,
+        temperature=request.temperature,
+        on_event=on_event,
+    )
+    if step is not None:
+        step["duration_ms"] = int((time.perf_counter() - started) * 1000)
+        step["request_chars"] = len(system_prompt) + len(prompt)
+        step["response_chars"] = len(reply.content)
+        step["provider"] = reply.provider
+        step["model"] = reply.model
+        if reply.usage is not None:
+            step.update(reply.usage)
+    return reply.content
+
+
+async def _summarize_chunk(
+        request: SummarizeRequest,
+        chunk: str,
+        chunk_idx: int,
+        summary_id: Optional[str],
+        semaphore: asyncio.Semaphore,
+        on_event: Optional[EventCallback],
+        step: dict[str, Any],
+) -> str:
+    content_hash = _hash_chunk(chunk)
+
+    async with semaphore:
+        try:
+            anonymized = await anonymize_data(text=chunk, mode=request.anonymization_mode)
+            if not anonymized["success"]:
+                raise Exception(anonymized["error"])
+
+            partial = await _call_model(request, _build_map_prompt(anonymized["anonymized_text"], chunk_idx), step=step)
+        except Exception as e:
+            await _save_chunk(summary_id, chunk_idx, content_hash, status=SummaryStatus.ERROR, error=str(e))
+            raise
+
+    await _save_chunk(summary_id, chunk_idx, content_hash, status=SummaryStatus.DONE, summary_text=partial)
+    if on_event is not None:
+        await on_event({"event": "chunk_finished", "chunk": chunk_idx})
+    return partial
+
+
+async def _reduce(
+        request: SummarizeRequest,
+        partials: list[str],
+        steps: list[dict[str, Any]],
+        on_event: Optional[EventCallback],
+) -> str:
+    max_chars = settings.SUMMARY_REDUCE_MAX_CHARS
+
+    while len(partials) > 1 and sum(len(p) for p in partials) > max_chars:
+        groups = _group_by_size(partials, max_chars)
+        if len(groups) == len(partials):
+            break
+
+        group_steps = [
+            {"step": len(steps) + idx, "stage": "reduce_intermediate", "parts": len(group)}
+            for idx, group in enumerate(groups)
+        ]
+        partials = await asyncio.gather(*(
+            _call_model(request, _build_map_prompt("\n\n".join(group), idx), step=group_step)
+            for idx, (group, group_step) in enumerate(zip(groups, group_steps))
+        ))
+        steps.extend(group_steps)
+
+    if on_event is not None:
+        await on_event({"event": "reduce_started", "parts": len(partials)})
+
+    step = {"step": len(steps), "stage": "reduce", "parts": len(partials)}
+    summary = await _call_model(request, _build_reduce_prompt(partials, request.level), on_event, step)
+    steps.append(step)
+    return summary
+
+
+async def summarize_map_reduce(
+        request: SummarizeRequest,
+        pages: AsyncIterator[str],
+        summary_id: Optional[str] = None,
+        on_event: Optional[EventCallback] = None,
+        complexity: Optional[TextComplexityAnalyzer] = None,
+) -> dict[str, Any]:
+    """
+    Суммаризация документов, не помещающихся в контекст модели:
+    фрагменты обезличиваются и сжимаются параллельно (map), затем сводятся в резюме нужного уровня (reduce).
+    Фрагменты отправляются в работу по мере поступления страниц, не дожидаясь разбора всего файла.
+    Результаты фрагментов сохраняются, поэтому повторный запуск пересчитывает только упавшие фрагменты.
+    complexity - анализатор, который видел все страницы: по нему уровень AUTO выбирается перед reduce.
+    """
+    done_chunks = await _load_done_chunks(summary_id)
+    semaphore = asyncio.Semaphore(settings.SUMMARY_CHUNK_CONCURRENCY)
+
+    steps: list[dict[str, Any]] = []
+    tasks: list[asyncio.Future] = []
+    try:
+        idx = 0
+        async for chunk in _iter_chunks(pages, settings.SUMMARY_CHUNK_SIZE_CHARS):
+            saved = done_chunks.get(idx)
+            cached = saved is not None and saved[0] == _hash_chunk(chunk)
+            step = {"step": idx, "stage": "map", "chunk": idx, "cached": cached}
+            steps.append(step)
+
+            if cached:
+                tasks.append(asyncio.ensure_future(asyncio.sleep(0, result=saved[1])))
+            else:
+                tasks.append(asyncio.ensure_future(
+                    _summarize_chunk(request, chunk, idx, summary_id, semaphore, on_event, step)
+                ))
+            idx += 1
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    if not tasks:
+        raise Exception("Документ не содержит текста")
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    failed = [(idx, res) for idx, res in enumerate(results) if isinstance(res, BaseException)]
+    if failed:
+        indexes = ", ".join(str(idx + 1) for idx, _ in failed)
+        raise Exception(f"Не удалось обработать фрагменты документа ({indexes}): {failed[0][1]}")
+
+    auto_level = None
+    if complexity is not None and request.level == SummaryLevel.AUTO:
+        level, auto_level = resolve_auto_level(complexity)
+        request = request.model_copy(update={"level": level})
+
+    summary = await _reduce(request, list(results), steps, on_event)
+
+    return {
+        "summary": summary,
+        "level": request.level.value,
+        "steps": steps,
+        "metadata": {
+            "auto_level": auto_level,
+            "agent": "map_reduce_summarizer_agent",
+            # Итоговый текст - ответ reduce: его модель и записывается в summary
+            "model": steps[-1]["model"],
+            "provider": steps[-1]["provider"],
+            "temperature": request.temperature,
+            "source_type": "file" if request.file_path else "text",
+            "source": request.file_path or f"{request.text[:50]}...",
+            "chunks": len(tasks),
+            "reused_chunks": sum(1 for step in steps if step.get("cached")),
+            "total_steps": len(steps)
+        }
+    }
@@ -1,9 +1,13 @@
-from typing import Any
+import time
+from typing import Any, Optional
 
 from app.core.config import settings
 from app.text.enums import SummaryLevel
-from app.text.gigachat_client import gigachat_chat_with_tools
-from app.text.tools import get_default_tools, execute_tool
+from app.core.llm_gateway import LLMProviderError
+from app.text.gigachat_client import EventCallback, gigachat_chat_with_tools
+from app.text.llm_client import chat_with_provider, fallback_provider
+from app.text.tools import anonymize_data, get_default_tools, execute_tool_call, tool_run
+from app.text.tools.document_store import document_store, register_document
 from app.text.schemas import SummarizeRequest
 
 
@@ -11,40 +15,37 @@ def _build_system_prompt() -> str:
     return """Ты умный агент для суммаризации документов.
 
 У тебя есть доступ к инструментам (tools):
-- anonymize_data - обезличивает конфиденциальные данные (принимает file_path ИЛИ text)
+- anonymize_data - возвращает обезличенный текст документа по ссылке document_ref
+- analyze_text_complexity - рекомендует уровень детализации (доступен только в режиме AUTO)
+- run_tools - выполняет несколько независимых вызовов tools параллельно за один шаг
 
 Правила работы:
-1. ВСЕГДА сначала вызывай anonymize_data для обработки данных
-   - Если получил file_path - передай file_path
-   - Если получил text - передай text
-   - НИКОГДА не передавай оба параметра одновременно!
+1. ВСЕГДА сначала вызывай anonymize_data с document_ref из задания
+   - Передавай только document_ref, никогда не пересказывай и не копируй текст в аргументы
 2. Работай только с обезличенным текстом
 3. Не выдумывай факты - используй только информацию из документа
 4. Создавай структурированные и понятные резюме
 5. Отвечай на русском языке"""
 
 
-def _build_user_prompt(request: SummarizeRequest) -> str:
-    level_instructions = {
-        SummaryLevel.TLDR: "ультракороткое резюме (2-3 предложения)",
-        SummaryLevel.SHORT: "краткое резюме (1-2 абзаца)",
-        SummaryLevel.MEDIUM: "среднее резюме (3-5 абзацев)",
-        SummaryLevel.DETAILED: "подробное структурированное резюме со всеми важными деталями"
-    }
+LEVEL_INSTRUCTIONS = {
+    SummaryLevel.TLDR: "ультракороткое резюме (2-3 предложения)",
+    SummaryLevel.SHORT: "краткое резюме (1-2 абзаца)",
+    SummaryLevel.MEDIUM: "среднее резюме (3-5 абзацев)",
+    SummaryLevel.DETAILED: "подробное структурированное резюме со всеми важными деталями"
+}
 
-    if request.file_path:
-        source_info = f"Файл для обработки: {request.file_path}"
-        anonymize_instruction = f'1. Вызови anonymize_data с параметром file_path="{request.file_path}"'
-    else:
-        source_info = "Текст для обработки передан напрямую"
-        anonymize_instruction = '1. Вызови anonymize_data с параметром text="<переданный текст>"'
+
+def _build_user_prompt(request: SummarizeRequest, document_ref: str) -> str:
+    source_info = f'Документ загружен и обезличен, ссылка на него: document_ref="{document_ref}"'
+    anonymize_instruction = f'1. Вызови anonymize_data с параметром document_ref="{document_ref}"'
 
     if request.level == SummaryLevel.AUTO:
         return f"""{source_info}
 
 ЗАДАЧА:
-{anonymize_instruction}
-2. Проанализируй полученный текст:
+1. Одним вызовом run_tools получи anonymize_data и analyze_text_complexity, обоим передай document_ref="{document_ref}"
+2. Проанализируй полученный текст и рекомендацию analyze_text_complexity:
    - Оцени водность (много повторов и общих фраз?)
    - Оцени информативность (много конкретных фактов, цифр, деталей?)
    - Оцени объем (сколько слов примерно?)
@@ -58,7 +59,7 @@ def _build_user_prompt(request: SummarizeRequest) -> str:
 
 Создай качественное резюме документа."""
     else:
-        instruction = level_instructions[request.level]
+        instruction = LEVEL_INSTRUCTIONS[request.level]
         return f"""{source_info}
 
 ЗАДАЧА:
@@ -74,47 +75,131 @@ def _build_user_prompt(request: SummarizeRequest) -> str:
 Создай качественное резюме документа."""
 
 
-async def summarize_with_agent(request: SummarizeRequest) -> dict[str, Any]:
-    source_type = "file" if request.file_path else "text"
-    source_value = request.file_path if request.file_path else (
-        f"{request.text[:50]}..." if len(request.text) > 50 else request.text
-    )
+def _build_task_prompt(request: SummarizeRequest) -> str:
+    if request.level == SummaryLevel.AUTO:
+        return """Сам выбери оптимальный уровень детализации (tldr, short, medium или detailed) и создай резюме документа.
+В начале ответа укажи: "Выбран уровень: [уровень], потому что [краткое объяснение]"
+"""
+
+    return f"""Создай {LEVEL_INSTRUCTIONS[request.level]} документа.
+Сохрани ключевые идеи и важные факты, убери воду и повторы."""
+
+
+async def _prepare_document(request: SummarizeRequest, text: Optional[str]) -> str:
+    mode = request.anonymization_mode
+    if text is not None:
+        anonymized = await anonymize_data(text=text, mode=mode)
+    else:
+        anonymized = await anonymize_data(file_path=request.file_path, text=request.text, mode=mode)
 
+    if not anonymized["success"]:
+        raise Exception(anonymized["error"])
+
+    return anonymized["anonymized_text"]
+
+
+async def _summarize_with_fallback(
+        request: SummarizeRequest,
+        anonymized_text: str,
+        on_event: Optional[EventCallback],
+        provider: str,
+) -> dict[str, Any]:
+    """
+    Резервный провайдер не поддерживает function calling: текст уже обезличен
+    на сервере, поэтому он передаётся в промпт напрямую, без tool loop.
+    """
     messages = [
         {
             "role": "system",
-            "content": _build_system_prompt()
+            "content": "Ты умный агент для суммаризации документов. Не выдумывай факты и отвечай на русском языке."
         },
         {
             "role": "user",
-            "content": _build_user_prompt(request)
+            "content": f"{_build_task_prompt(request)}\n\nТЕКСТ ДОКУМЕНТА:\n{anonymized_text}"
         }
     ]
 
-    if request.text:
-        messages[1]["content"] += f"\n\nТекст:\n{request.text}"
-
-    tools = get_default_tools()
-
-    result = await gigachat_chat_with_tools(
+    started = time.perf_counter()
+    reply = await chat_with_provider(
+        provider,
         messages=messages,
-        tools_specs=tools,
-        execute_tool_func=execute_tool,
-        model=request.model,
         temperature=request.temperature,
-        max_steps=request.max_steps
+        on_event=on_event,
+    )
+    step = {
+        "step": 0,
+        "stage": "fallback",
+        "finish_reason": "stop",
+        "duration_ms": int((time.perf_counter() - started) * 1000),
+        "request_chars": sum(len(message["content"]) for message in messages),
+        "response_chars": len(reply.content),
+        **(reply.usage or {}),
+    }
+    return {"content": reply.content, "steps": [step], "provider": reply.provider, "model": reply.model}
+
+
+async def summarize_with_agent(
+        request: SummarizeRequest,
+        text: Optional[str] = None,
+        on_event: Optional[EventCallback] = None,
+) -> dict[str, Any]:
+    """
+    Анонимизация выполняется на сервере до запуска агента,
+    модели передаётся только ссылка на обезличенный документ.
+    text - уже извлечённый текст документа, если он есть у вызывающего кода.
+    """
+    source_type = "file" if request.file_path else "text"
+    source_value = request.file_path if request.file_path else (
+        f"{request.text[:50]}..." if len(request.text) > 50 else request.text
     )
 
+    anonymized_text = await _prepare_document(request, text)
+
+    with document_store(), tool_run():
+        document_ref = register_document(anonymized_text)
+
+        messages = [
+            {
+                "role": "system",
+                "content": _build_system_prompt()
+            },
+            {
+                "role": "user",
+                "content": _build_user_prompt(request, document_ref)
+            }
+        ]
+
+        tools = get_default_tools(request.level)
+
+        try:
+            result = await gigachat_chat_with_tools(
+                messages=messages,
+                tools_specs=tools,
+                execute_tool_func=execute_tool_call,
+                model=request.model,
+                temperature=request.temperature,
+                max_steps=request.max_steps,
+                on_event=on_event
+            )
+            result.update(provider="gigachat", model=request.model or settings.GIGACHAT_DEFAULT_MODEL)
+        except LLMProviderError as e:
+            fallback = fallback_provider(e.provider)
+            if not e.retryable or fallback is None:
+                raise
+            result = await _summarize_with_fallback(request, anonymized_text, on_event, fallback)
+
     return {
         "summary": result["content"],
         "level": request.level.value,
         "steps": result["steps"],
         "metadata": {
             "agent": "smart_summarizer_agent",
-            "model": request.model or settings.GIGACHAT_DEFAULT_MODEL,
+            "model": result["model"],
+            "provider": result["provider"],
             "temperature": request.temperature,
             "source_type": source_type,
             "source": source_value,
+            "anonymized_chars": len(anonymized_text),
             "total_steps": len(result["steps"])
         }
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,185 @@
+import re
+from collections import Counter
+
+PLACEHOLDER_EMAIL = "[EMAIL]"
+PLACEHOLDER_PHONE = "[ТЕЛЕФОН]"
+PLACEHOLDER_DOCUMENT = "[ДОКУМЕНТ]"
+PLACEHOLDER_ACCOUNT = "[СЧЕТ]"
+
+_EMAIL_RE = re.compile(r"(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+# Быстрый первый проход: находит только отрезки, похожие на номер,
+# подробные шаблоны применяются уже к ним, а не к каждой позиции текста
+_NUMBER_RUN_RE = re.compile(r"[+\d][\d\s()№+-]{8,}\d")
+
+# Шаблоны в порядке приоритета. Если номер не прошёл проверку контрольных цифр,
+# пробуется следующий шаблон: 10 цифр с неверной контрольной суммой ИНН - это, например, паспорт
+_NUMBER_PATTERNS = [
+    ("phone", re.compile(r"(?:\+7|8)[\s-]?\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{2}[\s-]?\d{2}(?!\d)")),
+    ("card", re.compile(r"\d{4}(?:[ -]?\d{4}){2}[ -]?\d{1,7}(?!\d)")),
+    ("account", re.compile(r"\d{20}(?!\d)")),
+    ("snils", re.compile(r"\d{3}-?\d{3}-?\d{3}[ -]?\d{2}(?!\d)")),
+    ("inn", re.compile(r"\d{10}(?:\d{2})?(?!\d)")),
+    ("passport", re.compile(r"\d{2}\s?\d{2}\s?№?\s?\d{6}(?!\d)")),
+]
+# Позиции, с которых может начинаться номер: не внутри другого числа
+_NUMBER_START_RE = re.compile(r"(?<![\d+])[+\d]")
+
+# Граница, на которой поток безопасно резать: пробел не между цифрами
+_BOUNDARY_RE = re.compile(r"(?<=[^\d\s+(])\s+(?=[^\d\s+(])")
+_MAX_MATCH_LEN = 128
+_BOUNDARY_WINDOW = 1024
+
+_INN10_WEIGHTS = (2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN12_WEIGHTS_1 = (7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN12_WEIGHTS_2 = (3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+
+
+def _digits(value: str) -> list[int]:
+    return [int(ch) for ch in value if ch.isdigit()]
+
+
+def is_valid_luhn(value: str) -> bool:
+    digits = _digits(value)
+    if not 13 <= len(digits) <= 19:
+        return False
+
+    total = 0
+    for idx, digit in enumerate(reversed(digits)):
+        if idx % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def _inn_check_digit(digits: list[int], weights: tuple[int, ...]) -> int:
+    return sum(d * w for d, w in zip(digits, weights)) % 11 % 10
+
+
+def is_valid_inn(value: str) -> bool:
+    digits = _digits(value)
+    if len(digits) == 10:
+        return _inn_check_digit(digits, _INN10_WEIGHTS) == digits[9]
+    if len(digits) == 12:
+        return (
+            _inn_check_digit(digits, _INN12_WEIGHTS_1) == digits[10]
+            and _inn_check_digit(digits, _INN12_WEIGHTS_2) == digits[11]
+        )
+    return False
+
+
+def is_valid_snils(value: str) -> bool:
+    digits = _digits(value)
+    if len(digits) != 11:
+        return False
+
+    number, control = digits[:9], digits[9] * 10 + digits[10]
+    total = sum(d * (9 - idx) for idx, d in enumerate(number))
+    if total > 101:
+        total %= 101
+    expected = 0 if total in (100, 101) else total
+    return expected == control
+
+
+_VALIDATORS = {
+    "card": is_valid_luhn,
+    "snils": is_valid_snils,
+    "inn": is_valid_inn,
+}
+
+_PLACEHOLDERS = {
+    "phone": PLACEHOLDER_PHONE,
+    "card": PLACEHOLDER_ACCOUNT,
+    "account": PLACEHOLDER_ACCOUNT,
+    "snils": PLACEHOLDER_DOCUMENT,
+    "inn": PLACEHOLDER_DOCUMENT,
+    "passport": PLACEHOLDER_DOCUMENT,
+}
+
+
+def _anonymize_chunk(text: str, stats: Counter) -> str:
+    def replace_email(match: re.Match) -> str:
+        stats["email"] += 1
+        return PLACEHOLDER_EMAIL
+
+    if "@" in text:
+        text = _EMAIL_RE.sub(replace_email, text)
+
+    return _NUMBER_RUN_RE.sub(lambda run: _mask_numbers(run.group(), stats), text)
+
+
+def _match_number(run: str, pos: int) -> tuple[str, int] | None:
+    for kind, pattern in _NUMBER_PATTERNS:
+        match = pattern.match(run, pos)
+        if match is None:
+            continue
+        validator = _VALIDATORS.get(kind)
+        if validator is None or validator(match.group()):
+            return kind, match.end()
+    return None
+
+
+def _mask_numbers(run: str, stats: Counter) -> str:
+    parts: list[str] = []
+    last = 0
+    pos = 0
+    while (start := _NUMBER_START_RE.search(run, pos)) is not None:
+        found = _match_number(run, start.start())
+        if found is None:
+            pos = start.end()
+            continue
+        kind, end = found
+        stats[kind] += 1
+        parts.append(run[last:start.start()])
+        parts.append(_PLACEHOLDERS[kind])
+        last = pos = end
+    parts.append(run[last:])
+    return "".join(parts)
+
+
+def anonymize_text(text: str) -> tuple[str, dict[str, int]]:
+    """
+    Локально маскирует структурированные ПДн: email, телефоны, карты (Luhn),
+    счета, СНИЛС и ИНН (контрольные цифры), паспорта.
+    Возвращает обезличенный текст и число замен по категориям.
+    """
+    stats: Counter = Counter()
+    return _anonymize_chunk(text, stats), dict(stats)
+
+
+class StreamingAnonymizer:
+    """
+    Потоковый вариант anonymize_text: текст подаётся частями (страницами), feed возвращает
+    обезличенную часть, готовую к выдаче. Хвост придерживается до безопасной границы,
+    чтобы не разрезать номер между частями; close отдаёт остаток.
+    """
+
+    def __init__(self):
+        self.stats: Counter = Counter()
+        self._carry = ""
+
+    def feed(self, piece: str) -> str:
+        buffer = self._carry + piece
+        limit = len(buffer) - _MAX_MATCH_LEN
+
+        cut = 0
+        if limit > 0:
+            # Граница ищется в конце буфера, весь буфер просматривается, только если там её нет
+            for start in (max(limit - _BOUNDARY_WINDOW, 0), 0):
+                for match in _BOUNDARY_RE.finditer(buffer, start, limit):
+                    cut = match.end()
+                if cut or not start:
+                    break
+
+        if cut <= 0:
+            self._carry = buffer
+            return ""
+
+        self._carry = buffer[cut:]
+        return _anonymize_chunk(buffer[:cut], self.stats)
+
+    def close(self) -> str:
+        carry, self._carry = self._carry, ""
+        return _anonymize_chunk(carry, self.stats) if carry else ""
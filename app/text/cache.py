@@ -0,0 +1,74 @@
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+from app.text.enums import SummaryLevel, AnonymizationMode
+from app.text.schemas import SummaryResponse
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def build_cache_key(
+        content_hash: str,
+        level: SummaryLevel,
+        model: Optional[str],
+        temperature: float,
+        anonymization_mode: AnonymizationMode,
+) -> str:
+    model_name = model or settings.GIGACHAT_DEFAULT_MODEL
+    raw = f"{content_hash}:{level.value}:{model_name}:{temperature:.3f}:{anonymization_mode.value}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """
+    In-process LRU поверх индекса summaries.cache_key.
+    Хранит готовые ответы только для summary в статусе DONE.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict[str, SummaryResponse] = OrderedDict()
+        self.lru_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[SummaryResponse]:
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+            self.lru_hits += 1
+        return item
+
+    def put(self, key: str, summary: SummaryResponse) -> None:
+        if self.max_size <= 0:
+            return
+        self._items[key] = summary
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def record_db_hit(self) -> None:
+        self.db_hits += 1
+
+    def record_miss(self) -> None:
+        self.misses += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "lru_hits": self.lru_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "lru_size": len(self._items),
+            "lru_max_size": self.max_size,
+        }
+
+
+summary_cache = SummaryCache(settings.SUMMARY_CACHE_LRU_SIZE)
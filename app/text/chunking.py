@@ -0,0 +1,90 @@
+import re
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_LINE_RE = re.compile(r"\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+")
+
+# Разделитель страниц документа: и при разборе, и в кеше извлечённого текста,
+# чтобы граница страницы всегда была границей абзаца и фрагменты не зависели от источника
+PAGE_SEPARATOR = "\n\n"
+
+
+def split_into_chunks(text: str, max_chars: int) -> list[str]:
+    """
+    Делит текст на фрагменты не длиннее max_chars, стараясь резать по структуре:
+    сначала по абзацам, затем по строкам, затем по предложениям и только потом посимвольно.
+    Соседние мелкие части склеиваются, чтобы фрагментов было как можно меньше.
+    """
+    packer = ChunkPacker(max_chars)
+    return packer.feed(text) + packer.close()
+
+
+class ChunkPacker:
+    """
+    Потоковый split_into_chunks: текст подаётся страницами, граница страницы считается
+    границей абзаца. Результат зависит только от текста, а не от разбиения на страницы:
+    фрагменты совпадают с split_into_chunks(PAGE_SEPARATOR.join(pages)).
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._current: list[str] = []
+        self._current_len = 0
+
+    def feed(self, text: str) -> list[str]:
+        """Возвращает фрагменты, которые уже не изменятся."""
+        chunks: list[str] = []
+        for part in _split_units(text, self.max_chars):
+            part_len = len(part) + 2
+            if self._current and self._current_len + part_len > self.max_chars:
+                chunks.append("\n\n".join(self._current))
+                self._current = []
+                self._current_len = 0
+            self._current.append(part)
+            self._current_len += part_len
+        return chunks
+
+    def close(self) -> list[str]:
+        chunks = ["\n\n".join(self._current)] if self._current else []
+        self._current = []
+        self._current_len = 0
+        return chunks
+
+
+def _split_units(text: str, max_chars: int) -> list[str]:
+    units: list[str] = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            units.append(paragraph)
+            continue
+        for piece in _split_oversized(paragraph, max_chars):
+            units.append(piece)
+    return units
+
+
+def _split_oversized(paragraph: str, max_chars: int) -> list[str]:
+    for separator_re, joiner in ((_LINE_RE, "\n"), (_SENTENCE_RE, " ")):
+        parts = [p.strip() for p in separator_re.split(paragraph) if p.strip()]
+        if len(parts) > 1:
+            pieces: list[str] = []
+            for part in parts:
+                if len(part) <= max_chars:
+                    pieces.append(part)
+                else:
+                    pieces.extend(_split_oversized(part, max_chars))
+            return _merge_small(pieces, max_chars, joiner)
+
+    return [paragraph[i:i + max_chars] for i in range(0, len(paragraph), max_chars)]
+
+
+def _merge_small(pieces: list[str], max_chars: int, joiner: str) -> list[str]:
+    merged: list[str] = []
+    for piece in pieces:
+        if merged and len(merged[-1]) + len(piece) + len(joiner) <= max_chars:
+            merged[-1] = f"{merged[-1]}{joiner}{piece}"
+        else:
+            merged.append(piece)
+    return merged
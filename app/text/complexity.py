@@ -0,0 +1,181 @@
+import re
+from dataclasses import dataclass, asdict
+from typing import Any, Iterable
+
+from app.text.enums import SummaryLevel
+
+# Числа с разделителями ("2.5", "1.2.3", "3,14") - одно слово, а не конец предложения
+_TOKEN_RE = re.compile(r"\d+(?:[.,]\d+)+|\w+(?:[-'’]\w+)*|[.!?…]+")
+_MARKDOWN_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+\S")
+# Только многоуровневая нумерация ("2.1 Методы"): "1. Купить молоко" - пункт списка
+_NUMBERED_HEADING_RE = re.compile(r"^\s*\d+(?:\.\d+)+\.?\s+[A-ZА-ЯЁ][^.!?]{0,80}$")
+_LIST_ITEM_RE = re.compile(r"^\s*(?:[-*•–—]|\d+[.)]|[a-zа-я][.)])\s+\S")
+
+_LEVELS = [SummaryLevel.TLDR, SummaryLevel.SHORT, SummaryLevel.MEDIUM, SummaryLevel.DETAILED]
+
+# Границы по объёму совпадают с правилами, которые раньше передавались модели в промпте
+_TLDR_MAX_WORDS = 300
+_SHORT_MAX_WORDS = 500
+_MEDIUM_MAX_WORDS = 2000
+
+_HIGH_REDUNDANCY = 0.30
+_HIGH_INFO_DENSITY = 0.12
+_LOW_INFO_DENSITY = 0.03
+_STRUCTURE_MIN_MARKERS = 3
+
+# Ограничение памяти на шинглы для очень длинных документов
+_MAX_SHINGLES = 500_000
+
+
+@dataclass(frozen=True)
+class ComplexityReport:
+    words: int
+    sentences: int
+    avg_sentence_words: float
+    headings: int
+    list_items: int
+    numeric_ratio: float
+    entity_ratio: float
+    info_density: float
+    redundancy: float
+
+    @property
+    def has_structure(self) -> bool:
+        return self.headings + self.list_items >= _STRUCTURE_MIN_MARKERS
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "has_structure": self.has_structure}
+
+
+class TextComplexityAnalyzer:
+    """
+    Детерминированная оценка текста за один проход по потоку фрагментов:
+    статистика слов и предложений, заголовки и списки, доля чисел и имён собственных,
+    лексическая избыточность (доля повторяющихся словесных триграмм).
+    """
+
+    def __init__(self):
+        self._tail = ""
+        self.words = 0
+        self.sentences = 0
+        self.headings = 0
+        self.list_items = 0
+        self.numeric = 0
+        self.entities = 0
+        self._sentence_start = True
+        self._prev: tuple[str, str] = ("", "")
+        self._shingles: set[int] = set()
+        self._shingles_total = 0
+        self._shingles_repeated = 0
+
+    def feed(self, piece: str) -> None:
+        lines = (self._tail + piece).split("\n")
+        self._tail = lines.pop()
+        for line in lines:
+            self._feed_line(line)
+
+    def _feed_line(self, line: str) -> None:
+        if not line.strip():
+            return
+
+        if _MARKDOWN_HEADING_RE.match(line) or _NUMBERED_HEADING_RE.match(line) or (
+                len(line) <= 80 and line.isupper()
+        ):
+            self.headings += 1
+            self._sentence_start = True
+        elif _LIST_ITEM_RE.match(line):
+            self.list_items += 1
+            self._sentence_start = True
+
+        for match in _TOKEN_RE.finditer(line):
+            token = match.group()
+            if token[0] in ".!?…":
+                # Точка сразу после цифры - номер пункта или порядковое число, а не конец предложения
+                if token[0] == "." and match.start() and line[match.start() - 1].isdigit():
+                    continue
+                self.sentences += 1
+                self._sentence_start = True
+                continue
+
+            self.words += 1
+            if any(ch.isdigit() for ch in token):
+                self.numeric += 1
+            elif token[0].isupper() and not self._sentence_start:
+                self.entities += 1
+            self._sentence_start = False
+
+            word = token.lower()
+            first, second = self._prev
+            if first:
+                self._shingles_total += 1
+                shingle = hash((first, second, word))
+                if shingle in self._shingles:
+                    self._shingles_repeated += 1
+                elif len(self._shingles) < _MAX_SHINGLES:
+                    self._shingles.add(shingle)
+            self._prev = (second, word)
+
+    def report(self) -> ComplexityReport:
+        if self._tail:
+            self._feed_line(self._tail)
+            self._tail = ""
+
+        sentences = max(self.sentences, 1 if self.words else 0)
+        words = max(self.words, 1)
+        numeric_ratio = self.numeric / words
+        entity_ratio = self.entities / words
+
+        return ComplexityReport(
+            words=self.words,
+            sentences=sentences,
+            avg_sentence_words=round(self.words / sentences, 1) if sentences else 0.0,
+            headings=self.headings,
+            list_items=self.list_items,
+            numeric_ratio=round(numeric_ratio, 4),
+            entity_ratio=round(entity_ratio, 4),
+            info_density=round(numeric_ratio + entity_ratio, 4),
+            redundancy=round(self._shingles_repeated / self._shingles_total, 4) if self._shingles_total else 0.0,
+        )
+
+
+def recommend_level(report: ComplexityReport) -> tuple[SummaryLevel, str]:
+    if report.words < _TLDR_MAX_WORDS:
+        index, reason = 0, f"текст короткий ({report.words} слов)"
+    elif report.words < _SHORT_MAX_WORDS:
+        index, reason = 1, f"текст небольшой ({report.words} слов)"
+    elif report.words <= _MEDIUM_MAX_WORDS:
+        index, reason = 2, f"текст среднего размера ({report.words} слов)"
+    else:
+        index, reason = 3, f"текст длинный ({report.words} слов)"
+
+    reasons = [reason]
+
+    if report.redundancy >= _HIGH_REDUNDANCY:
+        index = max(index - 1, 0)
+        reasons.append(f"много повторов (избыточность {report.redundancy:.2f})")
+    elif report.info_density < _LOW_INFO_DENSITY and index > 0:
+        index -= 1
+        reasons.append(f"мало конкретики (плотность фактов {report.info_density:.2f})")
+    elif report.info_density >= _HIGH_INFO_DENSITY and index > 0:
+        index = min(index + 1, len(_LEVELS) - 1)
+        reasons.append(f"насыщен фактами и цифрами (плотность {report.info_density:.2f})")
+
+    if report.has_structure and report.words >= _TLDR_MAX_WORDS and index < 2:
+        index = 2
+        reasons.append("есть заголовки и списки")
+
+    return _LEVELS[index], ", ".join(reasons)
+
+
+def analyze_text(pieces: Iterable[str]) -> ComplexityReport:
+    analyzer = TextComplexityAnalyzer()
+    for piece in pieces:
+        analyzer.feed(piece)
+    return analyzer.report()
+
+
+def resolve_auto_level(analyzer: TextComplexityAnalyzer) -> tuple[SummaryLevel, dict[str, Any]]:
+    """Уровень для SummaryLevel.AUTO и сведения о выборе для metadata результата."""
+    report = analyzer.report()
+    level, reasoning = recommend_level(report)
+    return level, {"level": level.value, "reasoning": reasoning, "stats": report.to_dict()}
@@ -1,10 +1,314 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, or_, delete, func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
 from app.core.base_dao import BaseDAO
-from app.text.models import Document, Summary
+from app.text.enums import SourceType, SummaryStatus, SummaryLevel
+from app.text.models import Document, Summary, SummaryChunk, SummaryBatch, SummaryStep
 
 
 class DocumentDAO(BaseDAO):
     model = Document
 
+    async def list_for_user(
+            self,
+            user_id: str,
+            *,
+            limit: int,
+            after: tuple[datetime, str] | None = None,
+            source_type: SourceType | None = None,
+    ):
+        """Страница документов пользователя от новых к старым, без original_text; limit + 1 строк."""
+        query = (
+            select(
+                Document.id,
+                Document.source_type,
+                Document.file_path,
+                Document.content_hash,
+                Document.created_at,
+            )
+            .where(Document.user_id == user_id)
+            .order_by(Document.created_at.desc(), Document.id.desc())
+            .limit(limit + 1)
+        )
+        if after is not None:
+            query = query.where(tuple_(Document.created_at, Document.id) < after)
+        if source_type is not None:
+            query = query.where(Document.source_type == source_type)
+
+        result = await self.session.execute(query)
+        return result.all()
+
 
 class SummaryDAO(BaseDAO):
-    model = Summary
\ No newline at end of file
+    model = Summary
+
+    async def find_cached(self, cache_key: str) -> Summary | None:
+        query = (
+            select(Summary)
+            .where(Summary.cache_key == cache_key, Summary.status == SummaryStatus.DONE)
+            .order_by(Summary.created_at.desc())
+            .limit(1)
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def find_cached_many(self, cache_keys: list[str]) -> list[Summary]:
+        """Самый свежий DONE summary для каждого ключа одним запросом (DISTINCT ON)."""
+        if not cache_keys:
+            return []
+        query = (
+            select(Summary)
+            .where(Summary.cache_key.in_(cache_keys), Summary.status == SummaryStatus.DONE)
+            .order_by(Summary.cache_key, Summary.created_at.desc())
+            .distinct(Summary.cache_key)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def find_derived(self, summary_id: str, status: SummaryStatus | None = None) -> list[Summary]:
+        query = select(Summary).where(Summary.source_summary_id == summary_id)
+        if status is not None:
+            query = query.where(Summary.status == status)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def find_batch_items(self, batch_id: str):
+        query = (
+            select(Summary.id, Summary.document_id, Summary.status, Summary.level, Summary.error)
+            .where(Summary.batch_id == batch_id)
+            .order_by(Summary.created_at, Summary.id)
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def list_for_user(
+            self,
+            user_id: str,
+            *,
+            limit: int,
+            after: tuple[datetime, str] | None = None,
+            status: SummaryStatus | None = None,
+            level: SummaryLevel | None = None,
+    ):
+        """
+        Страница summary пользователя от новых к старым по индексу (user_id, created_at, id):
+        продолжение с курсора не зависит от глубины истории, в отличие от OFFSET. limit + 1 строк.
+        """
+        query = (
+            select(
+                Summary.id,
+                Summary.document_id,
+                Summary.status,
+                Summary.level,
+                Summary.model,
+                Summary.error,
+                Summary.source_summary_id,
+                Summary.batch_id,
+                Summary.word_count,
+                Summary.created_at,
+                Summary.updated_at,
+            )
+            .where(Summary.user_id == user_id)
+            .order_by(Summary.created_at.desc(), Summary.id.desc())
+            .limit(limit + 1)
+        )
+        if after is not None:
+            query = query.where(tuple_(Summary.created_at, Summary.id) < after)
+        if status is not None:
+            query = query.where(Summary.status == status)
+        if level is not None:
+            query = query.where(Summary.level == level)
+
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def start_stream_generation(self, summary_id: str) -> int:
+        """Очищает частичный текст и начинает новую генерацию, возвращает её номер."""
+        stmt = (
+            update(Summary)
+            .where(Summary.id == summary_id)
+            .values(summary_text="", stream_generation=Summary.stream_generation + 1)
+            .returning(Summary.stream_generation)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() or 0
+
+    async def find_reading_data(self, summary_id: str):
+        """Только поля, нужные скорочтению, без загрузки всей строки."""
+        query = select(
+            Summary.status,
+            Summary.summary_text,
+            Summary.word_count,
+            Summary.reading_plan,
+        ).where(Summary.id == summary_id)
+        result = await self.session.execute(query)
+        return result.one_or_none()
+
+    async def save_reading_plan(self, summary_id: str, word_count: int, reading_plan: bytes) -> None:
+        """
+        Пишет план только туда, где его ещё нет: одновременные GET строят одинаковый план,
+        и повторная запись ничего не меняет.
+        """
+        stmt = (
+            update(Summary)
+            .where(Summary.id == summary_id, Summary.reading_plan.is_(None))
+            .values(word_count=word_count, reading_plan=reading_plan)
+        )
+        await self.session.execute(stmt)
+
+    async def claim_next(self, lease_seconds: int) -> Summary | None:
+        """
+        Забирает следующую задачу из очереди (FOR UPDATE SKIP LOCKED),
+        чтобы несколько реплик могли разбирать её параллельно.
+        Задачи с протухшей арендой (упавший воркер) забираются повторно.
+        """
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=lease_seconds)
+
+        query = (
+            select(Summary)
+            .where(
+                Summary.status == SummaryStatus.PROCESSING,
+                Summary.source_summary_id.is_(None),
+                or_(Summary.locked_at.is_(None), Summary.locked_at < stale_before),
+            )
+            .order_by(Summary.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(query)
+        summary = result.scalar_one_or_none()
+        if summary is None:
+            return None
+
+        summary.locked_at = now
+        summary.attempts += 1
+        await self.session.flush()
+        return summary
+
+    async def lock_derived(self, summary_id: str) -> list[Summary]:
+        """Берёт аренду на производные уровни в PROCESSING перед их выводом."""
+        stmt = (
+            update(Summary)
+            .where(Summary.source_summary_id == summary_id, Summary.status == SummaryStatus.PROCESSING)
+            .values(locked_at=datetime.now(timezone.utc))
+            .returning(Summary)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def claim_orphaned_derived(self, lease_seconds: int) -> tuple[Summary, Summary] | None:
+        """
+        Забирает производный уровень, брошенный упавшим процессом: источник уже DONE,
+        а аренда вывода протухла (или не бралась, и источник завершён дольше lease_seconds назад).
+        Возвращает (производный, источник).
+        """
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=lease_seconds)
+        source = aliased(Summary)
+
+        query = (
+            select(Summary, source)
+            .join(source, Summary.source_summary_id == source.id)
+            .where(
+                Summary.status == SummaryStatus.PROCESSING,
+                source.status == SummaryStatus.DONE,
+                func.coalesce(Summary.locked_at, source.updated_at) < stale_before,
+            )
+            .order_by(Summary.created_at)
+            .limit(1)
+            .with_for_update(of=Summary, skip_locked=True)
+        )
+        result = await self.session.execute(query)
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        summary, source_summary = row
+        summary.locked_at = now
+        summary.attempts += 1
+        await self.session.flush()
+        return summary, source_summary
+
+
+class SummaryBatchDAO(BaseDAO):
+    model = SummaryBatch
+
+
+class SummaryChunkDAO(BaseDAO):
+    model = SummaryChunk
+
+    async def save_result(
+            self,
+            *,
+            summary_id: str,
+            chunk_index: int,
+            content_hash: str,
+            status: SummaryStatus,
+            summary_text: str | None = None,
+            error: str | None = None,
+    ) -> None:
+        values = {
+            "content_hash": content_hash,
+            "status": status,
+            "summary_text": summary_text,
+            "error": error,
+        }
+        stmt = (
+            insert(SummaryChunk)
+            .values(summary_id=summary_id, chunk_index=chunk_index, **values)
+            .on_conflict_do_update(
+                constraint="uq_summary_chunks_summary_id_chunk_index",
+                set_=values,
+            )
+        )
+        await self.session.execute(stmt)
+
+
+class SummaryStepDAO(BaseDAO):
+    model = SummaryStep
+
+    async def delete_for_summary(self, summary_id: str) -> None:
+        await self.session.execute(delete(SummaryStep).where(SummaryStep.summary_id == summary_id))
+
+    async def aggregate_latencies(
+            self,
+            *,
+            since_hours: int,
+            model: str | None = None,
+            level: SummaryLevel | None = None,
+    ):
+        """
+        Задержки шагов по модели, уровню, стадии и tool: количество, среднее, p50/p95 и токены.
+        Окно считается в БД от localtimestamp: created_at заполняет now() в часовом поясе сессии.
+        """
+        query = (
+            select(
+                Summary.model,
+                Summary.level,
+                SummaryStep.stage,
+                SummaryStep.tool_name,
+                func.count().label("steps"),
+                func.avg(SummaryStep.llm_ms).label("llm_ms_avg"),
+                func.percentile_cont(0.5).within_group(SummaryStep.llm_ms).label("llm_ms_p50"),
+                func.percentile_cont(0.95).within_group(SummaryStep.llm_ms).label("llm_ms_p95"),
+                func.avg(SummaryStep.tool_ms).label("tool_ms_avg"),
+                func.percentile_cont(0.95).within_group(SummaryStep.tool_ms).label("tool_ms_p95"),
+                func.sum(SummaryStep.prompt_tokens).label("prompt_tokens"),
+                func.sum(SummaryStep.completion_tokens).label("completion_tokens"),
+            )
+            .join(Summary, Summary.id == SummaryStep.summary_id)
+            .where(SummaryStep.created_at >= func.localtimestamp() - timedelta(hours=since_hours))
+            .group_by(Summary.model, Summary.level, SummaryStep.stage, SummaryStep.tool_name)
+            .order_by(Summary.model, Summary.level, SummaryStep.stage, SummaryStep.tool_name)
+        )
+        if model is not None:
+            query = query.where(Summary.model == model)
+        if level is not None:
+            query = query.where(Summary.level == level)
+
+        result = await self.session.execute(query)
+        return result.all()
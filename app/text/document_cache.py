@@ -0,0 +1,138 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.text.enums import AnonymizationMode
+
+logger = logging.getLogger(__name__)
+
+_CACHE_DIR_NAME = ".cache"
+# Недописанные временные файлы (упавший процесс) старше этого возраста удаляются
+_TMP_MAX_AGE_SECONDS = 3600
+
+_sweeper: Optional[asyncio.Task] = None
+
+
+def hash_content(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cache_dir() -> Path:
+    return settings.upload_path / _CACHE_DIR_NAME
+
+
+def _extracted_path(content_hash: str) -> Path:
+    return _cache_dir() / f"{content_hash}.txt.gz"
+
+
+def _anonymized_path(content_hash: str, mode: AnonymizationMode) -> Path:
+    return _cache_dir() / f"{content_hash}.{mode.value}.anon.txt.gz"
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            text = f.read()
+        # mtime - время последнего использования, по нему работает очистка
+        os.utime(path)
+        return text
+    except (FileNotFoundError, EOFError, OSError):
+        return None
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=settings.TEXT_CACHE_COMPRESS_LEVEL) as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+async def load_extracted_text(content_hash: str) -> Optional[str]:
+    return await asyncio.to_thread(_read, _extracted_path(content_hash))
+
+
+async def save_extracted_text(content_hash: str, text: str) -> None:
+    await asyncio.to_thread(_write, _extracted_path(content_hash), text)
+
+
+async def load_anonymized_text(content_hash: str, mode: AnonymizationMode) -> Optional[str]:
+    return await asyncio.to_thread(_read, _anonymized_path(content_hash, mode))
+
+
+async def save_anonymized_text(content_hash: str, mode: AnonymizationMode, text: str) -> None:
+    await asyncio.to_thread(_write, _anonymized_path(content_hash, mode), text)
+
+
+def sweep_text_cache() -> int:
+    """
+    Удаляет файлы кеша, не использовавшиеся дольше TEXT_CACHE_MAX_AGE_SECONDS,
+    затем самые давние, пока общий размер больше TEXT_CACHE_MAX_SIZE_MB. Возвращает число удалённых.
+    """
+    now = time.time()
+    files: list[tuple[float, int, Path]] = []
+    deleted = 0
+
+    try:
+        entries = list(os.scandir(_cache_dir()))
+    except FileNotFoundError:
+        return 0
+
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        if not entry.is_file():
+            continue
+
+        max_age = _TMP_MAX_AGE_SECONDS if entry.name.endswith(".tmp") else settings.TEXT_CACHE_MAX_AGE_SECONDS
+        if now - stat.st_mtime > max_age:
+            Path(entry.path).unlink(missing_ok=True)
+            deleted += 1
+        elif not entry.name.endswith(".tmp"):
+            files.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+
+    total = sum(size for _, size, _ in files)
+    max_size = settings.TEXT_CACHE_MAX_SIZE_MB * 1024 * 1024
+    for _, size, path in sorted(files):
+        if total <= max_size:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        deleted += 1
+
+    return deleted
+
+
+async def _sweep_loop() -> None:
+    while True:
+        try:
+            deleted = await asyncio.to_thread(sweep_text_cache)
+            if deleted:
+                logger.info("text cache: удалено файлов: %s", deleted)
+        except Exception:
+            logger.exception("text cache: ошибка очистки")
+        await asyncio.sleep(settings.TEXT_CACHE_SWEEP_INTERVAL_SECONDS)
+
+
+def start_text_cache_sweeper() -> None:
+    global _sweeper
+    if _sweeper is None and settings.TEXT_CACHE_ENABLED and settings.TEXT_CACHE_SWEEP_INTERVAL_SECONDS > 0:
+        _sweeper = asyncio.create_task(_sweep_loop(), name="text-cache-sweeper")
+
+
+async def stop_text_cache_sweeper() -> None:
+    global _sweeper
+    if _sweeper is None:
+        return
+    _sweeper.cancel()
+    await asyncio.gather(_sweeper, return_exceptions=True)
+    _sweeper = None
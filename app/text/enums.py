@@ -11,6 +11,12 @@ class SummaryStatus(str, Enum):
     DONE = "done"
     ERROR = "error"
 
+
+class AnonymizationMode(str, Enum):
+    LOCAL = "local"
+    HYBRID = "hybrid"
+
+
 class SummaryLevel(str, Enum):
     AUTO = "auto"
     TLDR = "tldr"
@@ -0,0 +1,247 @@
+import asyncio
+import multiprocessing
+import os
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from app.core.config import settings
+from app.text.chunking import PAGE_SEPARATOR
+
+# Сколько открытых PDF держит каждый процесс разбора: диапазоны одного файла не открывают его заново
+_READER_CACHE_SIZE = 2
+
+_readers: OrderedDict = OrderedDict()
+
+
+class _ExtractionWorker:
+    """
+    Процесс разбора PDF, который выполняет задачи строго по одной.
+    Поэтому зависшую задачу можно остановить, убив только её процесс,
+    не задевая задачи других файлов.
+    """
+
+    def __init__(self):
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def call(self, func, *args) -> Any:
+        try:
+            self._conn.send((func, args))
+            ok, value = self._conn.recv()
+        except (EOFError, OSError):
+            # Процесс убит или упал: канал закрывает поток, который его читал
+            self._conn.close()
+            raise
+        if not ok:
+            raise Exception(value)
+        return value
+
+    def kill(self) -> None:
+        self.process.kill()
+
+    def close(self) -> None:
+        self.process.kill()
+        self._conn.close()
+
+
+class ExtractionPool:
+    """
+    Не больше max_workers процессов разбора, у каждого одна задача за раз.
+    По таймауту или отмене процесс задачи убивается и заменяется новым при следующем запросе.
+    """
+
+    def __init__(self, max_workers: int):
+        self._slots = asyncio.Semaphore(max_workers)
+        self._idle: list[_ExtractionWorker] = []
+        self._workers: set[_ExtractionWorker] = set()
+
+    async def run(self, func, *args) -> Any:
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else self._spawn()
+            try:
+                result = await asyncio.to_thread(worker.call, func, *args)
+            except (asyncio.CancelledError, EOFError, OSError):
+                # Задача не завершилась или процесс умер: убиваем только этот процесс
+                self._discard(worker)
+                raise
+            except BaseException:
+                self._idle.append(worker)
+                raise
+            self._idle.append(worker)
+            return result
+
+    def _spawn(self) -> _ExtractionWorker:
+        worker = _ExtractionWorker()
+        self._workers.add(worker)
+        return worker
+
+    def _discard(self, worker: _ExtractionWorker) -> None:
+        self._workers.discard(worker)
+        worker.kill()
+
+    def shutdown(self) -> None:
+        for worker in self._idle:
+            worker.close()
+        for worker in self._workers.difference(self._idle):
+            worker.kill()
+        self._idle.clear()
+        self._workers.clear()
+
+
+_pool: Optional[ExtractionPool] = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    global _pool
+    if _pool is None:
+        _pool = ExtractionPool(settings.PDF_EXTRACTION_WORKERS)
+    return _pool
+
+
+def shutdown_extraction_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def _worker_main(conn) -> None:
+    while True:
+        try:
+            func, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, func(*args)))
+        except Exception as e:
+            conn.send((False, str(e)))
+
+
+def _open_pdf(path: str):
+    """PdfReader из кэша процесса разбора; изменённый на диске файл открывается заново."""
+    from pypdf import PdfReader
+
+    key = (path, os.stat(path).st_mtime_ns)
+    reader = _readers.get(key)
+    if reader is None:
+        reader = PdfReader(path)
+        _readers[key] = reader
+        while len(_readers) > _READER_CACHE_SIZE:
+            _readers.popitem(last=False)
+    else:
+        _readers.move_to_end(key)
+    return reader
+
+
+def _count_pdf_pages(path: str) -> int:
+    return len(_open_pdf(path).pages)
+
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> list[str]:
+    reader = _open_pdf(path)
+    pages = []
+    for idx in range(start, stop):
+        try:
+            text = reader.pages[idx].extract_text() or ""
+        except Exception:
+            continue
+        if text.strip():
+            pages.append(text)
+    return pages
+
+
+def _read_txt(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8")
+    except UnicodeDecodeError:
+        try:
+            return path.read_text(encoding="cp1251")
+        except UnicodeDecodeError:
+            raise Exception("Не удалось прочитать .txt как UTF-8 или CP1251")
+
+
+def _timeout_error() -> Exception:
+    return Exception(f"Превышено время извлечения текста из PDF: {settings.PDF_EXTRACTION_TIMEOUT_SECONDS} с")
+
+
+async def _run_in_pool(deadline: float, func, *args):
+    loop = asyncio.get_running_loop()
+    if loop.time() >= deadline:
+        raise _timeout_error()
+
+    try:
+        return await asyncio.wait_for(get_extraction_pool().run(func, *args), timeout=deadline - loop.time())
+    except asyncio.TimeoutError:
+        raise _timeout_error()
+
+
+async def _iter_pdf_pages(path: Path) -> AsyncIterator[str]:
+    """
+    Страницы разбираются в пуле процессов диапазонами по PDF_PAGES_PER_TASK.
+    Одновременно в работе не больше PDF_MAX_PARALLEL_TASKS диапазонов одного файла,
+    чтобы один тяжёлый PDF не занимал весь пул, а страницы отдаются по порядку по мере готовности.
+    По истечении PDF_EXTRACTION_TIMEOUT_SECONDS убиваются процессы, занятые этим файлом,
+    чтобы зависший файл не держал воркеры и не блокировал последующие загрузки.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.PDF_EXTRACTION_TIMEOUT_SECONDS
+
+    try:
+        page_count = await _run_in_pool(deadline, _count_pdf_pages, str(path))
+    except Exception as e:
+        raise Exception(f"Не удалось извлечь текст из PDF: {str(e)}")
+
+    if page_count > settings.PDF_MAX_PAGES:
+        raise Exception(f"PDF слишком большой: {page_count} страниц. Максимум: {settings.PDF_MAX_PAGES}")
+
+    per_task = settings.PDF_PAGES_PER_TASK
+    ranges = deque((start, min(start + per_task, page_count)) for start in range(0, page_count, per_task))
+    pending: deque[asyncio.Future] = deque()
+
+    try:
+        while ranges or pending:
+            while ranges and len(pending) < settings.PDF_MAX_PARALLEL_TASKS:
+                start, stop = ranges.popleft()
+                pending.append(asyncio.ensure_future(
+                    _run_in_pool(deadline, _extract_pdf_pages, str(path), start, stop)
+                ))
+
+            for page in await pending.popleft():
+                yield page
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def iter_document_pages(path: Path) -> AsyncIterator[str]:
+    ext = path.suffix.lower()
+
+    if ext == ".txt":
+        yield await asyncio.to_thread(_read_txt, path)
+        return
+
+    if ext == ".pdf":
+        async for page in _iter_pdf_pages(path):
+            yield page
+        return
+
+    if ext == ".pptx":
+        raise Exception("PPTX пока не поддерживается")
+
+    raise Exception(f"Неподдерживаемый формат: {ext}")
+
+
+async def extract_text(path: Path) -> str:
+    parts = [page async for page in iter_document_pages(path)]
+    text = PAGE_SEPARATOR.join(parts)
+
+    if path.suffix.lower() == ".pdf":
+        text = text.strip()
+        if not text:
+            raise Exception("В PDF не найден текст (возможно, это скан и нужен OCR)")
+
+    return text
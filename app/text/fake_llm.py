@@ -0,0 +1,209 @@
+import asyncio
+import json
+import random
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+from gigachat.exceptions import ResponseError
+from gigachat.models import (
+    AccessToken,
+    Chat,
+    ChatCompletion,
+    ChatCompletionChunk,
+    Choices,
+    ChoicesChunk,
+    FunctionCall,
+    Messages,
+    MessagesChunk,
+    MessagesRole,
+    Usage,
+)
+
+from app.core.config import settings
+from app.core.llm_gateway import LLMProviderError
+
+_DOCUMENT_REF_RE = re.compile(r'document_ref="(doc-[0-9a-f]+)"')
+_TEXT_MARKER = "Текст для обработки:\n"
+
+# Сколько вызовов FakeGigaChat выполняется прямо сейчас и максимум за прогон:
+# по пику видно, что вызовы модели не сериализуются
+_calls = {"in_flight": 0, "peak_in_flight": 0, "total": 0}
+
+
+def _sample_latency() -> float:
+    latency_ms = random.gauss(settings.FAKE_LLM_LATENCY_MS_MEAN, settings.FAKE_LLM_LATENCY_MS_STDDEV)
+    return max(latency_ms, 0.0) / 1000
+
+
+def _sample_token_delay() -> float:
+    rate = random.gauss(settings.FAKE_LLM_TOKENS_PER_SECOND, settings.FAKE_LLM_TOKENS_PER_SECOND_STDDEV)
+    return 1.0 / max(rate, 1.0)
+
+
+def _should_fail() -> bool:
+    return random.random() < settings.FAKE_LLM_ERROR_RATE
+
+
+@contextmanager
+def _track_call() -> Iterator[None]:
+    _calls["in_flight"] += 1
+    _calls["total"] += 1
+    _calls["peak_in_flight"] = max(_calls["peak_in_flight"], _calls["in_flight"])
+    try:
+        yield
+    finally:
+        _calls["in_flight"] -= 1
+
+
+def get_fake_call_stats() -> dict[str, int]:
+    return dict(_calls)
+
+
+def reset_fake_call_stats() -> None:
+    _calls.update(in_flight=0, peak_in_flight=0, total=0)
+
+
+def _count_tokens(message: Messages) -> int:
+    """Аргументы function_call модель тоже генерирует токенами, поэтому они учитываются наравне с текстом"""
+    tokens = len((message.content or "").split())
+    if message.function_call is not None:
+        tokens += len(json.dumps(message.function_call.arguments or {}, ensure_ascii=False).split())
+    return tokens
+
+
+def _fake_summary(source: str) -> str:
+    words = source.split()[:settings.FAKE_LLM_RESPONSE_WORDS]
+    if not words:
+        words = ["Резюме"] * settings.FAKE_LLM_RESPONSE_WORDS
+    return " ".join(words)
+
+
+class FakeGigaChat:
+    """
+    Офлайн-заменитель клиента GigaChat для нагрузочных прогонов и CI без сети.
+    Повторяет протокол function calling: первым шагом вызывает anonymize_data
+    с document_ref из задания, после ответа tool завершает диалог резюме.
+    Задержка ответа и скорость выдачи токенов задаются настройками FAKE_LLM_*.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+
+    async def aget_token(self) -> AccessToken:
+        return AccessToken(access_token="fake", expires_at=int((time.time() + 3600) * 1000))
+
+    async def aclose(self) -> None:
+        return None
+
+    def _next_message(self, chat: Chat) -> tuple[str, Messages]:
+        messages = chat.messages
+        tool_answered = any(message.role == MessagesRole.FUNCTION for message in messages)
+        function_names = {function.name for function in chat.functions or []}
+
+        if "anonymize_data" in function_names and not tool_answered:
+            prompt = next((m.content for m in reversed(messages) if m.role == MessagesRole.USER), "")
+            match = _DOCUMENT_REF_RE.search(prompt or "")
+            arguments = {"document_ref": match.group(1)} if match else {}
+            function_call = FunctionCall(name="anonymize_data", arguments=arguments)
+            if "run_tools" in function_names:
+                # Как и ожидается от модели: независимые tools одним параллельным вызовом
+                calls = [
+                    {"name": name, "arguments": arguments}
+                    for name in ("anonymize_data", "analyze_text_complexity")
+                    if name in function_names
+                ]
+                function_call = FunctionCall(name="run_tools", arguments={"calls": calls})
+            return "function_call", Messages(role=MessagesRole.ASSISTANT, content="", function_call=function_call)
+
+        source = messages[-1].content or ""
+        if tool_answered:
+            try:
+                payload = json.loads(source)
+                for call in payload.get("results", []):
+                    if call["name"] == "anonymize_data":
+                        payload = call["result"]
+                source = payload.get("anonymized_text", "")
+            except (ValueError, AttributeError, KeyError, TypeError):
+                pass
+
+        return "stop", Messages(role=MessagesRole.ASSISTANT, content=_fake_summary(source))
+
+    def _usage(self, chat: Chat, message: Messages) -> Usage:
+        prompt_tokens = sum(_count_tokens(item) for item in chat.messages)
+        completion_tokens = _count_tokens(message)
+        return Usage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            precached_prompt_tokens=0,
+        )
+
+    async def achat(self, chat: Chat) -> ChatCompletion:
+        finish_reason, message = self._next_message(chat)
+        with _track_call():
+            await asyncio.sleep(_sample_latency())
+            if _should_fail():
+                raise ResponseError("fake://gigachat", 503, b"fake provider error", {})
+
+            await asyncio.sleep(_count_tokens(message) * _sample_token_delay())
+        return ChatCompletion(
+            choices=[Choices(message=message, index=0, finish_reason=finish_reason)],
+            created=int(time.time()),
+            model=self.model,
+            usage=self._usage(chat, message),
+            object="chat.completion",
+        )
+
+    async def astream(self, chat: Chat) -> AsyncIterator[ChatCompletionChunk]:
+        finish_reason, message = self._next_message(chat)
+
+        def chunk(delta: MessagesChunk, finish: str | None = None) -> ChatCompletionChunk:
+            # Как у GigaChat: расход токенов приходит в последнем чанке
+            return ChatCompletionChunk(
+                choices=[ChoicesChunk(delta=delta, index=0, finish_reason=finish)],
+                created=int(time.time()),
+                model=self.model,
+                object="chat.completion",
+                usage=self._usage(chat, message) if finish else None,
+            )
+
+        with _track_call():
+            await asyncio.sleep(_sample_latency())
+            if _should_fail():
+                raise ResponseError("fake://gigachat", 503, b"fake provider error", {})
+
+            if message.function_call is not None:
+                await asyncio.sleep(_count_tokens(message) * _sample_token_delay())
+                yield chunk(MessagesChunk(role=MessagesRole.ASSISTANT, function_call=message.function_call), finish_reason)
+                return
+
+            words = (message.content or "").split()
+            for idx, word in enumerate(words):
+                await asyncio.sleep(_sample_token_delay())
+                text = word if idx == 0 else f" {word}"
+                yield chunk(MessagesChunk(role=MessagesRole.ASSISTANT, content=text))
+
+        yield chunk(MessagesChunk(role=MessagesRole.ASSISTANT, content=""), finish_reason)
+
+
+async def fake_perplexity_completion(messages: list[dict[str, Any]]) -> str:
+    """
+    Ответ-заменитель Perplexity: для обезличивания возвращает исходный текст,
+    для анализа сложности - JSON в ожидаемом формате, в остальных случаях - короткое резюме.
+    """
+    await asyncio.sleep(_sample_latency())
+    if _should_fail():
+        raise LLMProviderError("Fake Perplexity вернул ошибку 503", provider="perplexity", retryable=True, status_code=503)
+
+    system = messages[0]["content"] if messages else ""
+    prompt = messages[-1]["content"] if messages else ""
+
+    if _TEXT_MARKER in prompt:
+        return prompt.split(_TEXT_MARKER, 1)[1]
+
+    if "JSON" in system:
+        return json.dumps({"level": "medium", "reasoning": "fake", "stats": {}}, ensure_ascii=False)
+
+    return _fake_summary(prompt)
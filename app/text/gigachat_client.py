@@ -1,24 +1,100 @@
+import asyncio
 import json
-from typing import Any, Optional
+import time
+from typing import Any, Awaitable, Callable, Optional
 
+import httpx
 from gigachat import GigaChat
-from gigachat.models import Chat, Messages, MessagesRole, Function, FunctionParameters, FunctionCall
+from gigachat.exceptions import ResponseError
+from gigachat.models import AccessToken, Chat, Messages, MessagesRole, Function, FunctionParameters, FunctionCall, Usage
 
 from app.core.config import settings
+from app.core.llm_gateway import LLMProviderError, call_llm, is_retryable_status
+from app.text.fake_llm import FakeGigaChat
+
+EventCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+_clients: dict[str, GigaChat] = {}
+_token_expires_at: dict[str, float] = {}
+_token_locks: dict[str, asyncio.Lock] = {}
 
 
 def get_gigachat_client(
         model: Optional[str] = None,
 ) -> GigaChat:
+    model_name = model or settings.GIGACHAT_DEFAULT_MODEL
+    client = _clients.get(model_name)
+    if client is None and settings.FAKE_LLM_ENABLED:
+        client = FakeGigaChat(model_name)
+        _clients[model_name] = client
+    if client is None:
+        client = _new_gigachat(model_name)
+        _clients[model_name] = client
+    return client
+
+
+def _new_gigachat(model_name: str) -> GigaChat:
     return GigaChat(
         credentials=settings.GIGACHAT_AUTH_KEY,
-        model=model or settings.GIGACHAT_DEFAULT_MODEL,
+        model=model_name,
         scope=settings.GIGACHAT_SCOPE,
         verify_ssl_certs=settings.GIGACHAT_VERIFY_SSL,
         timeout=settings.GIGACHAT_TIMEOUT,
+        max_connections=settings.GIGACHAT_MAX_CONNECTIONS,
     )
 
 
+async def _fetch_token(model_name: str) -> AccessToken:
+    """
+    Новый токен запрашивается отдельным клиентом: у рабочего клиента токен не сбрасывается,
+    и конкурентные вызовы до подмены идут со старым, ещё действующим токеном.
+    """
+    if settings.FAKE_LLM_ENABLED:
+        return await FakeGigaChat(model_name).aget_token()
+
+    auth_client = _new_gigachat(model_name)
+    try:
+        return await auth_client.aget_token()
+    finally:
+        await auth_client.aclose()
+
+
+async def ensure_gigachat_token(model: Optional[str] = None) -> None:
+    """
+    Обновляет OAuth-токен заранее, не дожидаясь его истечения.
+    Один запрос за токеном на модель, даже при конкурентных вызовах.
+    """
+    model_name = model or settings.GIGACHAT_DEFAULT_MODEL
+    margin = settings.GIGACHAT_TOKEN_REFRESH_MARGIN_SECONDS
+
+    if _token_expires_at.get(model_name, 0.0) - margin > time.time():
+        return
+
+    lock = _token_locks.setdefault(model_name, asyncio.Lock())
+    async with lock:
+        if _token_expires_at.get(model_name, 0.0) - margin > time.time():
+            return
+
+        client = get_gigachat_client(model_name)
+        token = await _fetch_token(model_name)
+        if token is not None:
+            # SDK (gigachat==0.1.43, версия закреплена) считает любой сохранённый токен действительным
+            # и сам его не обновляет; подмена одним присваиванием, без окна с пустым токеном
+            client._access_token = token
+            expires_at = token.expires_at / 1000
+            if expires_at > _token_expires_at.get(model_name, 0.0):
+                _token_expires_at[model_name] = expires_at
+
+
+async def close_gigachat_clients():
+    clients = list(_clients.values())
+    _clients.clear()
+    _token_expires_at.clear()
+    _token_locks.clear()
+    for client in clients:
+        await client.aclose()
+
+
 async def gigachat_chat_with_tools(
         *,
         messages: list[dict[str, Any]],
@@ -26,15 +102,44 @@ async def gigachat_chat_with_tools(
         execute_tool_func: Any,
         model: Optional[str] = None,
         temperature: float = 0.2,
-        max_steps: int = 8
+        max_steps: int = 8,
+        on_event: Optional[EventCallback] = None
 ) -> dict[str, Any]:
-    client = get_gigachat_client(model=model)
+    """
+    Если передан on_event, ответы модели читаются через streaming API:
+    в on_event уходят события шагов, вызовов tools и токены ответа по мере генерации.
+    """
+    await ensure_gigachat_token(model)
+
+    return await _run_tool_loop(
+        get_gigachat_client(model=model),
+        model=model or settings.GIGACHAT_DEFAULT_MODEL,
+        messages=messages,
+        tools_specs=tools_specs,
+        execute_tool_func=execute_tool_func,
+        temperature=temperature,
+        max_steps=max_steps,
+        on_event=on_event,
+    )
+
 
+async def _run_tool_loop(
+        client: GigaChat,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        tools_specs: list[dict[str, Any]],
+        execute_tool_func: Any,
+        temperature: float,
+        max_steps: int,
+        on_event: Optional[EventCallback]
+) -> dict[str, Any]:
     gigachat_functions = _convert_tools_to_gigachat_format(tools_specs)
 
     gigachat_messages = _convert_messages_to_gigachat_format(messages)
 
     steps = []
+    request_chars = sum(len(message.content or "") for message in gigachat_messages)
 
     for step_idx in range(max_steps):
         chat = Chat(
@@ -44,26 +149,33 @@ async def gigachat_chat_with_tools(
             temperature=temperature
         )
 
-        response = client.chat(chat)
-        choice = response.choices[0]
-        message = choice.message
+        if on_event is not None:
+            await on_event({"event": "step_started", "step": step_idx})
+
+        started = time.perf_counter()
+        finish_reason, message, usage = await _complete(client, model, chat, on_event)
 
         steps.append({
             "step": step_idx,
-            "finish_reason": choice.finish_reason,
+            "finish_reason": finish_reason,
             "message": {
                 "role": message.role,
                 "content": message.content
-            }
+            },
+            "duration_ms": int((time.perf_counter() - started) * 1000),
+            "prompt_tokens": usage.prompt_tokens if usage else None,
+            "completion_tokens": usage.completion_tokens if usage else None,
+            "request_chars": request_chars,
+            "response_chars": len(message.content or ""),
         })
 
-        if choice.finish_reason == "stop":
+        if finish_reason == "stop":
             return {
                 "content": message.content,
                 "steps": steps
             }
 
-        if choice.finish_reason == "function_call":
+        if finish_reason == "function_call":
             if not message.function_call:
                 raise Exception("finish_reason=function_call но нет function_call в message")
 
@@ -80,31 +192,160 @@ async def gigachat_chat_with_tools(
                     )
                 )
             )
-
-            tool_result = await execute_tool_func(func_name, func_args)
+            if on_event is not None:
+                await on_event({"event": "tool_called", "step": step_idx, "name": func_name})
+
+            # Для run_tools в tools - сведения о каждом из параллельных вызовов
+            tool_result, tools = await execute_tool_func(func_name, func_args)
+            content = json.dumps(tool_result, ensure_ascii=False)
+            steps[-1]["tools"] = tools
+            request_chars += len(message.content or "") + len(content)
+
+            if on_event is not None:
+                for tool_info in tools:
+                    await on_event({
+                        "event": "tool_finished",
+                        "step": step_idx,
+                        "name": tool_info["name"],
+                        "success": tool_info["success"],
+                        "cached": tool_info["cached"],
+                        "duration_ms": tool_info["duration_ms"],
+                    })
 
             gigachat_messages.append(
                 Messages(
                     role=MessagesRole.FUNCTION,
                     name=func_name,
-                    content=json.dumps(tool_result, ensure_ascii=False)
+                    content=content
                 )
             )
 
             continue
 
-        if choice.finish_reason == "blacklist":
-            raise Exception(f"Запрос заблокирован модерацией: {message.content}")
+        _raise_for_finish_reason(finish_reason, message.content)
+
+    raise Exception(f"Превышен лимит шагов tool loop: max_steps={max_steps}")
+
+
+async def gigachat_chat(
+        *,
+        messages: list[dict[str, Any]],
+        model: Optional[str] = None,
+        temperature: float = 0.2,
+        on_event: Optional[EventCallback] = None
+) -> tuple[str, Optional[Usage]]:
+    await ensure_gigachat_token(model)
+
+    client = get_gigachat_client(model=model)
+    chat = Chat(
+        messages=_convert_messages_to_gigachat_format(messages),
+        temperature=temperature
+    )
+
+    finish_reason, message, usage = await _complete(client, model or settings.GIGACHAT_DEFAULT_MODEL, chat, on_event)
 
-        if choice.finish_reason == "error":
-            raise Exception("GigaChat вернул ошибку при обработке запроса")
+    if finish_reason == "stop":
+        return message.content, usage
 
-        if choice.finish_reason == "length":
-            raise Exception("Ответ обрезан по длине (превышен лимит токенов)")
+    _raise_for_finish_reason(finish_reason, message.content)
 
-        raise Exception(f"Неожиданный finish_reason: {choice.finish_reason}")
 
-    raise Exception(f"Превышен лимит шагов tool loop: max_steps={max_steps}")
+async def _complete(
+        client: GigaChat,
+        model: str,
+        chat: Chat,
+        on_event: Optional[EventCallback],
+) -> tuple[str, Any, Optional[Usage]]:
+    async def call() -> tuple[str, Any, Optional[Usage]]:
+        if on_event is not None:
+            return await _complete_streaming(client, chat, on_event)
+
+        try:
+            response = await client.achat(chat)
+        except _TRANSIENT_ERRORS as e:
+            raise _to_provider_error(e) from e
+        choice = response.choices[0]
+        return choice.finish_reason, choice.message, response.usage
+
+    return await call_llm("gigachat", model, call)
+
+
+async def _complete_streaming(
+        client: GigaChat,
+        chat: Chat,
+        on_event: EventCallback,
+) -> tuple[str, Messages, Optional[Usage]]:
+    content_parts: list[str] = []
+    function_call: Optional[FunctionCall] = None
+    finish_reason: Optional[str] = None
+    usage: Optional[Usage] = None
+
+    try:
+        async for chunk in client.astream(chat):
+            if chunk.usage is not None:
+                usage = chunk.usage
+
+            if not chunk.choices:
+                continue
+
+            choice = chunk.choices[0]
+            delta = choice.delta
+
+            if delta.content:
+                content_parts.append(delta.content)
+                await on_event({"event": "token", "text": delta.content})
+
+            if getattr(delta, "function_call", None):
+                function_call = delta.function_call
+
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+    except _TRANSIENT_ERRORS as e:
+        error = _to_provider_error(e)
+        # Часть ответа уже ушла клиенту, повтор продублировал бы токены
+        if content_parts:
+            error.retryable = False
+        raise error from e
+
+    message = Messages(
+        role=MessagesRole.ASSISTANT,
+        content="".join(content_parts),
+        function_call=function_call,
+    )
+    return finish_reason, message, usage
+
+
+_TRANSIENT_ERRORS = (ResponseError, httpx.TimeoutException, httpx.TransportError)
+
+
+def _to_provider_error(error: Exception) -> LLMProviderError:
+    if isinstance(error, ResponseError):
+        status_code = error.args[1] if len(error.args) > 1 else None
+        return LLMProviderError(
+            f"GigaChat вернул ошибку {status_code}",
+            provider="gigachat",
+            retryable=isinstance(status_code, int) and is_retryable_status(status_code),
+            status_code=status_code,
+        )
+
+    return LLMProviderError(
+        f"Ошибка соединения с GigaChat: {error!r}",
+        provider="gigachat",
+        retryable=True,
+    )
+
+
+def _raise_for_finish_reason(finish_reason: Optional[str], content: Optional[str]) -> None:
+    if finish_reason == "blacklist":
+        raise Exception(f"Запрос заблокирован модерацией: {content}")
+
+    if finish_reason == "error":
+        raise Exception("GigaChat вернул ошибку при обработке запроса")
+
+    if finish_reason == "length":
+        raise Exception("Ответ обрезан по длине (превышен лимит токенов)")
+
+    raise Exception(f"Неожиданный finish_reason: {finish_reason}")
 
 
 def _convert_tools_to_gigachat_format(tools_specs: list[dict[str, Any]]) -> list[Function]:
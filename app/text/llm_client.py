@@ -0,0 +1,96 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.llm_gateway import LLMProviderError
+from app.text.gigachat_client import EventCallback, gigachat_chat
+from app.text.perplexity_client import call_perplexity_api
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PROVIDER = "gigachat"
+
+
+@dataclass(frozen=True)
+class LLMReply:
+    """Ответ и то, кто его на самом деле дал: провайдер, модель и расход токенов, если он известен."""
+    content: str
+    provider: str
+    model: str
+    usage: Optional[dict[str, int]] = None
+
+
+def default_model(provider: str) -> str:
+    if provider == "perplexity":
+        return settings.PERPLEXITY_DEFAULT_MODEL
+    return settings.GIGACHAT_DEFAULT_MODEL
+
+
+def fallback_provider(provider: str) -> Optional[str]:
+    """
+    Резервный провайдер для отказавшего: LLM_FALLBACK_PROVIDER, а для него самого - основной.
+    None, если резерв не настроен или совпадает с отказавшим.
+    """
+    fallback = settings.LLM_FALLBACK_PROVIDER
+    if not fallback:
+        return None
+    fallback = fallback if provider != fallback else PRIMARY_PROVIDER
+    return fallback if fallback != provider else None
+
+
+async def chat_with_provider(
+        provider: str,
+        *,
+        messages: list[dict[str, Any]],
+        model: Optional[str] = None,
+        temperature: float = 0.2,
+        on_event: Optional[EventCallback] = None,
+) -> LLMReply:
+    model = model or default_model(provider)
+
+    if provider == "gigachat":
+        content, usage = await gigachat_chat(messages=messages, model=model, temperature=temperature, on_event=on_event)
+        if usage is not None:
+            return LLMReply(content, provider, model, {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+            })
+        return LLMReply(content, provider, model)
+
+    if provider == "perplexity":
+        content = await call_perplexity_api(messages=messages, model=model, temperature=temperature)
+        if on_event is not None:
+            await on_event({"event": "token", "text": content})
+        return LLMReply(content, provider, model)
+
+    raise ValueError(f"Неизвестный LLM-провайдер: {provider}")
+
+
+async def llm_chat(
+        *,
+        messages: list[dict[str, Any]],
+        model: Optional[str] = None,
+        temperature: float = 0.2,
+        on_event: Optional[EventCallback] = None,
+        provider: str = PRIMARY_PROVIDER,
+) -> LLMReply:
+    """
+    Вызов без tools через provider (по умолчанию GigaChat).
+    При временном сбое, если задан LLM_FALLBACK_PROVIDER, запрос уходит резервному провайдеру
+    с его моделью по умолчанию; отказ резервного провайдера переводит запрос на основной.
+    """
+    try:
+        return await chat_with_provider(
+            provider,
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            on_event=on_event,
+        )
+    except LLMProviderError as e:
+        fallback = fallback_provider(e.provider)
+        if not e.retryable or fallback is None:
+            raise
+        logger.warning("LLM %s недоступен (%s), переключаемся на %s", e.provider, e, fallback)
+        return await chat_with_provider(fallback, messages=messages, temperature=temperature, on_event=on_event)
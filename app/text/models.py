@@ -1,17 +1,28 @@
 import uuid
+from datetime import datetime
 
-from sqlalchemy import String, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Text, ForeignKey, Float, Integer, DateTime, LargeBinary, UniqueConstraint, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
-from app.text.enums import SourceType, SummaryStatus, SummaryLevel
+from app.text.enums import SourceType, SummaryStatus, SummaryLevel, AnonymizationMode
 
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Список документов пользователя постранично по (created_at, id)
+        Index("ix_documents_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
 
+    user_id: Mapped[str | None] = mapped_column(
+        String,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
     source_type: Mapped[SourceType] = mapped_column(
         SQLEnum(SourceType, native_enum=False, length=16),
         nullable=False,
@@ -22,6 +33,8 @@ class Document(Base):
 
     file_path: Mapped[str | None] = mapped_column(String(512), nullable=True)
 
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+
     summaries: Mapped[list["Summary"]] = relationship(
         "Summary",
         back_populates="document",
@@ -32,9 +45,18 @@ class Document(Base):
 
 class Summary(Base):
     __tablename__ = "summaries"
+    __table_args__ = (
+        Index("ix_summaries_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
 
+    user_id: Mapped[str | None] = mapped_column(
+        String,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
     document_id: Mapped[str] = mapped_column(
         String,
         ForeignKey("documents.id", ondelete="CASCADE"),
@@ -61,4 +83,105 @@ class Summary(Base):
     model: Mapped[str] = mapped_column(String(64), nullable=False, default="sonar-pro")
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    document: Mapped["Document"] = relationship("Document", back_populates="summaries")
\ No newline at end of file
+    cache_key: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+
+    temperature: Mapped[float] = mapped_column(Float, nullable=False, default=0.2, server_default="0.2")
+    max_steps: Mapped[int] = mapped_column(Integer, nullable=False, default=8, server_default="8")
+    anonymization_mode: Mapped[AnonymizationMode] = mapped_column(
+        SQLEnum(AnonymizationMode, native_enum=False, length=16),
+        nullable=False,
+        default=AnonymizationMode.HYBRID,
+        server_default=AnonymizationMode.HYBRID.name,
+    )
+
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    # Уровень, полученный из основного summary того же прогона, а не отдельным запуском агента
+    source_summary_id: Mapped[str | None] = mapped_column(
+        String,
+        ForeignKey("summaries.id", ondelete="CASCADE"),
+        index=True,
+        nullable=True,
+    )
+
+    batch_id: Mapped[str | None] = mapped_column(
+        String,
+        ForeignKey("summary_batches.id", ondelete="SET NULL"),
+        index=True,
+        nullable=True,
+    )
+
+    # Номер попытки генерации summary_text при потоковой выдаче: растёт, когда текст начинается заново
+    stream_generation: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    # Разбивка summary_text для скорочтения, считается один раз при переходе в DONE
+    word_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    reading_plan: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+
+    document: Mapped["Document"] = relationship("Document", back_populates="summaries")
+
+
+class SummaryChunk(Base):
+    __tablename__ = "summary_chunks"
+    __table_args__ = (
+        UniqueConstraint("summary_id", "chunk_index", name="uq_summary_chunks_summary_id_chunk_index"),
+    )
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    summary_id: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("summaries.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+
+    chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    status: Mapped[SummaryStatus] = mapped_column(
+        SQLEnum(SummaryStatus, native_enum=False, length=16),
+        nullable=False,
+        default=SummaryStatus.PROCESSING,
+    )
+
+    summary_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class SummaryBatch(Base):
+    __tablename__ = "summary_batches"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class SummaryStep(Base):
+    """Трасса шага: вызов модели или отдельный вызов tool (stage="tool") и сколько это заняло."""
+    __tablename__ = "summary_steps"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    summary_id: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("summaries.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+
+    step_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    stage: Mapped[str] = mapped_column(String(32), nullable=False)
+
+    finish_reason: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    tool_name: Mapped[str | None] = mapped_column(String(256), nullable=True)
+
+    llm_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    tool_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    prompt_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    request_chars: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_chars: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -3,6 +3,8 @@ from typing import Any, Optional
 import httpx
 
 from app.core.config import settings
+from app.core.llm_gateway import LLMProviderError, call_llm, is_retryable_status
+from app.text.fake_llm import fake_perplexity_completion
 
 _client: Optional[httpx.AsyncClient] = None
 
@@ -27,39 +29,57 @@ async def call_perplexity_api(
         model: Optional[str] = None,
         temperature: float = 0.2
 ) -> str:
+    if settings.FAKE_LLM_ENABLED:
+        return await call_llm("perplexity", "fake", lambda: fake_perplexity_completion(messages))
+
     if not settings.PERPLEXITY_API_KEY:
         raise ValueError("Нет API ключа PERPLEXITY_API_KEY")
 
     client = get_perplexity_client()
+    model_name = model or settings.PERPLEXITY_DEFAULT_MODEL
 
     payload = {
-        "model": model or settings.PERPLEXITY_DEFAULT_MODEL,
+        "model": model_name,
         "messages": messages,
         "temperature": temperature,
     }
 
-    try:
-        response = await client.post(
-            settings.PERPLEXITY_API_URL,
-            headers={
-                "Authorization": f"Bearer {settings.PERPLEXITY_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
-        response.raise_for_status()
-    except httpx.HTTPStatusError as e:
-        raise Exception(
-            f"Perplexity API вернул ошибку {e.response.status_code}: {e.response.text}"
-        )
-    except httpx.TimeoutException:
-        raise Exception("Превышено время ожидания ответа от Perplexity API")
-    except httpx.RequestError as e:
-        raise Exception(f"Ошибка запроса к Perplexity API: {str(e)}")
+    async def call() -> httpx.Response:
+        try:
+            response = await client.post(
+                settings.PERPLEXITY_API_URL,
+                headers={
+                    "Authorization": f"Bearer {settings.PERPLEXITY_API_KEY}",
+                    "Content-Type": "application/json",
+                },
+                json=payload,
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise LLMProviderError(
+                f"Perplexity API вернул ошибку {e.response.status_code}: {e.response.text}",
+                provider="perplexity",
+                retryable=is_retryable_status(e.response.status_code),
+                status_code=e.response.status_code,
+            )
+        except httpx.TimeoutException:
+            raise LLMProviderError(
+                "Превышено время ожидания ответа от Perplexity API",
+                provider="perplexity",
+                retryable=True,
+            )
+        except httpx.RequestError as e:
+            raise LLMProviderError(
+                f"Ошибка запроса к Perplexity API: {str(e)}",
+                provider="perplexity",
+                retryable=True,
+            )
+        return response
 
+    response = await call_llm("perplexity", model_name, call)
     result = response.json()
 
     try:
         return result["choices"][0]["message"]["content"]
     except (KeyError, IndexError):
-        raise Exception(f"Неожиданный формат ответа от Perplexity API: {result}")
\ No newline at end of file
+        raise Exception(f"Неожиданный формат ответа от Perplexity API: {result}")
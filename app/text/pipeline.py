@@ -0,0 +1,373 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Coroutine, Iterable, Optional
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.text.cache import summary_cache
+from app.text.chunking import PAGE_SEPARATOR
+from app.text.complexity import TextComplexityAnalyzer, resolve_auto_level
+from app.text.enums import SummaryLevel, SummaryStatus
+from app.text.dao import SummaryDAO, SummaryStepDAO
+from app.text.models import Document, Summary, SummaryStep
+from app.text.schemas import SummarizeRequest, SummaryResponse
+from app.text.agents.smart_summarizer_agent import summarize_with_agent
+from app.text.agents.map_reduce_summarizer_agent import summarize_map_reduce
+from app.text.agents.level_derivation_agent import derive_summary
+from app.text.document_cache import load_extracted_text, save_extracted_text
+from app.text.extraction import iter_document_pages
+from app.text.gigachat_client import EventCallback
+from app.text.speed_reading import build_reading_plan, dump_reading_plan, reading_plan_cache
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def build_summarize_request(summary: Summary, document: Document) -> SummarizeRequest:
+    return SummarizeRequest(
+        file_path=document.file_path,
+        text=None if document.file_path else document.original_text,
+        level=summary.level,
+        model=summary.model,
+        temperature=summary.temperature,
+        max_steps=summary.max_steps,
+        anonymization_mode=summary.anonymization_mode,
+        content_hash=document.content_hash,
+    )
+
+
+async def find_cached_summary(summary_dao: SummaryDAO, cache_key: str) -> Optional[SummaryResponse]:
+    cached = summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    summary = await summary_dao.find_cached(cache_key)
+    if summary is None:
+        summary_cache.record_miss()
+        return None
+
+    summary_cache.record_db_hit()
+    cached = SummaryResponse.model_validate(summary)
+    summary_cache.put(cache_key, cached)
+    return cached
+
+
+async def find_cached_summaries(summary_dao: SummaryDAO, cache_keys: list[str]) -> dict[str, SummaryResponse]:
+    found: dict[str, SummaryResponse] = {}
+    missing: list[str] = []
+
+    for key in dict.fromkeys(cache_keys):
+        cached = summary_cache.get(key)
+        if cached is not None:
+            found[key] = cached
+        else:
+            missing.append(key)
+
+    for summary in await summary_dao.find_cached_many(missing):
+        summary_cache.record_db_hit()
+        cached = SummaryResponse.model_validate(summary)
+        summary_cache.put(summary.cache_key, cached)
+        found[summary.cache_key] = cached
+
+    for key in missing:
+        if key not in found:
+            summary_cache.record_miss()
+
+    return found
+
+
+def build_step_rows(summary_id: str, steps: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Плоские строки summary_steps из трассы агента или map-reduce:
+    строка на вызов модели и отдельная строка (stage="tool") на каждый вызов tool этого шага
+    с его собственным временем, чтобы задержки tools не складывались и не смешивались.
+    """
+    rows = []
+    for idx, step in enumerate(steps):
+        rows.append({
+            "summary_id": summary_id,
+            "step_index": idx,
+            "stage": step.get("stage", "agent"),
+            "finish_reason": step.get("finish_reason"),
+            "tool_name": None,
+            "llm_ms": step.get("duration_ms"),
+            "tool_ms": None,
+            "prompt_tokens": step.get("prompt_tokens"),
+            "completion_tokens": step.get("completion_tokens"),
+            "request_chars": step.get("request_chars"),
+            "response_chars": step.get("response_chars"),
+        })
+        for tool in step.get("tools") or []:
+            rows.append({
+                "summary_id": summary_id,
+                "step_index": idx,
+                "stage": "tool",
+                "finish_reason": None,
+                "tool_name": tool["name"],
+                "llm_ms": None,
+                "tool_ms": tool["duration_ms"],
+                "prompt_tokens": None,
+                "completion_tokens": None,
+                "request_chars": None,
+                "response_chars": tool.get("result_chars"),
+            })
+    return rows
+
+
+async def complete_summary(summary_id: str, result: dict[str, Any]) -> None:
+    plan = build_reading_plan(result["summary"] or "")
+    step_rows = build_step_rows(summary_id, result.get("steps") or [])
+
+    async with async_session_maker() as session:
+        summary = await SummaryDAO(session).update(
+            id=summary_id,
+            status=SummaryStatus.DONE,
+            summary_text=result["summary"],
+            model=result["metadata"]["model"],
+            error=None,
+            locked_at=None,
+            word_count=plan.word_count,
+            reading_plan=dump_reading_plan(plan),
+        )
+        if summary is not None and step_rows:
+            # Повторный прогон (retry) заменяет трассу, а не дописывает к ней
+            step_dao = SummaryStepDAO(session)
+            await step_dao.delete_for_summary(summary_id)
+            await step_dao.add_many([SummaryStep(**row) for row in step_rows])
+        await session.commit()
+
+    if summary is None:
+        return
+
+    reading_plan_cache.put(summary_id, plan)
+    if summary.cache_key:
+        summary_cache.put(summary.cache_key, SummaryResponse.model_validate(summary))
+
+
+async def fail_summary(summary_id: str, error: str) -> None:
+    async with async_session_maker() as session:
+        await SummaryDAO(session).update(
+            id=summary_id,
+            status=SummaryStatus.ERROR,
+            error=error,
+            locked_at=None,
+        )
+        await session.commit()
+
+
+async def fail_derived_summaries(summary_id: str, error: str) -> None:
+    async with async_session_maker() as session:
+        summary_dao = SummaryDAO(session)
+        derived = await summary_dao.find_derived(summary_id, SummaryStatus.PROCESSING)
+        await summary_dao.update_many([
+            {"id": summary.id, "status": SummaryStatus.ERROR, "error": error}
+            for summary in derived
+        ])
+        await session.commit()
+
+
+async def _iter_text(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def _chain_pages(head: Iterable[str], tail: AsyncIterator[str]) -> AsyncIterator[str]:
+    for page in head:
+        yield page
+    async for page in tail:
+        yield page
+
+
+async def _analyzed_pages(pages: AsyncIterator[str], analyzer: TextComplexityAnalyzer) -> AsyncIterator[str]:
+    async for page in pages:
+        await asyncio.to_thread(analyzer.feed, page + "\n")
+        yield page
+
+
+async def _iter_file_pages(request: SummarizeRequest) -> AsyncIterator[str]:
+    """
+    Текст файла извлекается один раз на документ: дальше он читается из
+    сжатого файла-спутника в UPLOAD_DIR, ключ - хеш содержимого файла.
+    """
+    use_cache = settings.TEXT_CACHE_ENABLED and request.content_hash
+
+    if use_cache:
+        cached = await load_extracted_text(request.content_hash)
+        if cached is not None:
+            yield cached
+            return
+
+    pages: list[str] = []
+    async for page in iter_document_pages(Path(request.file_path)):
+        pages.append(page)
+        yield page
+
+    if use_cache:
+        await save_extracted_text(request.content_hash, PAGE_SEPARATOR.join(pages))
+
+
+async def summarize_document(
+        request: SummarizeRequest,
+        summary_id: Optional[str] = None,
+        on_event: Optional[EventCallback] = None,
+) -> dict[str, Any]:
+    """
+    Документы, которые не помещаются в один промпт, уходят в map-reduce,
+    остальные обрабатываются агентом целиком.
+    Страницы файла читаются потоком: как только набирается порог, map-reduce
+    стартует на уже извлечённых страницах, пока остальные ещё разбираются.
+    """
+    if request.text is not None:
+        pages = _iter_text(request.text)
+    else:
+        pages = _iter_file_pages(request)
+
+    # Уровень AUTO выбирается локальным анализатором по тем же страницам, без отдельного вызова LLM
+    complexity = TextComplexityAnalyzer() if request.level == SummaryLevel.AUTO else None
+    if complexity is not None:
+        pages = _analyzed_pages(pages, complexity)
+
+    head: list[str] = []
+    total_chars = 0
+    async for page in pages:
+        head.append(page)
+        total_chars += len(page)
+        if total_chars > settings.SUMMARY_CHUNK_THRESHOLD_CHARS:
+            return await summarize_map_reduce(
+                request,
+                _chain_pages(head, pages),
+                summary_id=summary_id,
+                on_event=on_event,
+                complexity=complexity,
+            )
+
+    text = PAGE_SEPARATOR.join(head)
+    if request.file_path and not text.strip():
+        raise Exception("В документе не найден текст (возможно, это скан и нужен OCR)")
+
+    if complexity is None:
+        return await summarize_with_agent(request, text=text, on_event=on_event)
+
+    level, auto_level = resolve_auto_level(complexity)
+    result = await summarize_with_agent(request.model_copy(update={"level": level}), text=text, on_event=on_event)
+    result["metadata"]["auto_level"] = auto_level
+    return result
+
+
+class SummaryProgress:
+    """
+    Собирает токены итогового ответа и периодически пишет их в summary_text,
+    чтобы переподключившийся клиент мог продолжить с уже сгенерированной части.
+    """
+
+    def __init__(self, summary_id: str, on_event: Optional[EventCallback]):
+        self.summary_id = summary_id
+        self.on_event = on_event
+        self.parts: list[str] = []
+        self.length = 0
+        self.generation: Optional[int] = None
+        self._flushed_at = time.monotonic()
+
+    async def __call__(self, event: dict[str, Any]) -> None:
+        if event["event"] in ("step_started", "reduce_started") and self.parts:
+            # Текст промежуточного шага не входит в итоговый ответ: сохранённый тоже сбрасывается,
+            # чтобы продолжившие по смещению клиенты увидели смену генерации
+            self.parts.clear()
+            self.length = 0
+            self.generation = await self._start_generation()
+            await self._emit({"event": "reset", "generation": self.generation})
+
+        if event["event"] == "token":
+            if self.generation is None:
+                self.generation = await self._start_generation()
+            self.parts.append(event["text"])
+            self.length += len(event["text"])
+            event = {**event, "offset": self.length, "generation": self.generation}
+
+        await self._emit(event)
+
+        if event["event"] == "token" and time.monotonic() - self._flushed_at >= settings.SUMMARY_STREAM_FLUSH_SECONDS:
+            await self.flush()
+
+    async def _emit(self, event: dict[str, Any]) -> None:
+        if self.on_event is not None:
+            await self.on_event(event)
+
+    async def _start_generation(self) -> int:
+        self._flushed_at = time.monotonic()
+        async with async_session_maker() as session:
+            generation = await SummaryDAO(session).start_stream_generation(self.summary_id)
+            await session.commit()
+        return generation
+
+    async def flush(self) -> None:
+        self._flushed_at = time.monotonic()
+        async with async_session_maker() as session:
+            await SummaryDAO(session).update(id=self.summary_id, summary_text="".join(self.parts))
+            await session.commit()
+
+
+async def process_summary(
+        summary_id: str,
+        request: SummarizeRequest,
+        on_event: Optional[EventCallback] = None,
+        stream: bool = False,
+) -> dict[str, Any]:
+    """
+    Запускает агента и сохраняет результат в отдельных коротких сессиях,
+    чтобы соединение с БД не удерживалось на время работы LLM.
+    При ошибке summary переводится в ERROR, исключение пробрасывается дальше.
+    При stream=True (или переданном on_event) ответ генерируется потоково,
+    а частичный текст периодически сохраняется.
+    """
+    streaming = stream or on_event is not None
+    progress = SummaryProgress(summary_id, on_event) if streaming else None
+    try:
+        result = await summarize_document(request, summary_id=summary_id, on_event=progress)
+    except Exception as e:
+        await fail_summary(summary_id, str(e))
+        await fail_derived_summaries(summary_id, str(e))
+        raise
+
+    await complete_summary(summary_id, result)
+    await derive_summary_levels(summary_id, request, result["summary"])
+    return result
+
+
+async def derive_summary_levels(summary_id: str, request: SummarizeRequest, source_text: str) -> None:
+    """
+    Остальные уровни того же запроса строятся из готового подробного резюме параллельно.
+    Ошибка одного уровня не влияет ни на основной summary, ни на соседние уровни.
+    """
+    async with async_session_maker() as session:
+        derived = await SummaryDAO(session).lock_derived(summary_id)
+        await session.commit()
+
+    await asyncio.gather(*(
+        derive_summary_level(str(summary.id), summary.level, request, source_text)
+        for summary in derived
+    ))
+
+
+async def derive_summary_level(
+        summary_id: str,
+        level: SummaryLevel,
+        request: SummarizeRequest,
+        source_text: str,
+) -> None:
+    try:
+        result = await derive_summary(request, source_text, level)
+    except Exception as e:
+        await fail_summary(summary_id, str(e))
+        return
+    await complete_summary(summary_id, result)
+
+
+def spawn_summary_task(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """
+    Запускает суммаризацию независимо от HTTP-соединения:
+    если клиент отключится, задача доработает и сохранит результат.
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
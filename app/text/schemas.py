@@ -2,7 +2,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, model_validator, Field
 
-from app.text.enums import SourceType, SummaryStatus, SummaryLevel
+from app.text.enums import SourceType, SummaryStatus, SummaryLevel, AnonymizationMode
 
 
 class SummaryCreateResponse(BaseModel):
@@ -23,11 +23,57 @@ class SummaryResponse(BaseModel):
     level: SummaryLevel
     summary_text: str | None
     model: str
+    error: str | None = None
+    attempts: int = 0
+    source_summary_id: str | None = None
+    started_at: datetime | None = Field(default=None, validation_alias="locked_at")
     created_at: datetime
+    updated_at: datetime | None = None
 
     model_config = {"from_attributes": True}
 
 
+class SummaryListItem(BaseModel):
+    id: str
+    document_id: str
+    status: SummaryStatus
+    level: SummaryLevel
+    model: str
+    error: str | None = None
+    source_summary_id: str | None = None
+    batch_id: str | None = None
+    word_count: int | None = None
+    created_at: datetime
+    updated_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class SummaryListResponse(BaseModel):
+    items: list[SummaryListItem]
+    next_cursor: str | None = None
+
+
+class SummaryBatchItem(BaseModel):
+    id: str
+    document_id: str
+    status: SummaryStatus
+    level: SummaryLevel
+    error: str | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class SummaryBatchResponse(BaseModel):
+    id: str
+    total: int
+    processing: int = 0
+    done: int = 0
+    failed: int = 0
+    created_at: datetime
+    items: list[SummaryBatchItem] = []
+
+
 class DocumentResponse(BaseModel):
     id: str
     source_type: SourceType
@@ -38,6 +84,21 @@ class DocumentResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class DocumentListItem(BaseModel):
+    id: str
+    source_type: SourceType
+    file_path: str | None
+    content_hash: str | None = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class DocumentListResponse(BaseModel):
+    items: list[DocumentListItem]
+    next_cursor: str | None = None
+
+
 class SummarizeRequest(BaseModel):
     file_path: str | None = None
     text: str | None = None
@@ -45,6 +106,8 @@ class SummarizeRequest(BaseModel):
     model: str | None = None
     temperature: float = 0.2
     max_steps: int = 8
+    anonymization_mode: AnonymizationMode | None = None
+    content_hash: str | None = None
 
     @model_validator(mode='after')
     def validate_source(self):
@@ -1,11 +1,18 @@
 import asyncio
+import json
+from typing import Any, Optional
 
-from app.text.schemas import SpeedReadInfo
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.text.dao import SummaryDAO
+from app.text.enums import SummaryStatus
+from app.text.pipeline import process_summary, spawn_summary_task
+from app.text.schemas import SpeedReadInfo, SummarizeRequest
+from app.text.speed_reading import ReadingPlan, iter_batches
 
 
-def calculate_reading_info(summary_id: str, text: str, words_per_minute: int) -> SpeedReadInfo:
-    words = text.split()
-    word_count = len(words)
+def calculate_reading_info(summary_id: str, plan: ReadingPlan, words_per_minute: int) -> SpeedReadInfo:
+    word_count = plan.word_count
     estimated_duration_seconds = int((word_count / words_per_minute) * 60)
 
     return SpeedReadInfo(
@@ -17,18 +24,126 @@ def calculate_reading_info(summary_id: str, text: str, words_per_minute: int) ->
 
 
 async def generate_speed_reading_stream(
-        text: str,
-        words_per_minute: int = 100
+        plan: ReadingPlan,
+        words_per_minute: int = 100,
+        offset: int = 0,
+        adaptive: bool = True,
 ):
-    if not text or not text.strip():
+    """
+    Отдаёт слова пачками с длительностью показа каждого слова, темп выдерживает клиент.
+    Сервер держится на одну пачку впереди клиента, поэтому на пачку приходится
+    один таймер вместо таймера на каждое слово.
+    id события - индекс следующего слова: по Last-Event-ID или offset можно продолжить
+    после обрыва, а пауза и перемотка - это переподключение с нужным offset.
+    """
+    if not plan.word_count:
         return
 
-    words = text.split()
-    if not words:
+    if offset >= plan.word_count:
+        yield format_sse_event({"event": "done", "word_count": plan.word_count}, plan.word_count)
         return
 
-    delay = 60.0 / words_per_minute
+    previous_ms = 0
+    for start, words, durations in iter_batches(
+            plan,
+            words_per_minute,
+            offset=offset,
+            batch_seconds=settings.SPEED_READ_BATCH_SECONDS,
+            max_batch_words=settings.SPEED_READ_MAX_BATCH_WORDS,
+            adaptive=adaptive,
+    ):
+        if previous_ms:
+            await asyncio.sleep(previous_ms / 1000)
 
-    for word in words:
-        yield f"data: {word}\n\n"
-        await asyncio.sleep(delay)
\ No newline at end of file
+        next_offset = start + len(words)
+        yield format_sse_event(
+            {
+                "event": "words",
+                "offset": start,
+                "words": words,
+                "durations_ms": durations,
+                "word_count": plan.word_count,
+            },
+            next_offset,
+        )
+        previous_ms = sum(durations)
+
+    yield format_sse_event({"event": "done", "word_count": plan.word_count}, plan.word_count)
+
+
+def format_sse_event(event: dict[str, Any], event_id: Optional[int | str] = None) -> str:
+    frame = f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    if event_id is not None:
+        frame = f"id: {event_id}\n{frame}"
+    return frame
+
+
+def _token_event_id(event: dict[str, Any]) -> Optional[str]:
+    if "offset" not in event:
+        return None
+    return f"{event['generation']}:{event['offset']}"
+
+
+async def generate_summary_events_stream(summary_id: str, request: SummarizeRequest):
+    """
+    Запускает суммаризацию в фоне и транслирует её события: шаги агента, вызовы tools и токены ответа.
+    id у токенов - "генерация:смещение" в итоговом тексте, по нему можно продолжить
+    через GET /summaries/{id}/stream после обрыва соединения.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_event(event: dict[str, Any]) -> None:
+        queue.put_nowait(event)
+
+    async def run() -> None:
+        try:
+            await process_summary(summary_id, request, on_event=on_event)
+            queue.put_nowait({"event": "done", "summary_id": summary_id})
+        except Exception as e:
+            queue.put_nowait({"event": "error", "summary_id": summary_id, "error": str(e)})
+
+    spawn_summary_task(run())
+
+    while True:
+        event = await queue.get()
+        yield format_sse_event(event, _token_event_id(event))
+        if event["event"] in ("done", "error"):
+            return
+
+
+async def generate_summary_progress_stream(summary_id: str, offset: int = 0, generation: Optional[int] = None):
+    """
+    Продолжение потока по сохранённому частичному тексту: работает для любой реплики
+    и для задач из фоновой очереди, так как читает summary_text из БД.
+    Если текст начат заново (другая генерация или он стал короче смещения клиента),
+    отправляется reset и текст передаётся с начала.
+    """
+    while True:
+        async with async_session_maker() as session:
+            summary = await SummaryDAO(session).find_one_or_none(id=summary_id)
+
+        if summary is None:
+            yield format_sse_event({"event": "error", "summary_id": summary_id, "error": "Summary не найден"})
+            return
+
+        text = summary.summary_text or ""
+        current = summary.stream_generation
+        if (generation is not None and generation != current) or len(text) < offset:
+            yield format_sse_event({"event": "reset", "generation": current})
+            offset = 0
+        generation = current
+
+        if len(text) > offset:
+            event = {"event": "token", "text": text[offset:], "offset": len(text), "generation": current}
+            yield format_sse_event(event, _token_event_id(event))
+            offset = len(text)
+
+        if summary.status == SummaryStatus.DONE:
+            yield format_sse_event({"event": "done", "summary_id": summary_id})
+            return
+
+        if summary.status == SummaryStatus.ERROR:
+            yield format_sse_event({"event": "error", "summary_id": summary_id, "error": summary.error})
+            return
+
+        await asyncio.sleep(settings.SUMMARY_STREAM_POLL_SECONDS)
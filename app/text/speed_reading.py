@@ -0,0 +1,177 @@
+import re
+import sys
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.config import settings
+
+_WORD_RE = re.compile(r"\S+")
+
+_SENTENCE_END = ".!?…"
+_CLAUSE_END = ",;:—–-)"
+
+# Веса хранятся в сотых долях, чтобы уместиться в компактный array('H')
+_WEIGHT_SCALE = 100
+_LONG_WORD_CHARS = 6
+_LONG_WORD_STEP = 4
+_LONG_WORD_MAX_BONUS = 100
+_SENTENCE_BONUS = 100
+_CLAUSE_BONUS = 50
+
+
+@dataclass(frozen=True)
+class ReadingPlan:
+    """
+    Разбивка текста на слова для скорочтения: границы слов в тексте
+    и относительное время показа каждого слова (100 = обычное слово).
+    """
+    text: str
+    starts: array
+    ends: array
+    weights: array
+    total_weight: int
+
+    @property
+    def word_count(self) -> int:
+        return len(self.starts)
+
+    def word(self, index: int) -> str:
+        return self.text[self.starts[index]:self.ends[index]]
+
+    def word_duration_ms(self, index: int, words_per_minute: int, adaptive: bool = True) -> int:
+        base_ms = 60_000 / words_per_minute
+        if not adaptive or not self.total_weight:
+            return round(base_ms)
+        # Нормируем на средний вес, чтобы общее время чтения соответствовало WPM
+        mean_weight = self.total_weight / self.word_count
+        return round(base_ms * self.weights[index] / mean_weight)
+
+
+def word_weight(word: str) -> int:
+    """Дольше показываем длинные слова и слова в конце предложения или фразы."""
+    weight = _WEIGHT_SCALE
+
+    if len(word) > _LONG_WORD_CHARS:
+        weight += min((len(word) - _LONG_WORD_CHARS) * _LONG_WORD_STEP, _LONG_WORD_MAX_BONUS)
+
+    last = word.rstrip("\"'»")[-1:] or word[-1]
+    if last in _SENTENCE_END:
+        weight += _SENTENCE_BONUS
+    elif last in _CLAUSE_END:
+        weight += _CLAUSE_BONUS
+
+    return weight
+
+
+def build_reading_plan(text: str) -> ReadingPlan:
+    starts = array("I")
+    ends = array("I")
+    weights = array("H")
+
+    for match in _WORD_RE.finditer(text):
+        starts.append(match.start())
+        ends.append(match.end())
+        weights.append(word_weight(match.group()))
+
+    return ReadingPlan(
+        text=text,
+        starts=starts,
+        ends=ends,
+        weights=weights,
+        total_weight=sum(weights),
+    )
+
+
+def reading_plan_columns(text: str) -> dict[str, Any]:
+    """word_count и reading_plan для записи summary, который сразу создаётся готовым."""
+    plan = build_reading_plan(text)
+    return {"word_count": plan.word_count, "reading_plan": dump_reading_plan(plan)}
+
+
+def dump_reading_plan(plan: ReadingPlan) -> bytes:
+    """Сериализует план в компактный blob: начала, концы слов (uint32) и веса (uint16), little-endian."""
+    parts = [array("I", plan.starts), array("I", plan.ends), array("H", plan.weights)]
+    if sys.byteorder == "big":
+        for part in parts:
+            part.byteswap()
+    return b"".join(part.tobytes() for part in parts)
+
+
+def load_reading_plan(text: str, word_count: int, blob: bytes) -> ReadingPlan:
+    starts, ends, weights = array("I"), array("I"), array("H")
+    offsets_size = word_count * starts.itemsize
+    starts.frombytes(blob[:offsets_size])
+    ends.frombytes(blob[offsets_size:2 * offsets_size])
+    weights.frombytes(blob[2 * offsets_size:])
+    if sys.byteorder == "big":
+        for part in (starts, ends, weights):
+            part.byteswap()
+
+    if len(weights) != word_count:
+        raise ValueError("Повреждённый reading_plan: число слов не совпадает")
+
+    return ReadingPlan(
+        text=text,
+        starts=starts,
+        ends=ends,
+        weights=weights,
+        total_weight=sum(weights),
+    )
+
+
+class ReadingPlanCache:
+    """In-process LRU планов скорочтения по summary_id, только для summary в статусе DONE."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict[str, ReadingPlan] = OrderedDict()
+
+    def get(self, summary_id: str) -> Optional[ReadingPlan]:
+        plan = self._items.get(summary_id)
+        if plan is not None:
+            self._items.move_to_end(summary_id)
+        return plan
+
+    def put(self, summary_id: str, plan: ReadingPlan) -> None:
+        if self.max_size <= 0:
+            return
+        self._items[summary_id] = plan
+        self._items.move_to_end(summary_id)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+
+reading_plan_cache = ReadingPlanCache(settings.READING_PLAN_CACHE_SIZE)
+
+
+def iter_batches(
+        plan: ReadingPlan,
+        words_per_minute: int,
+        offset: int = 0,
+        batch_seconds: float = 2.0,
+        max_batch_words: int = 50,
+        adaptive: bool = True,
+):
+    """
+    Режет план на пачки слов, начиная с offset.
+    Каждая пачка покрывает примерно batch_seconds чтения.
+    Возвращает (offset, слова, длительности показа в мс).
+    """
+    batch_ms = batch_seconds * 1000
+    index = max(offset, 0)
+
+    while index < plan.word_count:
+        words: list[str] = []
+        durations: list[int] = []
+        elapsed = 0
+
+        while index < plan.word_count and len(words) < max_batch_words and elapsed < batch_ms:
+            duration = plan.word_duration_ms(index, words_per_minute, adaptive)
+            words.append(plan.word(index))
+            durations.append(duration)
+            elapsed += duration
+            index += 1
+
+        yield index - len(words), words, durations
@@ -1,9 +1,12 @@
 from .anonymization_tool import anonymize_data
-from .tools_registry import execute_tool, get_default_tools
+from .tools_registry import execute_tool, execute_tool_cached, execute_tool_call, get_default_tools, tool_run
 
 __all__ = [
     "anonymize_data",
 
     "get_default_tools",
     "execute_tool",
+    "execute_tool_cached",
+    "execute_tool_call",
+    "tool_run",
 ]
@@ -1,22 +1,36 @@
+import asyncio
 from pathlib import Path
 from typing import Any, Optional
 
 from app.core.config import settings
-from app.text.perplexity_client import call_perplexity_api
+from app.text.anonymizer import StreamingAnonymizer
+from app.text.document_cache import hash_content, load_anonymized_text, save_anonymized_text
+from app.text.enums import AnonymizationMode
+from app.text.extraction import extract_text
+from app.text.llm_client import llm_chat
+from app.text.tools.document_store import get_document
+
+# Размер части текста, которую локальный анонимизатор обрабатывает за один вызов в потоке
+_LOCAL_PIECE_CHARS = 256 * 1024
 
 
 async def anonymize_data(
         file_path: Optional[str] = None,
-        text: Optional[str] = None
+        text: Optional[str] = None,
+        document_ref: Optional[str] = None,
+        mode: Optional[AnonymizationMode] = None
 ) -> dict[str, Any]:
+    mode = mode or AnonymizationMode(settings.ANONYMIZATION_MODE)
     try:
-        if file_path:
-            result = await _anonymize_from_file(file_path)
+        if document_ref:
+            return _get_anonymized_document(document_ref)
+        elif file_path:
+            result = await _anonymize_from_file(file_path, mode)
             if result["success"]:
                 result["source"] = "file"
             return result
         else:
-            result = await _anonymize_from_text(text)
+            result = await _anonymize_from_text(text, mode)
             if result["success"]:
                 result["source"] = "text"
             return result
@@ -27,7 +41,22 @@ async def anonymize_data(
         }
 
 
-async def _anonymize_from_file(file_path: str) -> dict[str, Any]:
+def _get_anonymized_document(document_ref: str) -> dict[str, Any]:
+    anonymized_text = get_document(document_ref)
+    if anonymized_text is None:
+        return {
+            "success": False,
+            "error": f"Документ не найден: {document_ref}"
+        }
+
+    return {
+        "success": True,
+        "anonymized_text": anonymized_text,
+        "source": "document_ref"
+    }
+
+
+async def _anonymize_from_file(file_path: str, mode: AnonymizationMode) -> dict[str, Any]:
     path = Path(file_path)
 
     if not path.exists():
@@ -52,67 +81,69 @@ async def _anonymize_from_file(file_path: str) -> dict[str, Any]:
         }
 
     try:
-        text_content = _extract_text_from_file(path)
+        text_content = await extract_text(path)
     except Exception as e:
         return {
             "success": False,
             "error": f"Ошибка извлечения текста: {str(e)}"
         }
 
-    result = await _anonymize_from_text(text_content)
+    result = await _anonymize_from_text(text_content, mode)
     if result["success"]:
         result["original_file"] = str(path)
 
     return result
 
 
-def _extract_text_from_file(path: Path) -> str:
-    ext = path.suffix.lower()
-
-    if ext == ".txt":
-        try:
-            return path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            try:
-                return path.read_text(encoding="cp1251")
-            except UnicodeDecodeError:
-                raise Exception("Не удалось прочитать .txt как UTF-8 или CP1251")
+async def _anonymize_from_text(text: str, mode: AnonymizationMode) -> dict[str, Any]:
+    if not text or text.strip() == "":
+        return {
+            "success": False,
+            "error": "Текст для анонимизации пуст"
+        }
 
-    if ext == ".pdf":
-        from pypdf import PdfReader
-        try:
-            reader = PdfReader(str(path))
-            parts = []
-            for i, page in enumerate(reader.pages):
-                try:
-                    text = page.extract_text() or ""
-                    if text.strip():
-                        parts.append(text)
-                except Exception:
-                    continue
+    content_hash = hash_content(text) if settings.TEXT_CACHE_ENABLED else None
+    if content_hash:
+        cached = await load_anonymized_text(content_hash, mode)
+        if cached is not None:
+            return {
+                "success": True,
+                "anonymized_text": cached,
+                "mode": mode.value,
+                "cached": True
+            }
 
-            text = "\n".join(parts).strip()
-        except Exception as e:
-            raise Exception(f"Не удалось извлечь текст из PDF: {str(e)}")
+    # Структурированные данные (телефоны, email, документы, счета) маскируются локально
+    anonymized_text, replacements = await _anonymize_local(text)
 
-        if not text:
-            raise Exception("В PDF не найден текст (возможно, это скан и нужен OCR)")
+    if mode == AnonymizationMode.HYBRID:
+        anonymized_text = await _anonymize_names_and_addresses(anonymized_text)
 
-        return text
+    if content_hash:
+        await save_anonymized_text(content_hash, mode, anonymized_text)
 
-    if ext == ".pptx":
-        raise Exception("PPTX пока не поддерживается")
+    return {
+        "success": True,
+        "anonymized_text": anonymized_text,
+        "mode": mode.value,
+        "replacements": replacements
+    }
 
-    raise Exception(f"Неподдерживаемый формат: {ext}")
 
+async def _anonymize_local(text: str) -> tuple[str, dict[str, int]]:
+    """
+    Текст проходит через потоковый анонимизатор частями по _LOCAL_PIECE_CHARS:
+    каждый вызов в потоке короткий, и большой документ не держит поток пула целиком.
+    """
+    engine = StreamingAnonymizer()
+    parts: list[str] = []
+    for start in range(0, len(text), _LOCAL_PIECE_CHARS):
+        parts.append(await asyncio.to_thread(engine.feed, text[start:start + _LOCAL_PIECE_CHARS]))
+    parts.append(engine.close())
+    return "".join(parts), dict(engine.stats)
 
-async def _anonymize_from_text(text: str) -> dict[str, Any]:
-    if not text or text.strip() == "":
-        return {
-            "success": False,
-            "error": "Текст для анонимизации пуст"
-        }
 
+async def _anonymize_names_and_addresses(text: str) -> str:
     messages = [
         {
             "role": "system",
@@ -120,15 +151,12 @@ async def _anonymize_from_text(text: str) -> dict[str, Any]:
         },
         {
             "role": "user",
-            "content": f"""Замени все конфиденциальные данные на placeholder-ы:
+            "content": f"""Замени конфиденциальные данные на placeholder-ы:
 
 - ФИО, имена людей → [ИМЯ]
-- Номера телефонов → [ТЕЛЕФОН]
-- Email адреса → [EMAIL]
 - Физические адреса → [АДРЕС]
-- Номера документов (паспорт, ИНН, СНИЛС) → [ДОКУМЕНТ]
-- Номера счетов, карт → [СЧЕТ]
 
+Остальной текст и уже существующие placeholder-ы в квадратных скобках не изменяй.
 Верни ТОЛЬКО обработанный текст без пояснений.
 
 Текст для обработки:
@@ -136,15 +164,13 @@ async def _anonymize_from_text(text: str) -> dict[str, Any]:
         }
     ]
 
-    anonymized_text = await call_perplexity_api(
+    # Основной провайдер здесь Perplexity; при его сбое и настроенном резерве запрос уйдёт GigaChat
+    reply = await llm_chat(
         messages=messages,
-        temperature=0.1
+        temperature=0.1,
+        provider="perplexity",
     )
-
-    return {
-        "success": True,
-        "anonymized_text": anonymized_text
-    }
+    return reply.content
 
 
 def get_tool_spec() -> dict[str, Any]:
@@ -153,24 +179,19 @@ def get_tool_spec() -> dict[str, Any]:
         "function": {
             "name": "anonymize_data",
             "description": (
-                "Извлекает текст из файла или обрабатывает готовый текст и обезличивает конфиденциальные данные. "
-                "Заменяет ФИО, телефоны, email, адреса, номера документов на placeholder-ы. "
-                "Используй для обработки файлов (PDF/TXT/PPTX) или текста перед созданием резюме. "
-                "Передай ЛИБО file_path ЛИБО text, но не оба одновременно."
+                "Возвращает текст документа, в котором уже обезличены конфиденциальные данные: "
+                "ФИО, телефоны, email, адреса, номера документов заменены на placeholder-ы. "
+                "Используй перед созданием резюме. Передай document_ref из задания."
             ),
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "Путь к файлу для обработки (PDF/TXT/PPTX). Используй если нужно обработать файл."
-                    },
-                    "text": {
+                    "document_ref": {
                         "type": "string",
-                        "description": "Готовый текст для обработки. Используй если текст уже есть (не файл)."
+                        "description": "Ссылка на загруженный документ из задания, например doc-1a2b3c4d."
                     }
                 },
-                "required": []
+                "required": ["document_ref"]
             }
         }
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,36 @@
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_documents: ContextVar[Optional[dict[str, str]]] = ContextVar("agent_documents", default=None)
+
+
+@contextmanager
+def document_store() -> Iterator[None]:
+    """
+    Хранилище документов на время одного запуска агента.
+    Tools получают от модели только короткую ссылку document_ref, а не сам текст.
+    """
+    token = _documents.set({})
+    try:
+        yield
+    finally:
+        _documents.reset(token)
+
+
+def register_document(text: str) -> str:
+    documents = _documents.get()
+    if documents is None:
+        raise RuntimeError("document_store не открыт")
+
+    ref = f"doc-{uuid.uuid4().hex[:8]}"
+    documents[ref] = text
+    return ref
+
+
+def get_document(ref: str) -> Optional[str]:
+    documents = _documents.get()
+    if documents is None:
+        return None
+    return documents.get(ref)
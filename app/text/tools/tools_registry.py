@@ -1,5 +1,11 @@
-from typing import Any
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
 
+from app.text.enums import SummaryLevel
 from app.text.tools import anonymization_tool, complexity_analysis_tool
 
 
@@ -8,12 +14,69 @@ TOOL_FUNCTIONS = {
     "analyze_text_complexity": complexity_analysis_tool.analyze_text_complexity,
 }
 
+# GigaChat возвращает не больше одного function_call за ответ: независимые вызовы модель
+# передаёт списком в этот tool, и они выполняются параллельно за один шаг
+PARALLEL_TOOL_NAME = "run_tools"
 
-def get_default_tools() -> list[dict[str, Any]]:
-    return [
-        anonymization_tool.get_tool_spec(),
-        # complexity_analysis_tool.get_tool_spec(),
-    ]
+
+_run_results: ContextVar[Optional[dict[str, dict[str, Any]]]] = ContextVar("agent_tool_results", default=None)
+
+
+@contextmanager
+def tool_run() -> Iterator[None]:
+    """
+    Мемоизация вызовов tools на время одного запуска агента:
+    повторный вызов с теми же аргументами не выполняется заново.
+    """
+    token = _run_results.set({})
+    try:
+        yield
+    finally:
+        _run_results.reset(token)
+
+
+def get_default_tools(level: Optional[SummaryLevel] = None) -> list[dict[str, Any]]:
+    """
+    analyze_text_complexity нужен только для уровня AUTO. Если tools больше одного,
+    добавляется run_tools для их параллельного вызова.
+    """
+    tools = [anonymization_tool.get_tool_spec()]
+    if level == SummaryLevel.AUTO:
+        tools.append(complexity_analysis_tool.get_tool_spec())
+    if len(tools) > 1:
+        tools.append(_get_parallel_tool_spec([tool["function"]["name"] for tool in tools]))
+    return tools
+
+
+def _get_parallel_tool_spec(names: list[str]) -> dict[str, Any]:
+    return {
+        "type": "function",
+        "function": {
+            "name": PARALLEL_TOOL_NAME,
+            "description": (
+                "Выполняет несколько независимых вызовов tools параллельно за один шаг. "
+                "Используй, когда нужны результаты нескольких tools и ни один вызов не зависит от другого."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "calls": {
+                        "type": "array",
+                        "description": "Список вызовов: имя tool и его аргументы",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string", "enum": names},
+                                "arguments": {"type": "object"},
+                            },
+                            "required": ["name", "arguments"],
+                        },
+                    }
+                },
+                "required": ["calls"]
+            }
+        }
+    }
 
 
 async def execute_tool(function_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
@@ -37,4 +100,73 @@ async def execute_tool(function_name: str, arguments: dict[str, Any]) -> dict[st
         return {
             "success": False,
             "error": f"Ошибка выполнения функции '{function_name}': {str(e)}"
-        }
\ No newline at end of file
+        }
+
+
+async def execute_tool_cached(function_name: str, arguments: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+    """Вызов tool с учётом мемоизации tool_run; второй элемент - результат взят из кеша запуска."""
+    results = _run_results.get()
+    if results is None:
+        return await execute_tool(function_name, arguments), False
+
+    key = _call_key(function_name, arguments)
+    result = results.get(key)
+    if result is not None:
+        return result, True
+
+    result = await execute_tool(function_name, arguments)
+    # Неудачный вызов не запоминаем: его есть смысл повторить
+    if result.get("success", True):
+        results[key] = result
+    return result, False
+
+
+async def execute_tool_call(
+        function_name: str,
+        arguments: dict[str, Any],
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Выполняет function_call модели. run_tools раскрывается в отдельные вызовы,
+    которые идут параллельно; одинаковые вызовы внутри списка выполняются один раз.
+    Возвращает результат для модели и сведения о каждом вызове: имя, успех, кеш, время, размер.
+    """
+    if function_name != PARALLEL_TOOL_NAME:
+        info = await _timed_call(function_name, arguments)
+        return info.pop("result"), [info]
+
+    calls = [
+        (call.get("name", ""), call.get("arguments") or {})
+        for call in arguments.get("calls") or []
+        if isinstance(call, dict)
+    ]
+    unique = {_call_key(name, args): (name, args) for name, args in calls}
+    infos = dict(zip(unique, await asyncio.gather(*(
+        _timed_call(name, args) for name, args in unique.values()
+    ))))
+
+    results = [
+        {"name": name, "result": infos[_call_key(name, args)]["result"]}
+        for name, args in calls
+    ]
+    tools = [
+        {key: value for key, value in info.items() if key != "result"}
+        for info in infos.values()
+    ]
+    return {"success": True, "results": results}, tools
+
+
+async def _timed_call(function_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    started = time.perf_counter()
+    result, cached = await execute_tool_cached(function_name, arguments)
+    return {
+        "name": function_name,
+        "success": bool(result.get("success", True)),
+        "cached": cached,
+        "duration_ms": int((time.perf_counter() - started) * 1000),
+        "result_chars": len(json.dumps(result, ensure_ascii=False)),
+        "result": result,
+    }
+
+
+def _call_key(function_name: str, arguments: dict[str, Any]) -> str:
+    return f"{function_name}:{json.dumps(arguments, sort_keys=True, ensure_ascii=False)}"
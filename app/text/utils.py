@@ -1,10 +1,22 @@
+import asyncio
+import hashlib
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
 
 from fastapi import HTTPException, status, UploadFile
 
 from app.core.config import settings
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SavedUpload:
+    path: str
+    content_hash: str
+    size: int
+
 
 def validate_upload_file(file: UploadFile) -> None:
     filename = file.filename or ""
@@ -20,21 +32,46 @@ def validate_upload_file(file: UploadFile) -> None:
         )
 
 
-async def save_upload_file(file: UploadFile) -> str:
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Файл слишком большой. Максимум {settings.MAX_FILE_SIZE_MB} MB",
+    )
+
+
+async def save_upload_file(file: UploadFile) -> SavedUpload:
+    """
+    Пишет файл на диск частями по UPLOAD_CHUNK_SIZE, не держа его целиком в памяти.
+    Запись идёт в отдельном потоке, sha256 содержимого считается по ходу записи.
+    Здесь ограничивается только копия в UPLOAD_DIR: размер всего тела запроса,
+    которое Starlette спулит раньше, ограничивает BodySizeLimitMiddleware.
+    """
     validate_upload_file(file)
 
-    raw = await file.read()
-    if not settings.validate_file_size(len(raw)):
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"Файл слишком большой. Максимум {settings.MAX_FILE_SIZE_MB} MB",
-        )
+    if file.size is not None and not settings.validate_file_size(file.size):
+        raise _file_too_large()
 
     ext = Path(file.filename).suffix.lower()
     new_name = f"{uuid.uuid4()}{ext}"
     dest_path = settings.upload_path / new_name
 
-    with open(dest_path, "wb") as f:
-        f.write(raw)
+    digest = hashlib.sha256()
+    size = 0
+
+    f = await asyncio.to_thread(open, dest_path, "wb")
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if not settings.validate_file_size(size):
+                raise _file_too_large()
+
+            digest.update(chunk)
+            await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(dest_path.unlink, missing_ok=True)
+        raise
+
+    await asyncio.to_thread(f.close)
 
-    return str(dest_path)
\ No newline at end of file
+    return SavedUpload(path=str(dest_path), content_hash=digest.hexdigest(), size=size)
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.text.dao import DocumentDAO, SummaryDAO
+from app.text.enums import SummaryLevel, SummaryStatus
+from app.text.pipeline import (
+    build_summarize_request,
+    derive_summary_level,
+    fail_derived_summaries,
+    process_summary,
+)
+from app.text.schemas import SummarizeRequest
+
+logger = logging.getLogger(__name__)
+
+_tasks: list[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+
+
+def notify_summary_workers() -> None:
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def _claim_next_job() -> Optional[tuple[str, SummarizeRequest]]:
+    async with async_session_maker() as session:
+        summary_dao = SummaryDAO(session)
+        summary = await summary_dao.claim_next(settings.SUMMARY_JOB_LEASE_SECONDS)
+        if summary is None:
+            return None
+
+        summary_id = str(summary.id)
+
+        if summary.attempts > settings.SUMMARY_JOB_MAX_ATTEMPTS:
+            error = f"Превышено число попыток обработки: {settings.SUMMARY_JOB_MAX_ATTEMPTS}"
+            await summary_dao.update(
+                id=summary_id,
+                status=SummaryStatus.ERROR,
+                error=error,
+                locked_at=None,
+            )
+            await session.commit()
+            await fail_derived_summaries(summary_id, error)
+            return None
+
+        document = await DocumentDAO(session).find_one_or_none(id=summary.document_id)
+        request = build_summarize_request(summary, document)
+        await session.commit()
+
+    return summary_id, request
+
+
+async def _claim_orphaned_derived_job() -> Optional[tuple[str, SummaryLevel, SummarizeRequest, str]]:
+    """Производный уровень, чей вывод прервался вместе с процессом, выводится заново из текста источника."""
+    async with async_session_maker() as session:
+        summary_dao = SummaryDAO(session)
+        claimed = await summary_dao.claim_orphaned_derived(settings.SUMMARY_JOB_LEASE_SECONDS)
+        if claimed is None:
+            return None
+
+        summary, source = claimed
+        summary_id = str(summary.id)
+
+        if summary.attempts > settings.SUMMARY_JOB_MAX_ATTEMPTS:
+            await summary_dao.update(
+                id=summary_id,
+                status=SummaryStatus.ERROR,
+                error=f"Превышено число попыток обработки: {settings.SUMMARY_JOB_MAX_ATTEMPTS}",
+                locked_at=None,
+            )
+            await session.commit()
+            return None
+
+        document = await DocumentDAO(session).find_one_or_none(id=source.document_id)
+        request = build_summarize_request(source, document)
+        await session.commit()
+
+    return summary_id, summary.level, request, source.summary_text or ""
+
+
+async def _release_job(summary_id: str) -> None:
+    async with async_session_maker() as session:
+        await SummaryDAO(session).update(id=summary_id, locked_at=None)
+        await session.commit()
+
+
+async def _wait_for_jobs() -> None:
+    try:
+        await asyncio.wait_for(_wakeup.wait(), timeout=settings.SUMMARY_JOB_POLL_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+    _wakeup.clear()
+
+
+async def _worker_loop(worker_idx: int) -> None:
+    while True:
+        try:
+            job = await _claim_next_job()
+        except Exception:
+            logger.exception("summary worker %s: не удалось получить задачу", worker_idx)
+            await asyncio.sleep(settings.SUMMARY_JOB_POLL_SECONDS)
+            continue
+
+        if job is None:
+            try:
+                derived_job = await _claim_orphaned_derived_job()
+            except Exception:
+                logger.exception("summary worker %s: не удалось получить производный уровень", worker_idx)
+                derived_job = None
+
+            if derived_job is None:
+                await _wait_for_jobs()
+                continue
+
+            summary_id = derived_job[0]
+            try:
+                await derive_summary_level(*derived_job)
+            except asyncio.CancelledError:
+                await _release_job(summary_id)
+                raise
+            continue
+
+        summary_id, request = job
+        try:
+            await process_summary(summary_id, request, stream=True)
+        except asyncio.CancelledError:
+            await _release_job(summary_id)
+            raise
+        except Exception:
+            logger.exception("summary worker %s: ошибка суммаризации %s", worker_idx, summary_id)
+
+
+def start_summary_workers() -> None:
+    global _wakeup
+    if _tasks:
+        return
+
+    _wakeup = asyncio.Event()
+    for idx in range(settings.SUMMARY_WORKERS):
+        _tasks.append(asyncio.create_task(_worker_loop(idx), name=f"summary-worker-{idx}"))
+
+
+async def stop_summary_workers() -> None:
+    global _wakeup
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    _wakeup = None
@@ -0,0 +1,158 @@
+"""
+Токены и время ответа агента суммаризации до и после перехода на document_ref
+на фиксированном синтетическом корпусе, офлайн через FakeGigaChat.
+
+before - прежний протокол: текст дописывается в промпт, модель копирует его
+в аргументы anonymize_data(text=...), обезличивание выполняет tool.
+after - текущий summarize_with_agent: текст обезличивается на сервере,
+модель получает только document_ref.
+
+Пример:
+    python -m scripts.bench_agent_tokens --kb 2 8 32 --tokens-per-second 400
+"""
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from gigachat.models import Chat, FunctionCall, Messages, MessagesRole
+
+from app.core.config import settings
+from app.text.agents.smart_summarizer_agent import summarize_with_agent
+from app.text.enums import AnonymizationMode, SummaryLevel
+from app.text.fake_llm import FakeGigaChat
+from app.text.gigachat_client import _run_tool_loop
+from app.text.schemas import SummarizeRequest
+from app.text.tools import execute_tool_call
+from scripts.bench_anonymizer import build_corpus
+
+_BASELINE_TEXT_MARKER = "\n\nТекст:\n"
+
+_BASELINE_SYSTEM_PROMPT = """Ты умный агент для суммаризации документов.
+
+У тебя есть доступ к инструментам (tools):
+- anonymize_data - обезличивает конфиденциальные данные (принимает file_path ИЛИ text)
+
+Правила работы:
+1. ВСЕГДА сначала вызывай anonymize_data для обработки данных
+   - Если получил file_path - передай file_path
+   - Если получил text - передай text
+   - НИКОГДА не передавай оба параметра одновременно!
+2. Работай только с обезличенным текстом
+3. Не выдумывай факты - используй только информацию из документа
+4. Создавай структурированные и понятные резюме
+5. Отвечай на русском языке"""
+
+_BASELINE_USER_PROMPT = """Текст для обработки передан напрямую
+
+ЗАДАЧА:
+1. Вызови anonymize_data с параметром text="<переданный текст>"
+2. Создай среднее резюме (3-5 абзацев) на основе полученного текста
+
+Требования к резюме:
+- Сохрани все ключевые идеи и важные факты
+- Убери воду, повторы и несущественные детали
+- Сделай текст структурированным и легко читаемым
+- Используй русский язык
+
+Создай качественное резюме документа."""
+
+_BASELINE_TOOL_SPEC = {
+    "type": "function",
+    "function": {
+        "name": "anonymize_data",
+        "description": "Обезличивает конфиденциальные данные. Передай ЛИБО file_path ЛИБО text, но не оба одновременно.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "file_path": {"type": "string", "description": "Путь к файлу для обработки"},
+                "text": {"type": "string", "description": "Готовый текст для обработки"}
+            },
+            "required": []
+        }
+    }
+}
+
+
+class _BaselineGigaChat(FakeGigaChat):
+    """Модель прежнего протокола: первым шагом переписывает текст из промпта в аргументы anonymize_data"""
+
+    def _next_message(self, chat: Chat) -> tuple[str, Messages]:
+        if any(message.role == MessagesRole.FUNCTION for message in chat.messages):
+            return super()._next_message(chat)
+
+        prompt = chat.messages[-1].content or ""
+        function_call = FunctionCall(
+            name="anonymize_data",
+            arguments={"text": prompt.split(_BASELINE_TEXT_MARKER, 1)[-1]}
+        )
+        return "function_call", Messages(role=MessagesRole.ASSISTANT, content="", function_call=function_call)
+
+
+async def _run_before(text: str) -> list[dict[str, Any]]:
+    messages = [
+        {"role": "system", "content": _BASELINE_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{_BASELINE_USER_PROMPT}{_BASELINE_TEXT_MARKER}{text}"},
+    ]
+    result = await _run_tool_loop(
+        _BaselineGigaChat(settings.GIGACHAT_DEFAULT_MODEL),
+        model=settings.GIGACHAT_DEFAULT_MODEL,
+        messages=messages,
+        tools_specs=[_BASELINE_TOOL_SPEC],
+        execute_tool_func=execute_tool_call,
+        temperature=0.2,
+        max_steps=8,
+        on_event=None,
+    )
+    return result["steps"]
+
+
+async def _run_after(text: str) -> list[dict[str, Any]]:
+    request = SummarizeRequest(text=text, level=SummaryLevel.MEDIUM)
+    result = await summarize_with_agent(request)
+    return result["steps"]
+
+
+async def _measure(run, text: str, repeat: int) -> tuple[int, int, float]:
+    best = float("inf")
+    steps: list[dict[str, Any]] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        steps = await run(text)
+        best = min(best, time.perf_counter() - started)
+    prompt_tokens = sum(step.get("prompt_tokens") or 0 for step in steps)
+    completion_tokens = sum(step.get("completion_tokens") or 0 for step in steps)
+    return prompt_tokens, completion_tokens, best
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Токены и время агента: текст в промпте против document_ref")
+    parser.add_argument("--kb", type=int, nargs="+", default=[2, 8, 32], help="Размеры документов корпуса")
+    parser.add_argument("--tokens-per-second", type=float, default=400.0, help="Скорость генерации FakeGigaChat")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Задержка ответа FakeGigaChat")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    settings.FAKE_LLM_ENABLED = True
+    settings.FAKE_LLM_ERROR_RATE = 0.0
+    settings.FAKE_LLM_LATENCY_MS_MEAN = args.latency_ms
+    settings.FAKE_LLM_LATENCY_MS_STDDEV = 0.0
+    settings.FAKE_LLM_TOKENS_PER_SECOND = args.tokens_per_second
+    settings.FAKE_LLM_TOKENS_PER_SECOND_STDDEV = 0.0
+    settings.ANONYMIZATION_MODE = AnonymizationMode.LOCAL.value
+    settings.TEXT_CACHE_ENABLED = False
+
+    print(f"{'KB':>4} {'variant':>7} {'prompt':>8} {'completion':>10} {'total':>8} {'time, s':>8}")
+    for kb in args.kb:
+        text = build_corpus(kb * 1024, pii_every=50, seed=kb)
+        before = await _measure(_run_before, text, args.repeat)
+        after = await _measure(_run_after, text, args.repeat)
+        for name, (prompt_tokens, completion_tokens, elapsed) in (("before", before), ("after", after)):
+            total = prompt_tokens + completion_tokens
+            print(f"{kb:>4} {name:>7} {prompt_tokens:>8} {completion_tokens:>10} {total:>8} {elapsed:>8.2f}")
+        saved = 1 - sum(after[:2]) / sum(before[:2])
+        print(f"{kb:>4} {'saved':>7} {saved:>36.0%} {1 - after[2] / before[2]:>8.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
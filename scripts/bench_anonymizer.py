@@ -0,0 +1,82 @@
+"""
+Пропускная способность локального анонимизатора (MB/s) на синтетическом русском корпусе
+с заданной долей ПДн: целиком (anonymize_text) и потоком по страницам (StreamingAnonymizer).
+
+Пример:
+    python -m scripts.bench_anonymizer --mb 20 --page-kb 4
+"""
+import argparse
+import random
+import time
+
+from app.text.anonymizer import StreamingAnonymizer, anonymize_text
+
+_WORDS = (
+    "отчёт компания договор поставка оборудование квартал выручка расходы сотрудник отдел "
+    "проект срок оплата клиент услуга решение совещание руководитель задача результат"
+).split()
+
+_PII = (
+    "+7 (912) 345-67-89",
+    "8 916 123-45-67",
+    "ivan.petrov@example.com",
+    "4111 1111 1111 1111",
+    "40817810099910004312",
+    "112-233-445 95",
+    "7707083893",
+    "паспорт 45 06 123456",
+)
+
+
+def build_corpus(size_bytes: int, pii_every: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    words: list[str] = []
+    size = 0
+    while size < size_bytes:
+        word = rnd.choice(_PII) if rnd.randrange(pii_every) == 0 else rnd.choice(_WORDS)
+        if rnd.randrange(12) == 0:
+            word += "."
+        words.append(word)
+        size += len(word.encode("utf-8")) + 1
+    return " ".join(words)
+
+
+def _bench(name: str, func, corpus_mb: float, repeat: int) -> None:
+    best = float("inf")
+    stats: dict[str, int] = {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        stats = func()
+        best = min(best, time.perf_counter() - started)
+    print(f"{name:>9}: {best:.3f}s {corpus_mb / best:.1f} MB/s replacements={sum(stats.values())}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк локального анонимизатора, MB/s")
+    parser.add_argument("--mb", type=float, default=20.0, help="Размер корпуса")
+    parser.add_argument("--page-kb", type=int, default=4, help="Размер страницы в потоковом режиме")
+    parser.add_argument("--pii-every", type=int, default=50, help="Одно значение ПДн примерно на N слов")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = build_corpus(int(args.mb * 1024 * 1024), args.pii_every)
+    corpus_mb = len(corpus.encode("utf-8")) / 1024 / 1024
+    page_chars = args.page_kb * 1024
+    print(f"corpus: {corpus_mb:.1f} MB, {len(corpus):,} chars")
+
+    def whole() -> dict[str, int]:
+        return anonymize_text(corpus)[1]
+
+    def streaming() -> dict[str, int]:
+        engine = StreamingAnonymizer()
+        for start in range(0, len(corpus), page_chars):
+            engine.feed(corpus[start:start + page_chars])
+        engine.close()
+        return dict(engine.stats)
+
+    _bench("whole", whole, corpus_mb, args.repeat)
+    _bench("streaming", streaming, corpus_mb, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
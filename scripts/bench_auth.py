@@ -0,0 +1,74 @@
+"""
+Микробенчмарк зависимости get_current_user_id: полная проверка JWT на каждый запрос
+против кэша проверенных токенов.
+
+Запросы имитируются объектами starlette Request с cookie access_token и вызываются
+конкурентно в одном event loop, как их вызывал бы FastAPI под нагрузкой.
+
+Пример:
+    python -m scripts.bench_auth --requests 100000 --concurrency 200 --users 1000
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import timedelta
+
+from starlette.requests import Request
+
+from app.auth.dependencies import get_current_user_id
+from app.auth.security import jwt_token
+from app.auth.security.jwt_token import VerifiedTokenCache, create_token
+
+
+def _request(token: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"cookie", f"access_token={token}".encode("ascii"))],
+    })
+
+
+async def _run(requests: list[Request], concurrency: int) -> float:
+    queue = iter(requests)
+
+    async def worker() -> None:
+        for request in queue:
+            await get_current_user_id(request)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> None:
+    tokens = [create_token(subject=f"user-{idx}", ttl=timedelta(minutes=30)) for idx in range(args.users)]
+    requests = [_request(random.choice(tokens)) for _ in range(args.requests)]
+
+    results = {}
+    for name, cache_size in (("no cache", 0), ("cache", args.cache_size)):
+        jwt_token.verified_token_cache = VerifiedTokenCache(cache_size, 300)
+        elapsed = await _run(requests, args.concurrency)
+        results[name] = elapsed
+        print(
+            f"{name:>8}: {elapsed:.3f}s "
+            f"{args.requests / elapsed:,.0f} req/s "
+            f"{elapsed / args.requests * 1e6:.1f} us/req "
+            f"{jwt_token.verified_token_cache.stats()}"
+        )
+
+    print(f"speedup: x{results['no cache'] / results['cache']:.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк get_current_user_id с кэшем JWT и без")
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--users", type=int, default=1000, help="Число различных токенов")
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Сколько одновременных потоков скорочтения выдерживает один воркер (один event loop).
+Сравниваются прежняя выдача по слову на событие и текущая выдача пачками.
+Для каждого числа потоков замеряются кадры в секунду, загрузка CPU и задержка event loop;
+поток считается выдержанным, пока p99 задержки event loop не превышает --max-lag-ms.
+
+Пример:
+    python -m scripts.bench_speed_read --streams 1000 5000 10000 20000 40000 --wpm 300 --seconds 5
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.core.config import settings
+from app.text.service import generate_speed_reading_stream
+from app.text.speed_reading import build_reading_plan
+
+_WORDS = (
+    "компания увеличила выручку квартал проект завершён срок оплаты договор поставка "
+    "оборудования руководитель отдела согласовал бюджет расходы снизились результат"
+).split()
+
+_LAG_TICK = 0.01
+
+
+async def _per_word_stream(text: str, words_per_minute: int):
+    """Прежняя выдача: одно SSE-событие и один таймер на каждое слово"""
+    delay = 60.0 / words_per_minute
+    for word in text.split():
+        yield f"data: {word}\n\n"
+        await asyncio.sleep(delay)
+
+
+async def _consume(stream, counters: dict[str, int], start_delay: float) -> None:
+    await asyncio.sleep(start_delay)
+    async for frame in stream:
+        counters["frames"] += 1
+        counters["bytes"] += len(frame.encode("utf-8"))
+
+
+async def _monitor_lag(lags: list[float]) -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(_LAG_TICK)
+        lags.append(time.perf_counter() - started - _LAG_TICK)
+
+
+def _percentile(values: list[float], share: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+
+async def _run(make_stream, streams: int, seconds: float, spread: float) -> dict[str, float]:
+    counters = {"frames": 0, "bytes": 0}
+    lags: list[float] = []
+    monitor = asyncio.create_task(_monitor_lag(lags))
+    tasks = [
+        asyncio.create_task(_consume(make_stream(), counters, random.uniform(0, spread)))
+        for _ in range(streams)
+    ]
+
+    cpu_started = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu = time.process_time() - cpu_started
+
+    for task in [*tasks, monitor]:
+        task.cancel()
+    await asyncio.gather(*tasks, monitor, return_exceptions=True)
+
+    return {
+        "frames_per_second": counters["frames"] / seconds,
+        "kb_per_second": counters["bytes"] / 1024 / seconds,
+        "cpu": cpu / seconds,
+        "lag_p99_ms": _percentile(lags, 0.99) * 1000,
+        "lag_max_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк одновременных потоков скорочтения на один воркер")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1000, 5000, 10000, 20000, 40000])
+    parser.add_argument("--wpm", type=int, default=300, help="Скорость чтения, слов в минуту")
+    parser.add_argument("--words", type=int, default=2000, help="Длина summary в словах")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Длительность замера на каждое число потоков")
+    parser.add_argument("--max-lag-ms", type=float, default=50.0, help="Допустимый p99 задержки event loop")
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    text = " ".join(
+        rnd.choice(_WORDS) + ("." if rnd.randrange(10) == 0 else "")
+        for _ in range(args.words)
+    )
+    plan = build_reading_plan(text)
+
+    variants = {
+        "per-word": (lambda: _per_word_stream(text, args.wpm), 60.0 / args.wpm),
+        "batched": (lambda: generate_speed_reading_stream(plan, args.wpm), settings.SPEED_READ_BATCH_SECONDS),
+    }
+
+    print(f"{'variant':>8} {'streams':>7} {'frames/s':>9} {'KB/s':>8} {'CPU':>5} {'lag p99':>8} {'lag max':>8}")
+    for name, (make_stream, spread) in variants.items():
+        sustained = 0
+        for streams in sorted(args.streams):
+            result = await _run(make_stream, streams, args.seconds, spread)
+            print(
+                f"{name:>8} {streams:>7} {result['frames_per_second']:>9.0f} {result['kb_per_second']:>8.0f} "
+                f"{result['cpu']:>5.0%} {result['lag_p99_ms']:>6.1f}ms {result['lag_max_ms']:>6.1f}ms"
+            )
+            if result["lag_p99_ms"] > args.max_lag_ms:
+                break
+            sustained = streams
+        print(f"{name:>8} выдерживает потоков: {sustained or f'< {min(args.streams)}'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,165 @@
+"""
+Нагрузочный прогон полного пайплайна суммаризации внутри одного процесса.
+
+Приложение поднимается in-process через httpx.ASGITransport вместе с lifespan
+(воркеры очереди, пулы), запросы идут через настоящие роуты, БД и агента.
+Без сети и квоты запускать с FAKE_LLM_ENABLED=true: задержки и скорость токенов
+заменителя LLM настраиваются переменными FAKE_LLM_*.
+
+Пример:
+    FAKE_LLM_ENABLED=true python -m scripts.load_test --concurrency 50 --requests 500 --mode stream
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+from app.core.config import settings
+from app.main import app
+from app.text.fake_llm import get_fake_call_stats, reset_fake_call_stats
+
+_SAMPLE_TEXT = (
+    "Иван Петров, телефон +7 916 123-45-67, почта ivan.petrov@example.com, подготовил отчёт о работе отдела. "
+    "В третьем квартале выручка выросла на 12%, расходы на инфраструктуру снизились на 4%. "
+    "Основные риски связаны со сроками поставки оборудования и нехваткой специалистов. "
+)
+
+
+def _percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def _measure_loop_lag(samples: list[float], stop: asyncio.Event, interval: float = 0.05) -> None:
+    """Насколько позже запланированного просыпается event loop: признак блокирующего кода."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def _login(client: httpx.AsyncClient) -> None:
+    credentials = {"email": f"load-{uuid.uuid4().hex[:12]}@example.com", "password": "load-test-password"}
+    response = await client.post("/user/register", json=credentials)
+    response.raise_for_status()
+    response = await client.post("/auth/login", json=credentials)
+    response.raise_for_status()
+
+
+async def _run_one(client: httpx.AsyncClient, mode: str, level: str, text_repeat: int) -> tuple[float, float | None]:
+    data = {
+        "text": f"{uuid.uuid4()}\n" + _SAMPLE_TEXT * text_repeat,
+        "level": level,
+        "use_cache": "false",
+    }
+    started = time.perf_counter()
+
+    if mode == "stream":
+        first_token: float | None = None
+        async with client.stream("POST", "/text/summaries/stream", data=data) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if first_token is None and line == "event: token":
+                    first_token = time.perf_counter() - started
+                if line in ("event: done", "event: error"):
+                    if line == "event: error":
+                        raise RuntimeError("summary завершился с ошибкой")
+                    break
+        return time.perf_counter() - started, first_token
+
+    response = await client.post("/text/summaries", data=data)
+    response.raise_for_status()
+    return time.perf_counter() - started, None
+
+
+async def run(args: argparse.Namespace) -> None:
+    latencies: list[float] = []
+    first_tokens: list[float] = []
+    errors: dict[str, int] = {}
+    loop_lag: list[float] = []
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+            await _login(client)
+
+            queue: asyncio.Queue[int] = asyncio.Queue()
+            for idx in range(args.requests):
+                queue.put_nowait(idx)
+
+            async def worker() -> None:
+                while True:
+                    try:
+                        queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    try:
+                        latency, first_token = await _run_one(client, args.mode, args.level, args.text_repeat)
+                        latencies.append(latency)
+                        if first_token is not None:
+                            first_tokens.append(first_token)
+                    except Exception as e:
+                        key = type(e).__name__
+                        errors[key] = errors.get(key, 0) + 1
+
+            reset_fake_call_stats()
+            stop = asyncio.Event()
+            lag_task = asyncio.create_task(_measure_loop_lag(loop_lag, stop))
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+
+            stop.set()
+            await lag_task
+            llm_calls = get_fake_call_stats()
+
+    print(f"mode={args.mode} concurrency={args.concurrency} requests={args.requests}")
+    print(f"ok={len(latencies)} errors={sum(errors.values())} {errors or ''}")
+    print(f"elapsed={elapsed:.2f}s throughput={len(latencies) / elapsed:.2f} req/s")
+    if latencies:
+        print(
+            "latency s: "
+            f"p50={_percentile(latencies, 0.50):.3f} "
+            f"p95={_percentile(latencies, 0.95):.3f} "
+            f"p99={_percentile(latencies, 0.99):.3f} "
+            f"max={max(latencies):.3f}"
+        )
+    if first_tokens:
+        print(
+            "first token s: "
+            f"p50={_percentile(first_tokens, 0.50):.3f} "
+            f"p95={_percentile(first_tokens, 0.95):.3f} "
+            f"p99={_percentile(first_tokens, 0.99):.3f}"
+        )
+    if loop_lag:
+        print(
+            "event loop lag ms: "
+            f"mean={statistics.fmean(loop_lag):.1f} "
+            f"p99={_percentile(loop_lag, 0.99):.1f} "
+            f"max={max(loop_lag):.1f}"
+        )
+    if settings.FAKE_LLM_ENABLED:
+        print(f"llm calls: total={llm_calls['total']} peak_in_flight={llm_calls['peak_in_flight']}")
+        # Вызовы модели из разных запросов должны идти одновременно, а не друг за другом
+        if args.concurrency > 1 and llm_calls["total"] > 1 and llm_calls["peak_in_flight"] <= 1:
+            raise SystemExit("Вызовы LLM сериализованы: peak_in_flight=1 при concurrency > 1")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон POST /text/summaries")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--mode", choices=["sync", "stream"], default="sync")
+    parser.add_argument("--level", default="medium")
+    parser.add_argument("--text-repeat", type=int, default=20, help="Размер документа в повторах образца")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import os
+import tempfile
+
+# Настройки обязательны при импорте app.core.config; тестам БД и внешние API не нужны
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_NAME", "test")
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("PERPLEXITY_API_KEY", "test")
+os.environ.setdefault("FAKE_LLM_ENABLED", "true")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "pacereader-test-uploads"))
@@ -0,0 +1,41 @@
+import pytest
+
+from app.text.anonymizer import StreamingAnonymizer, anonymize_text
+
+
+@pytest.mark.parametrize(
+    ("text", "kind", "placeholder"),
+    [
+        ("звоните +7 (912) 345-67-89 днём", "phone", "[ТЕЛЕФОН]"),
+        ("карта 4111 1111 1111 1111 списание", "card", "[СЧЕТ]"),
+        ("счёт 40817810099910004312 открыт", "account", "[СЧЕТ]"),
+        ("СНИЛС 112-233-445 95 указан", "snils", "[ДОКУМЕНТ]"),
+        ("ИНН 7707083893 организации", "inn", "[ДОКУМЕНТ]"),
+        ("паспорт 4506123456 выдан", "passport", "[ДОКУМЕНТ]"),
+    ],
+)
+def test_masks_each_pii_category(text, kind, placeholder):
+    anonymized, stats = anonymize_text(text)
+
+    assert placeholder in anonymized
+    assert not any(ch.isdigit() for ch in anonymized)
+    assert stats == {kind: 1}
+
+
+def test_checksum_failures_are_not_masked_as_that_category():
+    anonymized, stats = anonymize_text("карта 4111 1111 1111 1112 и номер заказа 1234567890123")
+
+    assert anonymized == "карта 4111 1111 1111 1112 и номер заказа 1234567890123"
+    assert stats == {}
+
+
+def test_streaming_matches_whole_text():
+    text = "Клиент: +7 912 345-67-89, ИНН 7707083893, паспорт 45 06 123456. " * 200
+    engine = StreamingAnonymizer()
+    # Части режут номера посередине
+    parts = [engine.feed(text[start:start + 97]) for start in range(0, len(text), 97)]
+    parts.append(engine.close())
+
+    expected, stats = anonymize_text(text)
+    assert "".join(parts) == expected
+    assert dict(engine.stats) == stats
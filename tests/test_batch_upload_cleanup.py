@@ -0,0 +1,63 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import text as text_api
+from app.text.utils import SavedUpload
+
+
+def _run_batch(files, session=None):
+    return asyncio.run(text_api.create_summary_batch(
+        user_id="user",
+        session=session,
+        texts=None,
+        files=files,
+        levels=None,
+        model=None,
+        temperature=0.2,
+        max_steps=8,
+        use_cache=True,
+        anonymization=None,
+    ))
+
+
+def test_failed_upload_removes_files_saved_before_it(tmp_path, monkeypatch):
+    saved = []
+
+    async def fake_save(file):
+        if file.name == "bad":
+            raise HTTPException(status_code=413, detail="too large")
+        path = tmp_path / f"{file.name}.txt"
+        path.write_text("content")
+        saved.append(path)
+        return SavedUpload(path=str(path), content_hash=file.name, size=7)
+
+    monkeypatch.setattr(text_api, "save_upload_file", fake_save)
+    files = [SimpleNamespace(name="a"), SimpleNamespace(name="b"), SimpleNamespace(name="bad")]
+
+    with pytest.raises(HTTPException):
+        _run_batch(files)
+
+    assert len(saved) == 2
+    assert not any(path.exists() for path in saved)
+
+
+def test_db_failure_removes_saved_files(tmp_path, monkeypatch):
+    path = tmp_path / "a.txt"
+
+    async def fake_save(file):
+        path.write_text("content")
+        return SavedUpload(path=str(path), content_hash="hash", size=7)
+
+    async def no_cache(summary_dao, cache_keys):
+        raise RuntimeError("db is down")
+
+    monkeypatch.setattr(text_api, "save_upload_file", fake_save)
+    monkeypatch.setattr(text_api, "find_cached_summaries", no_cache)
+
+    with pytest.raises(RuntimeError):
+        _run_batch([SimpleNamespace(name="a")])
+
+    assert not path.exists()
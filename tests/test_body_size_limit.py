@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+
+from app.core.middleware import BodySizeLimitMiddleware
+
+_LIMIT = 1024
+
+
+def _make_app(calls: list[str]) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(BodySizeLimitMiddleware, max_body_size=_LIMIT)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        calls.append(file.filename)
+        return {"size": len(await file.read())}
+
+    return app
+
+
+def _post(app: FastAPI, **kwargs) -> httpx.Response:
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/upload", **kwargs)
+
+    return asyncio.run(main())
+
+
+def _multipart(payload: bytes) -> tuple[bytes, dict[str, str]]:
+    boundary = "limit-test"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="a.txt"\r\n'
+        "Content-Type: text/plain\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, {"content-type": f"multipart/form-data; boundary={boundary}"}
+
+
+def test_small_upload_passes():
+    calls = []
+    response = _post(_make_app(calls), files={"file": ("a.txt", b"x" * 100)})
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_large_content_length_is_rejected_before_the_route():
+    calls = []
+    response = _post(_make_app(calls), files={"file": ("a.txt", b"x" * (_LIMIT * 2))})
+
+    assert response.status_code == 413
+    assert calls == []
+
+
+def test_chunked_body_is_cut_off_while_parsing_the_form():
+    calls = []
+    body, headers = _multipart(b"x" * (_LIMIT * 4))
+
+    async def chunks():
+        for start in range(0, len(body), 256):
+            yield body[start:start + 256]
+
+    response = _post(_make_app(calls), content=chunks(), headers=headers)
+
+    assert response.status_code == 413
+    assert calls == []
@@ -0,0 +1,47 @@
+import asyncio
+import random
+
+from app.text.agents.map_reduce_summarizer_agent import _iter_chunks
+from app.text.chunking import PAGE_SEPARATOR, split_into_chunks
+
+
+async def _pages(pages):
+    for page in pages:
+        yield page
+
+
+def _collect(pages, max_chars):
+    async def scenario():
+        return [chunk async for chunk in _iter_chunks(_pages(pages), max_chars)]
+    return asyncio.run(scenario())
+
+
+def _make_pages(count: int, seed: int = 0) -> list[str]:
+    rnd = random.Random(seed)
+    words = "отчёт выручка договор поставка сотрудник проект срок оплата клиент решение".split()
+    pages = []
+    for _ in range(count):
+        paragraphs = [
+            " ".join(rnd.choice(words) for _ in range(rnd.randint(20, 120))) + "."
+            for _ in range(rnd.randint(1, 4))
+        ]
+        pages.append("\n\n".join(paragraphs))
+    return pages
+
+
+def test_live_pages_and_cached_text_give_the_same_chunks():
+    pages = _make_pages(6)
+    cached = PAGE_SEPARATOR.join(pages)
+
+    live = _collect(pages, 1500)
+
+    assert live == _collect([cached], 1500)
+    assert live == split_into_chunks(cached, 1500)
+    assert all(len(chunk) <= 1500 for chunk in live)
+
+
+def test_chunks_do_not_depend_on_page_sizes():
+    pages = _make_pages(20, seed=1)
+    merged = [PAGE_SEPARATOR.join(pages[idx:idx + 3]) for idx in range(0, len(pages), 3)]
+
+    assert _collect(pages, 900) == _collect(merged, 900)
@@ -0,0 +1,28 @@
+from app.text.complexity import analyze_text
+
+
+def test_numbered_list_items_are_not_headings():
+    report = analyze_text(["1. Купить молоко\n2. Забрать посылку\n3. Позвонить маме\n"])
+
+    assert report.list_items == 3
+    assert report.headings == 0
+
+
+def test_multilevel_numbering_is_a_heading():
+    report = analyze_text(["2.1 Методы исследования\nТекст раздела.\n"])
+
+    assert report.headings == 1
+    assert report.list_items == 0
+
+
+def test_digits_with_periods_do_not_end_sentences():
+    report = analyze_text(["1. Рост составил 2.5 процента за 2020 год\n2. Версия 1.2.3 вышла\n"])
+
+    assert report.sentences == 1
+    assert report.numeric_ratio > 0
+
+
+def test_sentence_terminators_are_counted():
+    report = analyze_text(["Первое предложение. Второе! Третье?"])
+
+    assert report.sentences == 3
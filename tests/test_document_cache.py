@@ -0,0 +1,55 @@
+import os
+import time
+
+import pytest
+
+from app.text import document_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_cache, "_cache_dir", lambda: tmp_path)
+    return tmp_path
+
+
+def _file(directory, name, size, age):
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_sweep_removes_stale_files(cache_dir, monkeypatch):
+    monkeypatch.setattr(document_cache.settings, "TEXT_CACHE_MAX_AGE_SECONDS", 100)
+    fresh = _file(cache_dir, "fresh.txt.gz", 10, age=10)
+    stale = _file(cache_dir, "stale.txt.gz", 10, age=200)
+    tmp = _file(cache_dir, "a.txt.gz.123.tmp", 10, age=2 * 3600)
+
+    assert document_cache.sweep_text_cache() == 2
+    assert fresh.exists()
+    assert not stale.exists()
+    assert not tmp.exists()
+
+
+def test_sweep_enforces_size_limit_oldest_first(cache_dir, monkeypatch):
+    monkeypatch.setattr(document_cache.settings, "TEXT_CACHE_MAX_SIZE_MB", 1)
+    mb = 1024 * 1024
+    oldest = _file(cache_dir, "oldest.txt.gz", mb // 2, age=30)
+    middle = _file(cache_dir, "middle.txt.gz", mb // 2, age=20)
+    newest = _file(cache_dir, "newest.txt.gz", mb // 2, age=10)
+
+    assert document_cache.sweep_text_cache() == 1
+    assert not oldest.exists()
+    assert middle.exists()
+    assert newest.exists()
+
+
+def test_read_refreshes_mtime(cache_dir):
+    path = cache_dir / "doc.txt.gz"
+    document_cache._write(path, "текст")
+    old = time.time() - 1000
+    os.utime(path, (old, old))
+
+    assert document_cache._read(path) == "текст"
+    assert path.stat().st_mtime > old + 900
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.text import extraction
+
+
+@pytest.fixture
+def single_worker_pool(monkeypatch):
+    monkeypatch.setattr(extraction.settings, "PDF_EXTRACTION_WORKERS", 1)
+    extraction.shutdown_extraction_pool()
+    yield
+    extraction.shutdown_extraction_pool()
+
+
+def test_timed_out_task_does_not_starve_the_pool(single_worker_pool):
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        hung_pid = await extraction._run_in_pool(loop.time() + 30, os.getpid)
+
+        with pytest.raises(Exception, match="Превышено время"):
+            await extraction._run_in_pool(loop.time() + 1, time.sleep, 60)
+
+        started = loop.time()
+        pid = await extraction._run_in_pool(loop.time() + 30, os.getpid)
+        return hung_pid, pid, loop.time() - started
+
+    hung_pid, pid, elapsed = asyncio.run(scenario())
+
+    assert pid != hung_pid
+    assert elapsed < 30
+
+
+def _write_blank_pdf(path, pages: int) -> None:
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_timeout_kills_only_the_hung_task(monkeypatch):
+    monkeypatch.setattr(extraction.settings, "PDF_EXTRACTION_WORKERS", 2)
+    extraction.shutdown_extraction_pool()
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        innocent = asyncio.ensure_future(extraction._run_in_pool(loop.time() + 30, time.sleep, 2))
+        hung = extraction._run_in_pool(loop.time() + 0.5, time.sleep, 60)
+        with pytest.raises(Exception, match="Превышено время"):
+            await hung
+        return await innocent
+
+    try:
+        assert asyncio.run(scenario()) is None
+    finally:
+        extraction.shutdown_extraction_pool()
+
+
+def test_pdf_reader_is_cached_and_used_by_workers(tmp_path, single_worker_pool):
+    path = tmp_path / "doc.pdf"
+    _write_blank_pdf(path, 3)
+
+    assert extraction._open_pdf(str(path)) is extraction._open_pdf(str(path))
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        return await extraction._run_in_pool(loop.time() + 30, extraction._count_pdf_pages, str(path))
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_changed_pdf_is_reopened(tmp_path):
+    path = tmp_path / "doc.pdf"
+    _write_blank_pdf(path, 1)
+    first = extraction._open_pdf(str(path))
+
+    _write_blank_pdf(path, 2)
+    os.utime(path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+
+    assert extraction._open_pdf(str(path)) is not first
+    assert len(extraction._open_pdf(str(path)).pages) == 2
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.core import llm_gateway, rate_limit
+from app.text import gigachat_client
+from app.text.fake_llm import get_fake_call_stats, reset_fake_call_stats
+from app.text.gigachat_client import gigachat_chat_with_tools
+from app.text.tools import execute_tool_call, get_default_tools, tool_run
+from app.text.tools.document_store import document_store, register_document
+
+
+@pytest.fixture(autouse=True)
+def fake_gigachat(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "_semaphores", {})
+    monkeypatch.setattr(llm_gateway, "_breakers", {})
+    monkeypatch.setattr(llm_gateway, "_stats", {})
+    monkeypatch.setattr(rate_limit, "_buckets", {})
+    monkeypatch.setattr(gigachat_client, "_clients", {})
+    monkeypatch.setattr(gigachat_client, "_token_expires_at", {})
+    settings = gigachat_client.settings
+    monkeypatch.setattr(settings, "FAKE_LLM_ENABLED", True)
+    monkeypatch.setattr(settings, "FAKE_LLM_ERROR_RATE", 0.0)
+    monkeypatch.setattr(settings, "FAKE_LLM_LATENCY_MS_MEAN", 50.0)
+    monkeypatch.setattr(settings, "FAKE_LLM_LATENCY_MS_STDDEV", 0.0)
+    monkeypatch.setattr(settings, "FAKE_LLM_TOKENS_PER_SECOND", 10000.0)
+    reset_fake_call_stats()
+
+
+async def _summarize(on_event=None):
+    with document_store(), tool_run():
+        ref = register_document("Выручка выросла на 12%. Расходы снизились.")
+        return await gigachat_chat_with_tools(
+            messages=[{"role": "user", "content": f'Сделай резюме документа document_ref="{ref}"'}],
+            tools_specs=get_default_tools(),
+            execute_tool_func=execute_tool_call,
+            on_event=on_event,
+        )
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_concurrent_tool_loops_overlap(streaming):
+    async def on_event(event):
+        return None
+
+    async def main():
+        return await asyncio.gather(*(_summarize(on_event if streaming else None) for _ in range(8)))
+
+    results = asyncio.run(main())
+
+    stats = get_fake_call_stats()
+    assert all(result["content"] for result in results)
+    assert stats["total"] == 16
+    assert stats["in_flight"] == 0
+    assert stats["peak_in_flight"] > 1
+
+
+def test_concurrency_limit_caps_in_flight_calls(monkeypatch):
+    monkeypatch.setattr(gigachat_client.settings, "GIGACHAT_MAX_CONCURRENCY", 2)
+
+    async def main():
+        await asyncio.gather(*(_summarize() for _ in range(6)))
+
+    asyncio.run(main())
+
+    assert get_fake_call_stats()["peak_in_flight"] == 2
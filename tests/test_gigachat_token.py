@@ -0,0 +1,70 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from gigachat.models import AccessToken
+
+from app.text import gigachat_client
+from app.text.gigachat_client import close_gigachat_clients, ensure_gigachat_token
+
+
+class _Client:
+    def __init__(self, token: AccessToken):
+        self._access_token = token
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _token(value: str, ttl: float) -> AccessToken:
+    return AccessToken(access_token=value, expires_at=int((time.time() + ttl) * 1000))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = _Client(_token("old", 10))
+    monkeypatch.setattr(gigachat_client, "_clients", {"model": client})
+    monkeypatch.setattr(gigachat_client, "_token_expires_at", {})
+    monkeypatch.setattr(gigachat_client, "_token_locks", {})
+    return client
+
+
+def test_refresh_keeps_old_token_until_the_new_one_arrives(client, monkeypatch):
+    seen = SimpleNamespace(fetches=0, during_fetch=[])
+
+    async def fetch(model_name):
+        seen.fetches += 1
+        await asyncio.sleep(0.01)
+        seen.during_fetch.append(client._access_token.access_token)
+        return _token("new", 3600)
+
+    monkeypatch.setattr(gigachat_client, "_fetch_token", fetch)
+
+    async def main():
+        await asyncio.gather(*(ensure_gigachat_token("model") for _ in range(10)))
+
+    asyncio.run(main())
+
+    assert seen.fetches == 1
+    assert seen.during_fetch == ["old"]
+    assert client._access_token.access_token == "new"
+
+
+def test_close_forgets_token_state(client, monkeypatch):
+    async def fetch(model_name):
+        return _token("new", 3600)
+
+    monkeypatch.setattr(gigachat_client, "_fetch_token", fetch)
+
+    async def main():
+        await ensure_gigachat_token("model")
+        await close_gigachat_clients()
+
+    asyncio.run(main())
+
+    assert client.closed
+    assert gigachat_client._clients == {}
+    assert gigachat_client._token_expires_at == {}
+    assert gigachat_client._token_locks == {}
@@ -0,0 +1,90 @@
+import time
+from datetime import timedelta
+
+import pytest
+from jose import JWTError
+
+from app.auth.security import jwt_token
+from app.auth.security.jwt_token import VerifiedTokenCache, create_token, get_token_subject
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = VerifiedTokenCache(max_size=16, max_ttl=300)
+    monkeypatch.setattr(jwt_token, "verified_token_cache", cache)
+    return cache
+
+
+def test_valid_token_is_cached(cache):
+    token = create_token(subject="user-1", ttl=timedelta(minutes=5))
+
+    assert get_token_subject(token) == "user-1"
+    assert get_token_subject(token) == "user-1"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entry_falls_through_to_decode(cache, monkeypatch):
+    token = create_token(subject="user-1", ttl=timedelta(seconds=-10))
+    cache.put(token, "user-1", exp=time.time() - 1)
+
+    decoded = []
+    original = jwt_token.decode_token
+
+    def spy(value):
+        decoded.append(value)
+        return original(value)
+
+    monkeypatch.setattr(jwt_token, "decode_token", spy)
+
+    with pytest.raises(JWTError):
+        get_token_subject(token)
+    assert decoded == [token]
+    assert cache.stats()["size"] == 0
+
+
+def test_entry_never_outlives_exp(cache, monkeypatch):
+    token = create_token(subject="user-1", ttl=timedelta(minutes=5))
+    assert get_token_subject(token) == "user-1"
+
+    now = time.time()
+    monkeypatch.setattr(jwt_token.time, "time", lambda: now + 301)
+
+    assert cache.get(token) is None
+
+
+def test_max_ttl_caps_entry_lifetime(monkeypatch):
+    cache = VerifiedTokenCache(max_size=16, max_ttl=10)
+    now = time.time()
+    cache.put("token", "user-1", exp=now + 3600)
+
+    monkeypatch.setattr(jwt_token.time, "time", lambda: now + 9)
+    assert cache.get("token") == "user-1"
+
+    monkeypatch.setattr(jwt_token.time, "time", lambda: now + 11)
+    assert cache.get("token") is None
+
+
+@pytest.mark.parametrize("token", [
+    "not-a-jwt",
+    create_token(subject="user-1", ttl=timedelta(minutes=5)) + "x",
+    create_token(subject="user-1", ttl=timedelta(seconds=-10)),
+])
+def test_invalid_tokens_are_not_cached(cache, token):
+    with pytest.raises(JWTError):
+        get_token_subject(token)
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction():
+    cache = VerifiedTokenCache(max_size=2, max_ttl=300)
+    exp = time.time() + 300
+    cache.put("a", "user-a", exp)
+    cache.put("b", "user-b", exp)
+
+    assert cache.get("a") == "user-a"
+    cache.put("c", "user-c", exp)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "user-a"
+    assert cache.get("c") == "user-c"
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.core import llm_gateway, rate_limit
+from app.core.llm_gateway import LLMProviderError, LLMUnavailableError, call_llm, get_circuit_breaker
+from app.text.agents import smart_summarizer_agent
+from app.text.enums import AnonymizationMode, SummaryLevel
+from app.text.llm_client import LLMReply, fallback_provider
+from app.text.schemas import SummarizeRequest
+
+
+@pytest.fixture(autouse=True)
+def fresh_gateway(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "_semaphores", {})
+    monkeypatch.setattr(llm_gateway, "_breakers", {})
+    monkeypatch.setattr(llm_gateway, "_stats", {})
+    monkeypatch.setattr(rate_limit, "_buckets", {})
+    monkeypatch.setattr(llm_gateway.settings, "LLM_BREAKER_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(llm_gateway.settings, "LLM_MAX_RETRIES", 0)
+
+
+def _raise(retryable: bool):
+    async def call():
+        raise LLMProviderError("fail", provider="gigachat", retryable=retryable, status_code=503 if retryable else 400)
+    return call
+
+
+async def _ok():
+    return "ok"
+
+
+def _half_open():
+    breaker = get_circuit_breaker("gigachat")
+    breaker.failures = breaker.failure_threshold
+    breaker.opened_at = 0.0
+    return breaker
+
+
+def test_client_errors_are_neutral():
+    async def scenario():
+        breaker = get_circuit_breaker("gigachat")
+        with pytest.raises(LLMProviderError):
+            await call_llm("gigachat", "m", _raise(retryable=True))
+        for _ in range(5):
+            with pytest.raises(LLMProviderError):
+                await call_llm("gigachat", "m", _raise(retryable=False))
+        return breaker.failures
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_client_error_on_probe_releases_it_without_closing():
+    async def scenario():
+        breaker = _half_open()
+        with pytest.raises(LLMProviderError):
+            await call_llm("gigachat", "m", _raise(retryable=False))
+        assert breaker.state == "half_open"
+        return await call_llm("gigachat", "m", _ok), breaker.state
+
+    assert asyncio.run(scenario()) == ("ok", "closed")
+
+
+def test_only_the_probe_releases_the_probe():
+    async def scenario():
+        release_regular = asyncio.Event()
+        release_probe = asyncio.Event()
+
+        async def slow_client_error():
+            await release_regular.wait()
+            raise LLMProviderError("bad request", provider="gigachat", status_code=400)
+
+        async def slow_ok():
+            await release_probe.wait()
+            return "ok"
+
+        # Запрос начат при замкнутой цепи, потом цепь разомкнулась и ушла в half-open
+        regular = asyncio.create_task(call_llm("gigachat", "m", slow_client_error))
+        await asyncio.sleep(0)
+        _half_open()
+        probe = asyncio.create_task(call_llm("gigachat", "m", slow_ok))
+        await asyncio.sleep(0)
+
+        release_regular.set()
+        with pytest.raises(LLMProviderError):
+            await regular
+        # Завершение обычного запроса не освобождает чужую пробу
+        with pytest.raises(LLMUnavailableError):
+            await call_llm("gigachat", "m", _ok)
+
+        release_probe.set()
+        return await probe
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_fallback_provider_goes_both_ways(monkeypatch):
+    monkeypatch.setattr(llm_gateway.settings, "LLM_FALLBACK_PROVIDER", "perplexity")
+    assert fallback_provider("gigachat") == "perplexity"
+    assert fallback_provider("perplexity") == "gigachat"
+
+    monkeypatch.setattr(llm_gateway.settings, "LLM_FALLBACK_PROVIDER", "gigachat")
+    assert fallback_provider("gigachat") is None
+
+    monkeypatch.setattr(llm_gateway.settings, "LLM_FALLBACK_PROVIDER", None)
+    assert fallback_provider("gigachat") is None
+
+
+def test_agent_fallback_reports_the_serving_model_and_step(monkeypatch):
+    monkeypatch.setattr(llm_gateway.settings, "LLM_FALLBACK_PROVIDER", "perplexity")
+
+    async def failing_tool_loop(**kwargs):
+        raise LLMProviderError("down", provider="gigachat", retryable=True)
+
+    async def fallback_chat(provider, **kwargs):
+        return LLMReply("резюме", provider, "sonar-pro", {"prompt_tokens": 10, "completion_tokens": 2})
+
+    monkeypatch.setattr(smart_summarizer_agent, "gigachat_chat_with_tools", failing_tool_loop)
+    monkeypatch.setattr(smart_summarizer_agent, "chat_with_provider", fallback_chat)
+
+    request = SummarizeRequest(text="Короткий текст отчёта.", level=SummaryLevel.SHORT,
+                               anonymization_mode=AnonymizationMode.LOCAL)
+    result = asyncio.run(smart_summarizer_agent.summarize_with_agent(request, text=request.text))
+
+    assert result["metadata"]["model"] == "sonar-pro"
+    assert result["metadata"]["provider"] == "perplexity"
+    assert [step["stage"] for step in result["steps"]] == ["fallback"]
+    assert result["steps"][0]["prompt_tokens"] == 10
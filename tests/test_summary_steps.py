@@ -0,0 +1,34 @@
+from app.text.pipeline import build_step_rows
+
+
+def test_each_tool_call_gets_its_own_row():
+    steps = [
+        {
+            "finish_reason": "function_call",
+            "duration_ms": 120,
+            "prompt_tokens": 10,
+            "completion_tokens": 2,
+            "tools": [{"name": "anonymize_data", "duration_ms": 40, "result_chars": 500}],
+        },
+        {"finish_reason": "stop", "duration_ms": 300, "prompt_tokens": 30, "completion_tokens": 50},
+    ]
+
+    rows = build_step_rows("summary", steps)
+
+    assert [(row["step_index"], row["stage"], row["tool_name"]) for row in rows] == [
+        (0, "agent", None),
+        (0, "tool", "anonymize_data"),
+        (1, "agent", None),
+    ]
+    assert rows[0]["llm_ms"] == 120 and rows[0]["tool_ms"] is None
+    assert rows[1]["tool_ms"] == 40 and rows[1]["llm_ms"] is None
+    assert rows[1]["prompt_tokens"] is None
+
+
+def test_map_reduce_steps_keep_token_usage():
+    rows = build_step_rows("summary", [
+        {"stage": "map", "duration_ms": 50, "prompt_tokens": 100, "completion_tokens": 20},
+    ])
+
+    assert rows[0]["stage"] == "map"
+    assert (rows[0]["prompt_tokens"], rows[0]["completion_tokens"]) == (100, 20)
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+from app.text.enums import SummaryLevel
+from app.text.tools import tools_registry
+from app.text.tools.tools_registry import PARALLEL_TOOL_NAME, execute_tool_call, get_default_tools, tool_run
+
+
+@pytest.fixture
+def slow_tools(monkeypatch):
+    calls: list[str] = []
+
+    def make(name: str):
+        async def tool(**arguments):
+            calls.append(name)
+            await asyncio.sleep(0.2)
+            return {"success": True, "tool": name, **arguments}
+        return tool
+
+    monkeypatch.setattr(tools_registry, "TOOL_FUNCTIONS", {"first": make("first"), "second": make("second")})
+    return calls
+
+
+def test_parallel_calls_run_concurrently(slow_tools):
+    async def scenario():
+        with tool_run():
+            started = time.perf_counter()
+            result, tools = await execute_tool_call(PARALLEL_TOOL_NAME, {"calls": [
+                {"name": "first", "arguments": {"document_ref": "doc-1"}},
+                {"name": "second", "arguments": {"document_ref": "doc-1"}},
+            ]})
+            return result, tools, time.perf_counter() - started
+
+    result, tools, elapsed = asyncio.run(scenario())
+
+    assert elapsed < 0.35
+    assert [call["result"]["tool"] for call in result["results"]] == ["first", "second"]
+    assert [tool["name"] for tool in tools] == ["first", "second"]
+    assert all(tool["duration_ms"] >= 200 for tool in tools)
+
+
+def test_identical_calls_run_once_per_run(slow_tools):
+    call = {"name": "first", "arguments": {"document_ref": "doc-1"}}
+
+    async def scenario():
+        with tool_run():
+            result, tools = await execute_tool_call(PARALLEL_TOOL_NAME, {"calls": [call, call]})
+            _, repeated = await execute_tool_call("first", {"document_ref": "doc-1"})
+            return result, tools, repeated
+
+    result, tools, repeated = asyncio.run(scenario())
+
+    assert slow_tools == ["first"]
+    assert len(result["results"]) == 2 and len(tools) == 1
+    assert repeated[0]["cached"] is True
+
+
+def _names(tools):
+    return [tool["function"]["name"] for tool in tools]
+
+
+def test_parallel_tool_offered_only_with_several_tools():
+    assert _names(get_default_tools(SummaryLevel.MEDIUM)) == ["anonymize_data"]
+    assert _names(get_default_tools(SummaryLevel.AUTO)) == [
+        "anonymize_data", "analyze_text_complexity", PARALLEL_TOOL_NAME,
+    ]